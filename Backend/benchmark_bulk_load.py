@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark: the old serial 100-row insert loop vs the concurrent, payload-sized bulk loader
+Runs against an in-process fake store that charges a round trip plus a per-byte upload cost,
+so no Supabase project is needed.
+
+Usage: python benchmark_bulk_load.py [rows ...] [--latency-ms 20] [--mb-per-second 50]
+"""
+
+import argparse
+import json
+import time
+import numpy as np
+import pandas as pd
+
+from bulk_loader import BulkLoader
+from transaction_schema import to_compact_frame, to_records
+
+DESCRIPTIONS = np.array(['flour', 'coffee beans', 'whole milk', 'morning sales', 'monthly rent', 'napkins'], dtype=object)
+
+
+class FakeRemoteStore:
+    """Counts rows and sleeps like a PostgREST insert would; enough of ExpenseStore for the loader"""
+
+    def __init__(self, latency, bytes_per_second):
+        self.latency = latency
+        self.bytes_per_second = bytes_per_second
+        self.rows = 0
+
+    def insert(self, rows, returning=True):
+        payload = len(json.dumps(rows))
+        time.sleep(self.latency + payload / self.bytes_per_second)
+        self.rows += len(rows)
+        return rows if returning else []
+
+    def max_id(self):
+        return 0
+
+    def rows_exist(self, rows, after_id=0):
+        return False
+
+
+def make_frame(n_rows):
+    rng = np.random.default_rng(42)
+    return to_compact_frame(pd.DataFrame({
+        'date': pd.Timestamp('2020-01-01') + pd.to_timedelta(rng.integers(0, 2000, n_rows), unit='D'),
+        'amount': np.round(rng.uniform(1, 500, n_rows), 2),
+        'description': DESCRIPTIONS[rng.integers(0, len(DESCRIPTIONS), n_rows)],
+        'category': 'supplies',
+        'payment_method': 'card',
+    }))
+
+
+def serial_insert(store, df, batch_size=100):
+    records = to_records(df)
+    for i in range(0, len(records), batch_size):
+        store.insert(records[i:i + batch_size])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("rows", nargs="*", type=int, default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="simulated round trip per request")
+    parser.add_argument("--mb-per-second", type=float, default=50.0, help="simulated upload bandwidth")
+    parser.add_argument("--serial-max-rows", type=int, default=100_000, help="skip the serial loop above this size")
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} | {'method':<12} | {'time (s)':>9} | {'rows/sec':>10}")
+    print("-" * 50)
+    for n_rows in args.rows:
+        df = make_frame(n_rows)
+        runs = [("bulk loader", lambda store: BulkLoader(store).load(df))]
+        if n_rows <= args.serial_max_rows:
+            runs.insert(0, ("serial 100s", lambda store: serial_insert(store, df)))
+        for name, fn in runs:
+            store = FakeRemoteStore(args.latency_ms / 1000, args.mb_per_second * 1024 * 1024)
+            start = time.perf_counter()
+            fn(store)
+            elapsed = time.perf_counter() - start
+            assert store.rows == n_rows
+            print(f"{n_rows:>10} | {name:<12} | {elapsed:>9.2f} | {n_rows / elapsed:>10,.0f}")
+
+
+if __name__ == "__main__":
+    main()
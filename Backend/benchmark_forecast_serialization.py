@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Benchmark: building and encoding a /forecast/{metric}/{period} response.
+Compares the old path (iterrows + per-row round/strftime, Pydantic validation, FastAPI's
+jsonable_encoder + json.dumps) with the columnar path (forecast_rows + ForecastJSONResponse).
+No database or model fit is needed: the forecast frame is synthetic, shaped like Prophet's.
+
+Usage: python benchmark_forecast_serialization.py [--history 365] [--repeat 200]
+"""
+
+import argparse
+import json
+import time
+import numpy as np
+import pandas as pd
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from forecast_payload import ForecastJSONResponse, forecast_rows, orjson
+from main import ForecastResponse
+
+
+def make_forecast(history_days, horizon):
+    rng = np.random.default_rng(7)
+    n = history_days + horizon
+    yhat = 1000 + np.cumsum(rng.normal(0, 5, n))
+    return pd.DataFrame({
+        'ds': pd.date_range('2024-01-01', periods=n, freq='D'),
+        'trend': yhat - rng.normal(0, 20, n),
+        'yhat_lower': yhat - 150,
+        'yhat_upper': yhat + 150,
+        'yhat': yhat,
+    })
+
+
+def summary_for(future_data):
+    return {
+        "total_forecast": round(future_data['yhat'].sum(), 2),
+        "daily_average": round(future_data['yhat'].mean(), 2),
+        "trend_direction": "increasing",
+        "min_day": round(future_data['yhat'].min(), 2),
+        "max_day": round(future_data['yhat'].max(), 2)
+    }
+
+
+def old_path(forecast, horizon):
+    future_data = forecast.tail(horizon)
+    forecast_data = []
+    for _, row in future_data.iterrows():
+        forecast_data.append({
+            "date": row['ds'].strftime('%Y-%m-%d'),
+            "predicted_value": round(row['yhat'], 2),
+            "trend": round(row.get('trend', row['yhat']), 2)
+        })
+    response = ForecastResponse(
+        metric="revenue", period_days=horizon, forecast_data=forecast_data,
+        summary=summary_for(future_data), business_insights=["📈"], generated_at="2024-01-01T00:00:00"
+    )
+    # What FastAPI does with a response_model return value
+    validated = ForecastResponse.model_validate(response.model_dump())
+    return JSONResponse(jsonable_encoder(validated)).body
+
+
+def columnar_path(forecast, horizon):
+    future_data = forecast.tail(horizon)
+    response = ForecastResponse.model_construct(
+        metric="revenue", period_days=horizon, forecast_data=forecast_rows(future_data),
+        summary=summary_for(future_data), business_insights=["📈"], generated_at="2024-01-01T00:00:00"
+    )
+    return ForecastJSONResponse(dict(response)).body
+
+
+def time_path(fn, forecast, horizon, repeat):
+    fn(forecast, horizon)  # warm up
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(forecast, horizon)
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--history", type=int, default=365, help="days of history in the forecast frame")
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"JSON encoder: {'orjson' if orjson is not None else 'json (orjson not installed)'}")
+    print(f"{'horizon':>8} | {'iterrows (ms)':>14} | {'columnar (ms)':>14} | {'speedup':>8}")
+    print("-" * 54)
+    for horizon in (7, 30, 90):
+        forecast = make_forecast(args.history, horizon)
+        # Same payload either way
+        assert json.loads(old_path(forecast, horizon)) == json.loads(columnar_path(forecast, horizon))
+        old_ms = time_path(old_path, forecast, horizon, args.repeat)
+        new_ms = time_path(columnar_path, forecast, horizon, args.repeat)
+        print(f"{horizon:>8} | {old_ms:>14.3f} | {new_ms:>14.3f} | {old_ms / new_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
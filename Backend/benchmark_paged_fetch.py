@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Benchmark: single PostgREST call + pd.DataFrame(list of dicts) vs the paged column-buffer reader
+Runs against an in-process fake PostgREST so no Supabase project is needed.
+
+Usage: python benchmark_paged_fetch.py [rows ...] [--latency-ms 5]
+"""
+
+import argparse
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+
+from paged_reader import read_transactions
+
+CATEGORIES = np.array(['ingredients', 'utilities', 'supplies', 'equipment', 'other'], dtype=object)
+PAYMENT_METHODS = np.array(['cash', 'card', 'bank_transfer', 'check'], dtype=object)
+DESCRIPTIONS = np.array(['flour', 'coffee beans', 'whole milk', 'morning sales', 'monthly rent', 'napkins'], dtype=object)
+
+
+class FakeResponse:
+    def __init__(self, data, count=None):
+        self.data = data
+        self.count = count
+
+
+class FakeQuery:
+    """Just enough of the postgrest-py builder API for the readers under test"""
+
+    def __init__(self, table, count=None):
+        self.table = table
+        self.count = count
+        self.after_id = None
+        self.max_id = None
+        self.start = 0
+        self.end = None
+        self.desc = False
+
+    def select(self, columns, count=None):
+        self.count = count
+        return self
+
+    def gt(self, column, value):
+        self.after_id = value
+        return self
+
+    def lte(self, column, value):
+        self.max_id = value
+        return self
+
+    def order(self, column, desc=False):
+        self.desc = desc
+        return self
+
+    def range(self, start, end):
+        self.start, self.end = start, end
+        return self
+
+    def limit(self, n):
+        self.end = self.start + n - 1
+        return self
+
+    def execute(self):
+        time.sleep(self.table.latency)
+        lo = 0 if self.after_id is None else int(np.searchsorted(self.table.ids, self.after_id, side='right'))
+        hi = len(self.table.ids) if self.max_id is None else int(np.searchsorted(self.table.ids, self.max_id, side='right'))
+        matched = max(hi - lo, 0)
+        if self.count == "exact":
+            return FakeResponse([], count=matched)
+        if self.desc:
+            start = lo if self.end is None else max(hi - (self.end + 1), lo)
+            return FakeResponse(self.table.rows(start, hi - self.start)[::-1])
+        end = hi if self.end is None else min(lo + self.end + 1, hi)
+        return FakeResponse(self.table.rows(lo + self.start, end))
+
+
+class FakeTable:
+    def __init__(self, n_rows, latency):
+        rng = np.random.default_rng(0)
+        self.latency = latency
+        self.ids = np.arange(1, n_rows + 1)
+        self.dates = (np.datetime64('2020-01-01') + rng.integers(0, 1500, n_rows)).astype(str)
+        self.amounts = np.round(rng.normal(50, 40, n_rows), 2)
+        self.descriptions = rng.choice(DESCRIPTIONS, n_rows)
+        self.categories = rng.choice(CATEGORIES, n_rows)
+        self.payment_methods = rng.choice(PAYMENT_METHODS, n_rows)
+
+    def rows(self, start, end):
+        # Fresh dicts/strings per response, like a JSON decode would produce
+        return [
+            {
+                'id': int(self.ids[i]),
+                'date': str(self.dates[i]),
+                'amount': float(self.amounts[i]),
+                'description': str(self.descriptions[i]),
+                'category': str(self.categories[i]),
+                'payment_method': str(self.payment_methods[i]),
+                'created_at': '2024-01-01T00:00:00.000000',
+            }
+            for i in range(start, end)
+        ]
+
+
+class FakeClient:
+    def __init__(self, n_rows, latency):
+        self._table = FakeTable(n_rows, latency)
+
+    def table(self, name):
+        return FakeQuery(self._table)
+
+
+def single_call_fetch(client):
+    """The original fetch_data_from_supabase body (with the server row limit lifted)"""
+    result = client.table("daily_expenses").select("*").order("date", desc=False).execute()
+    df = pd.DataFrame(result.data)
+    df['date'] = pd.to_datetime(df['date'])
+    df['amount'] = pd.to_numeric(df['amount'])
+    return df
+
+
+def measure(fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    df = fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return df, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("rows", nargs="*", type=int, default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--latency-ms", type=float, default=5.0, help="simulated round trip per request")
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} | {'method':<14} | {'time (s)':>9} | {'peak MB':>8} | {'frame MB':>8}")
+    print("-" * 62)
+    for n_rows in args.rows:
+        client = FakeClient(n_rows, args.latency_ms / 1000)
+        for name, fn in (
+            ("single call", lambda: single_call_fetch(client)),
+            ("paged reader", lambda: read_transactions(client)),
+        ):
+            df, elapsed, peak = measure(fn)
+            assert len(df) == n_rows
+            frame_mb = df.memory_usage(deep=True).sum() / 1e6
+            print(f"{n_rows:>10,} | {name:<14} | {elapsed:>9.2f} | {peak / 1e6:>8.1f} | {frame_mb:>8.1f}")
+            del df
+
+
+if __name__ == "__main__":
+    main()
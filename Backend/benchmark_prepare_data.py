@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Benchmark: preparing the forecast series from raw transactions.
+Compares the original per-series masks + groupbys + outer merge (on the wide date/amount layout)
+with one DailyRollup pass and dense_series (every series on one zero-filled calendar), and with
+dense_series alone on an already built rollup - what the API does, since the rollup is cached.
+Uses synthetic transactions; no database needed.
+
+Usage: python benchmark_prepare_data.py [days ...]
+"""
+
+import argparse
+import time
+import tracemalloc
+import pandas as pd
+
+from business_forecasting import BusinessForecaster
+from synthetic_data import generate_transactions
+from daily_rollup import DailyRollup
+from transaction_schema import CATEGORIES, expand_compact_frame
+
+
+def groupby_prepare(df):
+    """prepare_data_for_prophet as it was: separate masks and groupbys, gaps left in"""
+
+    revenue_df = df[(df['category'] == 'other') & (df['amount'] > 0)].groupby('date')['amount'].sum().reset_index()
+    revenue_df.columns = ['ds', 'total_revenue']
+
+    expense_conditions = (df['amount'] < 0) | ((df['category'] != 'other') & (df['amount'] > 0))
+    expenses_df = df[expense_conditions]['amount'].abs().groupby(df['date']).sum().reset_index()
+    expenses_df.columns = ['ds', 'total_expenses']
+
+    cash_flow_df = pd.merge(revenue_df, expenses_df, on='ds', how='outer').fillna(0)
+    cash_flow_df['net_cash_flow'] = cash_flow_df['total_revenue'] - cash_flow_df['total_expenses']
+    cash_flow_df = cash_flow_df[['ds', 'net_cash_flow']]
+
+    category_data = {}
+    for category in CATEGORIES:
+        cat_df = df[df['category'] == category]['amount'].abs().groupby(df['date']).sum().reset_index()
+        cat_df.columns = ['ds', f'{category}_amount']
+        category_data[category] = cat_df
+
+    return {'daily_cash_flow': cash_flow_df, 'daily_expenses': expenses_df,
+            'daily_revenue': revenue_df, 'categories': category_data}
+
+
+def measure(fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("days", nargs="*", type=int, default=[365, 3650, 36500])
+    args = parser.parse_args()
+    forecaster = BusinessForecaster()
+
+    print(f"{'days':>7} | {'rows':>10} | {'method':<12} | {'time (ms)':>10} | {'peak MB':>8}")
+    print("-" * 60)
+    for days in args.days:
+        compact = generate_transactions(days, seed=3)
+        wide = expand_compact_frame(compact)
+        rollup = DailyRollup.from_frame(compact)
+        runs = [
+            ("groupbys", lambda: groupby_prepare(wide)),
+            ("dense pass", lambda: forecaster.prepare_data_for_prophet(compact)),
+            ("cached", lambda: forecaster.prepare_data_for_prophet(rollup)),
+        ]
+        results = {}
+        for name, fn in runs:
+            results[name], elapsed, peak = measure(fn)
+            print(f"{days:>7} | {len(compact):>10,} | {name:<12} | {elapsed * 1000:>10.1f} | {peak / 2**20:>8.1f}")
+
+        # Same totals; the dense series only add zero days
+        old, new = results["groupbys"], results["dense pass"]
+        assert abs(old['daily_revenue']['total_revenue'].sum() - new['daily_revenue']['total_revenue'].sum()) < 0.01 * days
+        assert len(new['daily_revenue']) == len(new['daily_expenses']) == len(new['daily_cash_flow'])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Prophet refit latency after one new day is appended to a 2-year history,
+cold (default initialization) vs warm-started from the previous fit's parameters.
+Uses synthetic transactions rolled up the same way the API does; no database needed.
+
+Usage: python benchmark_warm_refit.py [--days 730] [--repeat 5]
+"""
+
+import argparse
+import logging
+import statistics
+import time
+import numpy as np
+
+from business_forecasting import BusinessForecaster
+from daily_rollup import DailyRollup
+from prophet_fit import fit_and_predict, warm_start_params
+from synthetic_data import generate_transactions
+from transaction_schema import CATEGORIES
+
+SERIES = {'daily_revenue': "Daily Revenue", 'daily_expenses': "Daily Expenses", 'daily_cash_flow': "Net Cash Flow"}
+
+
+def timed_fit(prophet_df, init=None):
+    start = time.perf_counter()
+    model, forecast = fit_and_predict(prophet_df, 30, intervals=False, init=init)
+    return time.perf_counter() - start, model, forecast
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--days", type=int, default=730, help="history before the appended day")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    logging.getLogger('cmdstanpy').disabled = True
+
+    rollup = DailyRollup.from_frame(generate_transactions(args.days + 1, seed=7), CATEGORIES)
+    prepared = BusinessForecaster().prepare_data_for_prophet(rollup)
+
+    print(f"{'series':<16} | {'cold (ms)':>10} | {'warm (ms)':>10} | {'speedup':>8} | {'max |Δyhat|':>12}")
+    print("-" * 68)
+    for key, name in SERIES.items():
+        series = prepared[key].iloc[:, :2].set_axis(['ds', 'y'], axis=1)
+        previous, appended = series.iloc[:-1], series
+
+        # The fit that was current before the new day arrived
+        _, model, _ = timed_fit(previous)
+        init = warm_start_params(model)
+
+        cold, warm = [], []
+        for _ in range(args.repeat):
+            seconds, _, cold_forecast = timed_fit(appended)
+            cold.append(seconds)
+            seconds, _, warm_forecast = timed_fit(appended, init)
+            warm.append(seconds)
+
+        cold_ms = statistics.median(cold) * 1000
+        warm_ms = statistics.median(warm) * 1000
+        drift = np.abs(cold_forecast['yhat'] - warm_forecast['yhat']).max()
+        print(f"{name:<16} | {cold_ms:>10.0f} | {warm_ms:>10.0f} | {cold_ms / warm_ms:>7.2f}x | {drift:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
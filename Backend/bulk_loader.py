@@ -0,0 +1,155 @@
+#concurrent bulk loader for daily_expenses
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+import httpx
+import pandas as pd
+from postgrest.exceptions import APIError
+from transaction_schema import to_records
+
+DEFAULT_BATCH_BYTES = int(os.getenv("BULK_LOAD_BATCH_BYTES", str(1024 * 1024)))
+DEFAULT_LOAD_WORKERS = int(os.getenv("BULK_LOAD_WORKERS", "4"))
+DEFAULT_MAX_RETRIES = int(os.getenv("BULK_LOAD_MAX_RETRIES", "5"))
+
+# Server answers worth retrying: request timeout, payload too large, rate limit, gateway errors,
+# statement timeout, serialization failure and deadlock
+RETRYABLE_CODES = {'408', '413', '429', '500', '502', '503', '504', '57014', '40001', '40P01'}
+# ...and the ones that mean the batch itself is too big
+SPLIT_CODES = {'413', '57014'}
+# Rejections that prove nothing was written; after any other retryable error the insert may
+# have committed (e.g. a gateway timing out on a statement that finished)
+NOT_WRITTEN_CODES = {'413', '57014', '40001', '40P01'}
+
+
+class BulkLoader:
+    """Streams compact frames into an ExpenseStore with several batches in flight at once.
+
+    Batches are sized by their JSON payload and halved whenever the server says one was too
+    large or too slow. A batch whose insert failed ambiguously (no answer, or a timeout/gateway
+    error the insert may have outlived) is only re-sent after checking that it was not committed,
+    so retries never duplicate rows.
+    """
+
+    def __init__(self, store, batch_bytes=DEFAULT_BATCH_BYTES, max_workers=DEFAULT_LOAD_WORKERS,
+                 max_retries=DEFAULT_MAX_RETRIES, min_batch_rows=50, max_batch_rows=20000, retry_backoff=0.5):
+        self.store = store
+        self.batch_bytes = batch_bytes
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.min_batch_rows = min_batch_rows
+        self.max_batch_rows = max_batch_rows
+        self.retry_backoff = retry_backoff
+
+        self._load_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._batch_rows = None
+        self._after_id = 0
+        self._stats = None
+
+    def load(self, frames, business_id=None):
+        """Insert a compact frame (or an iterable of them) and return a report including rows/sec.
+        Rows are stored under business_id (the table default when None)."""
+
+        if isinstance(frames, pd.DataFrame):
+            frames = [frames]
+
+        with self._load_lock:
+            start = time.perf_counter()
+            # Rows from this load all get ids above this mark, which is what retries check against
+            self._after_id = self.store.max_id()
+            self._batch_rows = None
+            self._stats = {'rows': 0, 'batches': 0, 'retries': 0, 'splits': 0}
+
+            pending = set()
+            with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="finlo-load") as executor:
+                try:
+                    for df in frames:
+                        offset = 0
+                        while offset < len(df):
+                            if self._batch_rows is None:
+                                self._batch_rows = self._rows_for_bytes(df)
+                            records = to_records(df.iloc[offset:offset + self._batch_rows], business_id)
+                            offset += len(records)
+
+                            # Bounded window: at most two batches per worker are serialized ahead
+                            if len(pending) >= self.max_workers * 2:
+                                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                                for future in done:
+                                    future.result()
+                            pending.add(executor.submit(self._load_batch, records))
+
+                    for future in wait(pending)[0]:
+                        future.result()
+                except BaseException:
+                    for future in pending:
+                        future.cancel()
+                    raise
+
+            elapsed = time.perf_counter() - start
+            report = dict(self._stats)
+            report['seconds'] = round(elapsed, 3)
+            report['rows_per_second'] = round(report['rows'] / elapsed) if elapsed > 0 else 0
+            print(f"🚀 Loaded {report['rows']} rows in {elapsed:.2f}s "
+                  f"({report['rows_per_second']:,} rows/sec, {report['batches']} batches, {report['retries']} retries)")
+            return report
+
+    def _rows_for_bytes(self, df):
+        sample = to_records(df.iloc[:200])
+        if not sample:
+            return self.min_batch_rows
+        bytes_per_row = len(json.dumps(sample)) / len(sample)
+        return int(min(max(self.batch_bytes // bytes_per_row, self.min_batch_rows), self.max_batch_rows))
+
+    def _count(self, **counts):
+        with self._lock:
+            for key, value in counts.items():
+                self._stats[key] += value
+
+    def _load_batch(self, records):
+        attempt = 0
+        while True:
+            try:
+                self.store.insert(records, returning=False)
+                self._count(rows=len(records), batches=1)
+                return len(records)
+            except Exception as e:
+                code = _error_code(e)
+                if code is None and not _is_transient(e):
+                    raise
+                if code is not None and code not in RETRYABLE_CODES:
+                    raise
+                if code not in NOT_WRITTEN_CODES and self.store.rows_exist(records, self._after_id):
+                    # The insert committed but we never saw the response
+                    self._count(rows=len(records), batches=1)
+                    return len(records)
+
+                too_large = code in SPLIT_CODES or isinstance(e, httpx.TimeoutException)
+                if too_large and len(records) >= 2 * self.min_batch_rows:
+                    half = len(records) // 2
+                    with self._lock:
+                        self._batch_rows = max(self.min_batch_rows, min(self._batch_rows, half))
+                        self._stats['splits'] += 1
+                    print(f"✂️  Splitting a {len(records)}-row batch: {str(e)}")
+                    return self._load_batch(records[:half]) + self._load_batch(records[half:])
+
+                attempt += 1
+                if attempt > self.max_retries:
+                    raise
+                self._count(retries=1)
+                print(f"🔁 Retrying a {len(records)}-row batch ({attempt}/{self.max_retries}): {str(e)}")
+                time.sleep(self.retry_backoff * 2 ** (attempt - 1))
+
+
+def _error_code(error):
+    """PostgREST/Postgres error code as a string, None when the server never answered"""
+    if isinstance(error, APIError) and error.code is not None:
+        return str(error.code)
+    return None
+
+
+def _is_transient(error):
+    # Lost connections, timeouts and a busy SQLite file can all succeed on a second try
+    return isinstance(error, (httpx.TransportError, sqlite3.OperationalError))
@@ -1,259 +1,138 @@
 #using prophet for forecasting
 import pandas as pd
-import numpy as np
-from datetime import datetime, date, timedelta
-import random
-from prophet import Prophet
+from prophet.serialize import model_from_json, model_to_json
 import matplotlib.pyplot as plt
 import seaborn as sns
-from supabase import create_client, Client
 import os
+import functools
+import itertools
+import threading
+from collections import OrderedDict
 from dotenv import load_dotenv
+from storage import expense_store
+from snapshot_store import SnapshotStore, snapshot_path_for
+from transaction_cache import TransactionCache
+from bulk_loader import BulkLoader
+from forecast_cache import ForecastCache
+from model_registry import model_registry
+from executors import fit_pool, business_slot
+from prophet_fit import fit_and_predict, fit_in_worker, predict_point, sample_in_worker, warm_start_params
+from fast_forecast import FourierRidgeModel, forecast_matrix
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from synthetic_data import generate_transactions, iter_transactions, prefetch
+from daily_rollup import DailyRollup
+from transaction_schema import (
+    CATEGORIES, PAYMENT_METHODS, DEFAULT_BUSINESS_ID, days_to_dates
+)
 import warnings
 warnings.filterwarnings('ignore')
 
 load_dotenv()
 
-# Initialize Supabase client
-supabase_url = os.getenv("SUPABASE_URL")
-supabase_key = os.getenv("SUPABASE_ANON_KEY")
-supabase: Client = create_client(supabase_url, supabase_key)
+# One transaction cache per business, shared by every forecaster in this process so each
+# business's rows are only downloaded once. Cold starts read the business's Arrow snapshot
+# first and only fetch rows written since. Beyond TENANT_CACHE_SIZE businesses the least
+# recently used cache is dropped; it comes back from its snapshot plus a delta.
+TENANT_CACHE_SIZE = int(os.getenv("TENANT_CACHE_SIZE", "256"))
+_transaction_caches = OrderedDict()
+_transaction_caches_lock = threading.Lock()
+# Tells a reloaded cache's versions apart from those of the one it replaced
+_cache_generations = itertools.count(1)
+
+
+def _snapshot_path(business_id):
+    configured = os.getenv("TRANSACTION_SNAPSHOT_PATH")
+    if configured == "":
+        return ""
+    if configured and business_id == DEFAULT_BUSINESS_ID:
+        return configured
+    return snapshot_path_for(expense_store.backend, business_id)
+
+
+def transaction_cache_for(business_id=DEFAULT_BUSINESS_ID):
+    """The TransactionCache holding one business's rows"""
+    
+    with _transaction_caches_lock:
+        cache = _transaction_caches.get(business_id)
+        if cache is None:
+            cache = _transaction_caches[business_id] = TransactionCache(
+                functools.partial(expense_store.read_transactions, business_id=business_id),
+                refresh_interval=float(os.getenv("TRANSACTION_CACHE_REFRESH_SECONDS", "0")),
+                snapshot=SnapshotStore(_snapshot_path(business_id)),
+                count_rows=lambda max_id: expense_store.count_transactions(max_id=max_id, business_id=business_id)
+            )
+            cache.generation = next(_cache_generations)
+        _transaction_caches.move_to_end(business_id)
+        
+        evictable = [key for key in _transaction_caches if key != DEFAULT_BUSINESS_ID]
+        for key in evictable[:max(len(_transaction_caches) - TENANT_CACHE_SIZE, 0)]:
+            del _transaction_caches[key]
+        return cache
+
+
+transaction_cache = transaction_cache_for(DEFAULT_BUSINESS_ID)
+
+# Pipelined, payload-sized inserts for seeding demo and load-test data
+bulk_loader = BulkLoader(expense_store)
+
+# Longest ForecastPeriod: every model is predicted this far once and shorter horizons are sliced out
+MAX_FORECAST_DAYS = 90
+
+# Fitted models keyed by business and a fingerprint of their training series, so each metric
+# is fitted once per data version no matter which horizons or endpoints ask for it
+model_cache = ForecastCache(
+    max_entries=int(os.getenv("MODEL_CACHE_SIZE", "32")),
+    ttl_seconds=float(os.getenv("MODEL_CACHE_TTL_SECONDS", "86400"))
+)
+
+
+def series_fingerprint(prophet_df):
+    """Content hash of a ds/y training frame"""
+    return (len(prophet_df), int(pd.util.hash_pandas_object(prophet_df, index=False).sum()))
 
 class BusinessForecaster:
-    def __init__(self):
-        self.categories = ['ingredients', 'utilities', 'supplies', 'equipment', 'other']
-        self.payment_methods = ['cash', 'card', 'bank_transfer', 'check']
+    def __init__(self, business_id=DEFAULT_BUSINESS_ID):
+        self.business_id = business_id
+        self.categories = CATEGORIES
+        self.payment_methods = PAYMENT_METHODS
+    
+    @property
+    def transaction_cache(self):
+        return transaction_cache_for(self.business_id)
         
-    def generate_dummy_data(self, days=365):  # Increased from 90 to 365 days
+    def generate_dummy_data(self, days=365, seed=None):  # Increased from 90 to 365 days
         """Generate realistic business expense and revenue dummy data with seasonal patterns"""
         
         print(f"🔄 Generating {days} days of comprehensive business data...")
         
-        start_date = date.today() - timedelta(days=days)
-        data = []
-        
-        for day in range(days):
-            current_date = start_date + timedelta(days=day)
-            day_of_week = current_date.weekday()  # 0=Monday, 6=Sunday
-            month = current_date.month
-            
-            # Business is closed on Sundays, reduced activity on Saturdays
-            if day_of_week == 6:  # Sunday - completely closed
-                continue
-            
-            # Seasonal multipliers for revenue (coffee shops busier in winter, slower in summer)
-            seasonal_multiplier = {
-                1: 1.2, 2: 1.15, 3: 1.0, 4: 0.95, 5: 0.9, 6: 0.8,  # Winter busy, summer slow
-                7: 0.85, 8: 0.9, 9: 1.0, 10: 1.1, 11: 1.15, 12: 1.25  # Holiday season boost
-            }[month]
-            
-            # Holiday effects (reduced revenue on major holidays)
-            holiday_dates = [
-                (1, 1), (7, 4), (11, 24), (12, 25), (12, 31)  # New Year, July 4th, Thanksgiving, Christmas, NYE
-            ]
-            is_holiday = (current_date.month, current_date.day) in holiday_dates
-            holiday_multiplier = 0.3 if is_holiday else 1.0
-            
-            # Weather impact simulation (random weather effects)
-            weather_impact = random.normalvariate(1.0, 0.1)  # ±10% weather variation
-            weather_impact = max(0.7, min(1.3, weather_impact))  # Cap between 70%-130%
-            
-            # Generate daily revenue with multiple factors
-            base_revenue = {
-                0: 750,  # Monday
-                1: 780,  # Tuesday  
-                2: 800,  # Wednesday
-                3: 820,  # Thursday
-                4: 850,  # Friday - highest
-                5: 600,  # Saturday - lower weekend
-            }[day_of_week]
-            
-            # Apply all multipliers
-            adjusted_revenue = base_revenue * seasonal_multiplier * holiday_multiplier * weather_impact
-            daily_revenue = random.normalvariate(adjusted_revenue, adjusted_revenue * 0.15)  # 15% variance
-            daily_revenue = max(150, daily_revenue)  # Minimum revenue floor
-            
-            # Add multiple revenue entries to simulate different payment methods/times
-            revenue_splits = random.randint(1, 4)  # 1-4 revenue entries per day
-            for split in range(revenue_splits):
-                split_amount = daily_revenue / revenue_splits
-                split_variance = random.normalvariate(split_amount, split_amount * 0.1)
-                
-                data.append({
-                    'date': current_date,
-                    'amount': round(max(10, split_variance), 2),  # POSITIVE amount for revenue
-                    'description': random.choice(['morning sales', 'afternoon sales', 'evening sales', 'card payments', 'cash sales']),
-                    'category': 'other',
-                    'payment_method': random.choice(['card', 'cash'])
-                })
-            
-            # EXPENSES - All amounts will be POSITIVE (representing expense amounts)
-            
-            # Daily ingredients - varies by day of week and season
-            ingredient_probability = {
-                0: 0.8, 1: 0.7, 2: 0.8, 3: 0.9, 4: 0.9, 5: 0.6  # Higher restocking Mon, Wed-Fri
-            }[day_of_week]
-            
-            if random.random() < ingredient_probability:
-                # Multiple ingredient purchases per day
-                num_ingredients = random.randint(1, 3)
-                for _ in range(num_ingredients):
-                    base_cost = random.normalvariate(85, 25) * seasonal_multiplier  # Seasonal price variation
-                    ingredient_items = [
-                        'flour', 'coffee beans', 'whole milk', 'oat milk', 'sugar', 'pastries', 
-                        'bread', 'butter', 'cream', 'chocolate', 'tea bags', 'syrup'
-                    ]
-                    data.append({
-                        'date': current_date,
-                        'amount': round(abs(base_cost), 2),  # POSITIVE amount for expenses
-                        'description': random.choice(ingredient_items),
-                        'category': 'ingredients',
-                        'payment_method': random.choice(['card', 'cash'])
-                    })
-            
-            # Supplies (more frequent, smaller amounts)
-            if random.random() > 0.5:  # 50% chance
-                supply_cost = random.normalvariate(35, 12)
-                supply_items = [
-                    'coffee cups', 'lids', 'napkins', 'straws', 'cleaning supplies', 
-                    'takeout containers', 'paper towels', 'toilet paper', 'hand soap'
-                ]
-                data.append({
-                    'date': current_date,
-                    'amount': round(abs(supply_cost), 2),  # POSITIVE amount
-                    'description': random.choice(supply_items),
-                    'category': 'supplies',
-                    'payment_method': random.choice(['card', 'cash'])
-                })
-            
-            # Monthly utilities - spread more realistically across the month
-            if current_date.day in [1, 2, 3] or current_date.day in [15, 16, 17] or random.random() > 0.95:
-                utility_bills = [
-                    {'desc': 'electricity bill', 'amount': random.normalvariate(320, 60), 'prob': 0.15},
-                    {'desc': 'water bill', 'amount': random.normalvariate(95, 25), 'prob': 0.12},
-                    {'desc': 'internet/phone bill', 'amount': random.normalvariate(75, 15), 'prob': 0.08},
-                    {'desc': 'gas bill', 'amount': random.normalvariate(140, 35), 'prob': 0.10},
-                    {'desc': 'waste management', 'amount': random.normalvariate(45, 10), 'prob': 0.05},
-                    {'desc': 'security system', 'amount': random.normalvariate(85, 20), 'prob': 0.04}
-                ]
-                
-                for bill in utility_bills:
-                    if random.random() < bill['prob']:
-                        data.append({
-                            'date': current_date,
-                            'amount': round(abs(bill['amount']), 2),  # POSITIVE amount
-                            'description': bill['desc'],
-                            'category': 'utilities',
-                            'payment_method': 'bank_transfer'
-                        })
-            
-            # Equipment maintenance/purchases
-            equipment_probability = 0.02 if day_of_week in [0, 1] else 0.005
-            if random.random() < equipment_probability:
-                equipment_cost = random.normalvariate(280, 120)
-                equipment_items = [
-                    'espresso machine maintenance', 'coffee grinder repair', 'new blender',
-                    'POS system update', 'furniture repair', 'kitchen equipment', 'refrigerator maintenance',
-                    'dishwasher repair', 'new cash register', 'sound system repair'
-                ]
-                data.append({
-                    'date': current_date,
-                    'amount': round(abs(equipment_cost), 2),  # POSITIVE amount
-                    'description': random.choice(equipment_items),
-                    'category': 'equipment',
-                    'payment_method': 'card'
-                })
-            
-            # Other business expenses
-            other_expenses = [
-                {'desc': 'business insurance', 'amount': 180, 'monthly_prob': 0.8},
-                {'desc': 'software subscription', 'amount': 45, 'monthly_prob': 0.6},
-                {'desc': 'marketing/advertising', 'amount': 120, 'weekly_prob': 0.3},
-                {'desc': 'accounting fees', 'amount': 200, 'monthly_prob': 0.4},
-                {'desc': 'legal fees', 'amount': 300, 'quarterly_prob': 0.2},
-                {'desc': 'business license renewal', 'amount': 150, 'yearly_prob': 0.1},
-                {'desc': 'staff training', 'amount': 85, 'monthly_prob': 0.2},
-                {'desc': 'office supplies', 'amount': 60, 'monthly_prob': 0.4},
-                {'desc': 'delivery fees', 'amount': 25, 'weekly_prob': 0.4},
-                {'desc': 'bank fees', 'amount': 35, 'monthly_prob': 0.9}
-            ]
-            
-            for expense in other_expenses:
-                probability = 0
-                if 'monthly_prob' in expense:
-                    probability = expense['monthly_prob'] / 30
-                elif 'weekly_prob' in expense:
-                    probability = expense['weekly_prob'] / 7
-                elif 'quarterly_prob' in expense:
-                    probability = expense['quarterly_prob'] / 90
-                elif 'yearly_prob' in expense:
-                    probability = expense['yearly_prob'] / 365
-                
-                if random.random() < probability:
-                    amount_variance = random.normalvariate(expense['amount'], expense['amount'] * 0.2)
-                    data.append({
-                        'date': current_date,
-                        'amount': round(abs(amount_variance), 2),  # POSITIVE amount
-                        'description': expense['desc'],
-                        'category': 'other',
-                        'payment_method': random.choice(['card', 'bank_transfer'])
-                    })
-            
-            # Staff wages (weekly on Fridays)
-            if day_of_week == 4 and random.random() > 0.3:
-                staff_payment = random.normalvariate(400, 100)
-                data.append({
-                    'date': current_date,
-                    'amount': round(abs(staff_payment), 2),  # POSITIVE amount
-                    'description': 'staff wages',
-                    'category': 'other',
-                    'payment_method': 'bank_transfer'
-                })
-            
-            # Rent payment - first few days of month
-            if current_date.day <= 3 and random.random() > 0.6:
-                rent_amount = random.normalvariate(2800, 200)
-                data.append({
-                    'date': current_date,
-                    'amount': round(abs(rent_amount), 2),  # POSITIVE amount
-                    'description': 'monthly rent',
-                    'category': 'other',
-                    'payment_method': 'bank_transfer'
-                })
-        
-        df = pd.DataFrame(data)
+        # All days and event types are drawn as arrays - see synthetic_data for the patterns
+        df = generate_transactions(days, seed=seed)
+        is_other = (df['category'] == 'other').to_numpy()
         print(f"✅ Generated {len(df)} transaction records")
         print(f"📊 Data distribution:")
-        print(f"   • Revenue entries (other category): {len(df[df['category'] == 'other'])}")
-        print(f"   • Expense entries (all other categories): {len(df[df['category'] != 'other'])}")
-        print(f"   • Date range: {df['date'].min()} to {df['date'].max()}")
+        print(f"   • Revenue entries (other category): {is_other.sum()}")
+        print(f"   • Expense entries (all other categories): {(~is_other).sum()}")
+        print(f"   • Date range: {days_to_dates([df['day'].min()])[0]} to {days_to_dates([df['day'].max()])[0]}")
         
         return df
     
+    def stream_dummy_data(self, days=365, chunk_rows=100_000, seed=None):
+        """Same data as generate_dummy_data, as fixed-size chunks generated in the background"""
+        
+        print(f"🔄 Streaming {days} days of business data in chunks of {chunk_rows} rows...")
+        return prefetch(iter_transactions(days, chunk_rows=chunk_rows, seed=seed))
+    
     def insert_dummy_data_to_supabase(self, df):
-        """Insert dummy data into Supabase"""
+        """Insert dummy data (a frame or an iterable of chunks) into Supabase"""
         
         print("📊 Inserting dummy data into Supabase...")
         
         try:
-            # Convert DataFrame to list of dictionaries
-            records = df.to_dict('records')
-            
-            # Convert date objects to strings for Supabase
-            for record in records:
-                record['date'] = record['date'].isoformat()
-            
-            # Insert in batches of 100
-            batch_size = 100
-            total_inserted = 0
+            report = bulk_loader.load(df, business_id=self.business_id)
+            # One delta sync picks up everything we just wrote
+            self.transaction_cache.refresh(force=True)
             
-            for i in range(0, len(records), batch_size):
-                batch = records[i:i + batch_size]
-                result = supabase.table("daily_expenses").insert(batch).execute()
-                total_inserted += len(batch)
-                print(f"✅ Inserted batch {i//batch_size + 1}: {len(batch)} records")
-            
-            print(f"🎉 Successfully inserted {total_inserted} records into Supabase!")
+            print(f"🎉 Successfully inserted {report['rows']} records into Supabase!")
             return True
             
         except Exception as e:
@@ -261,21 +140,17 @@ class BusinessForecaster:
             return False
     
     def fetch_data_from_supabase(self):
-        """Fetch expense data from Supabase for forecasting"""
+        """Fetch expense data for forecasting from the delta-synced transaction cache"""
         
         print("📥 Fetching data from Supabase...")
         
         try:
-            result = supabase.table("daily_expenses").select("*").order("date", desc=False).execute()
+            df = self.transaction_cache.get_frame()
             
-            if not result.data:
+            if df is None:
                 print("❌ No data found in database")
                 return None
             
-            df = pd.DataFrame(result.data)
-            df['date'] = pd.to_datetime(df['date'])
-            df['amount'] = pd.to_numeric(df['amount'])
-            
             print(f"✅ Fetched {len(df)} records from database")
             return df
             
@@ -283,52 +158,70 @@ class BusinessForecaster:
             print(f"❌ Error fetching data: {str(e)}")
             return None
     
-    def prepare_data_for_prophet(self, df):
-        """Prepare data for Prophet forecasting - handles mixed positive/negative amounts"""
+    def data_version(self):
+        """Sync new transactions and return the cache version (changes whenever the data does)"""
+        
+        cache = self.transaction_cache
+        cache.refresh()
+        return (cache.generation, cache.version)
+    
+    def fetch_daily_rollup(self, refresh=True):
+        """Fetch the per-day rollup maintained by the transaction cache"""
+        
+        try:
+            rollup = self.transaction_cache.get_rollup(refresh=refresh)
+            
+            if rollup is None:
+                print("❌ No data found in database")
+                return None
+            
+            return rollup
+            
+        except Exception as e:
+            print(f"❌ Error fetching data: {str(e)}")
+            return None
+    
+    def prepare_data_for_prophet(self, data):
+        """Prepare data for Prophet forecasting from a DailyRollup (compact frames are rolled up first)"""
         
         # Handle mixed data where:
         # - Positive amounts in 'other' category = Revenue  
         # - Negative amounts in any category = Expenses
         # - Positive amounts in non-'other' categories = Expenses (your data has some like this)
+        # The rollup already holds these per-day sums; dense_series lays every series out on one
+        # calendar with zero-filled gaps, so all of them have the same dates and length.
+        rollup = data if isinstance(data, DailyRollup) else DailyRollup.from_frame(data, self.categories)
+        daily = rollup.dense_series()
         
-        # Revenue: positive amounts in 'other' category
-        revenue_df = df[(df['category'] == 'other') & (df['amount'] > 0)].groupby('date')['amount'].sum().reset_index()
-        revenue_df.columns = ['ds', 'total_revenue']
-        
-        # Expenses: negative amounts (any category) + positive amounts in non-'other' categories
-        expense_conditions = (
-            (df['amount'] < 0) |  # All negative amounts are expenses
-            ((df['category'] != 'other') & (df['amount'] > 0))  # Positive amounts in expense categories
-        )
-        expenses_df = df[expense_conditions]['amount'].abs().groupby(df['date']).sum().reset_index()
-        expenses_df.columns = ['ds', 'total_expenses']
-        
-        # Calculate net cash flow (revenue - expenses)
-        cash_flow_df = pd.merge(revenue_df, expenses_df, on='ds', how='outer').fillna(0)
-        cash_flow_df['net_cash_flow'] = cash_flow_df['total_revenue'] - cash_flow_df['total_expenses']
-        cash_flow_df = cash_flow_df[['ds', 'net_cash_flow']]
-        
-        # Category-wise expenses (take absolute values)
+        # Category-wise expenses (absolute values)
         category_data = {}
         for category in self.categories:
-            cat_df = df[df['category'] == category]['amount'].abs().groupby(df['date']).sum().reset_index()
-            cat_df.columns = ['ds', f'{category}_amount']
-            category_data[category] = cat_df
+            column = f'{category}_amount'
+            if column in daily:
+                category_data[category] = daily[column]
+            else:
+                category_data[category] = daily['total_revenue'][['ds']].assign(**{column: 0.0})
         
         return {
-            'daily_cash_flow': cash_flow_df,
-            'daily_expenses': expenses_df,
-            'daily_revenue': revenue_df,
+            'daily_cash_flow': daily['net_cash_flow'],
+            'daily_expenses': daily['total_expenses'],
+            'daily_revenue': daily['total_revenue'],
             'categories': category_data
         }
     
-    def forecast_with_prophet(self, df, periods=30, metric_name="Cash Flow"):
-        """Create forecast using Prophet"""
+    def forecast_with_prophet(self, df, periods=30, metric_name="Cash Flow", engine="prophet", intervals=True):
+        """Create forecast using Prophet (or engine="fast" for the NumPy ridge model, same columns).
+        
+        intervals=False skips Prophet's uncertainty sampling: yhat is unchanged and yhat_lower/upper
+        are an analytic approximation. Use it when the caller never reads the confidence range.
+        """
         
         print(f"🔮 Creating {periods}-day forecast for {metric_name}...")
         
-        # Prepare data for Prophet
-        prophet_df = df[['ds', df.columns[1]]].copy()
+        # Prepare data for Prophet; the value column (e.g. total_revenue) names the series whatever
+        # label the caller displays, so every endpoint fitting it shares its warm starts
+        series = df.columns[1]
+        prophet_df = df[['ds', series]].copy()
         prophet_df.columns = ['ds', 'y']
         
         # Remove any rows with missing values
@@ -338,31 +231,153 @@ class BusinessForecaster:
             print(f"❌ Not enough data points for {metric_name} forecasting")
             return None
         
-        # Create and fit Prophet model with compatible parameters
-        model = Prophet(
-            daily_seasonality=True,
-            weekly_seasonality=True,
-            yearly_seasonality=False,  # Changed from monthly_seasonality
-            seasonality_mode='multiplicative',
-            changepoint_prior_scale=0.1
+        horizon = max(periods, MAX_FORECAST_DAYS)
+        fingerprint = series_fingerprint(prophet_df)
+        fit = self._fit_fast if engine == "fast" else self._fit_prophet
+        fitted = model_cache.get_or_compute(
+            (self.business_id, engine) + fingerprint, None,
+            lambda: fit(prophet_df, horizon, metric_name, fingerprint, series)
         )
+        sampled = intervals and engine != "fast"
+        if sampled:
+            # Sampled intervals come from the same fitted model - only predict runs again
+            point = fitted
+            fitted = model_cache.get_or_compute(
+                (self.business_id, engine, "sampled") + fingerprint, None,
+                lambda: self._sample_prophet(point, prophet_df, horizon, metric_name, fingerprint, series)
+            )
+        
+        rows = len(prophet_df) + periods
+        if len(fitted['forecast']) >= rows:
+            forecast = fitted['forecast'].iloc[:rows].copy()
+        else:
+            # Only for periods beyond MAX_FORECAST_DAYS, whose cached fit is shorter - reuse the model, predict further
+            model = fitted['model']
+            future = model.make_future_dataframe(periods=periods)
+            forecast = model.predict(future) if sampled or engine == "fast" else predict_point(model, future)
         
-        # Add monthly seasonality manually
-        model.add_seasonality(name='monthly', period=30.5, fourier_order=5)
+        return {
+            'model': fitted['model'],
+            'forecast': forecast,
+            'historical': prophet_df
+        }
+    
+    def forecast_many(self, jobs, periods=30, engine="prophet", intervals=True, on_result=None):
+        """Run forecast_with_prophet for several independent series at once.
+        
+        jobs maps a result name to (df, metric_name); results come back under the same names.
+        Each fit runs in its own worker process, so the batch takes about as long as its slowest fit.
+        on_result(name, result) is called as each one finishes, fastest first.
+        """
+        
+        results = {}
+        if engine == "fast" or fit_pool(self.business_id) is None or len(jobs) < 2:
+            for name, (df, metric_name) in jobs.items():
+                results[name] = self.forecast_with_prophet(df, periods, metric_name, engine=engine, intervals=intervals)
+                if on_result is not None:
+                    on_result(name, results[name])
+            return results
+        
+        # The threads only wait on the worker processes
+        with ThreadPoolExecutor(max_workers=len(jobs), thread_name_prefix="finlo-fit") as dispatch:
+            futures = {
+                dispatch.submit(self.forecast_with_prophet, df, periods, metric_name,
+                                engine=engine, intervals=intervals): name
+                for name, (df, metric_name) in jobs.items()
+            }
+            for future in as_completed(futures):
+                name = futures[future]
+                results[name] = future.result()
+                if on_result is not None:
+                    on_result(name, results[name])
+        # Same order as jobs, whichever finished first
+        return {name: results[name] for name in jobs}
+    
+    def forecast_categories(self, rollup, periods=30):
+        """Forecast every category at once with the batched NumPy engine.
         
-        model.fit(prophet_df)
+        All category series share one dense daily calendar, so they share one design matrix and
+        one solve; fitting five or fifty categories costs about the same as fitting one.
+        Returns {category: forecast frame} with the usual ds/trend/yhat_lower/yhat_upper/yhat columns.
+        """
         
-        # Create future dataframe
-        future = model.make_future_dataframe(periods=periods)
+        ds, amounts = rollup.category_matrix()
+        if len(ds) < 10:
+            print("❌ Not enough data points for category forecasting")
+            return {}
         
-        # Make predictions
-        forecast = model.predict(future)
+        print(f"⚡ Forecasting {len(rollup.categories)} categories together ({len(ds)} days)...")
+        return forecast_matrix(ds, amounts, rollup.categories, periods)
+    
+    def _fit_fast(self, prophet_df, horizon, metric_name, fingerprint=None, series=None):
+        """Fit the NumPy ridge model - milliseconds, so always in-process"""
         
+        print(f"⚡ Fitting fast {metric_name} model ({len(prophet_df)} days)...")
+        model = FourierRidgeModel().fit(prophet_df)
         return {
             'model': model,
-            'forecast': forecast,
-            'historical': prophet_df
+            'forecast': model.predict(model.make_future_dataframe(periods=horizon))
+        }
+    
+    def _fit_prophet(self, prophet_df, horizon, metric_name, fingerprint=None, series=None):
+        """Fit a model on prophet_df and point-predict `horizon` days past its end.
+        A model saved to the registry by any worker for the same series is loaded instead.
+        series identifies the data being fitted (metric_name when not given) for the registry
+        and warm starts, so the same series fitted under different labels shares one file."""
+        
+        fingerprint = fingerprint or series_fingerprint(prophet_df)
+        series = series or metric_name
+        stored = model_registry.load(self.business_id, series, fingerprint)
+        if stored is not None and len(stored['forecast']) >= len(prophet_df) + horizon:
+            print(f"📦 Loaded saved {metric_name} model ({len(prophet_df)} days)")
+            return stored
+        
+        # Start the optimizer from the last fit of this series - after a few new days it is
+        # already close to the optimum and converges in far fewer iterations
+        init = model_registry.load_warm_start(self.business_id, series)
+        print(f"🧠 Fitting {metric_name} model ({len(prophet_df)} days{', warm start' if init else ''})...")
+        
+        # The business's own shard of the pool, and no more than its share of fits at once
+        pool = fit_pool(self.business_id)
+        model_json = None
+        with business_slot(self.business_id):
+            if pool is None:
+                model, forecast = fit_and_predict(prophet_df, horizon, intervals=False, init=init)
+            else:
+                model_json, forecast = pool.submit(fit_in_worker, prophet_df, horizon, False, init).result()
+                model = model_from_json(model_json)
+        model_registry.save_warm_start(self.business_id, series, warm_start_params(model))
+        
+        fitted = {
+            'model': model,
+            'model_json': model_json,
+            'forecast': forecast
         }
+        model_registry.save(self.business_id, series, fingerprint, fitted)
+        return fitted
+    
+    def _sample_prophet(self, fitted, prophet_df, horizon, metric_name, fingerprint, series=None):
+        """Uncertainty-sampled forecast from an already fitted Prophet model"""
+        
+        stored = fitted.get('sampled_forecast')
+        if stored is not None and len(stored) >= len(prophet_df) + horizon:
+            return {'model': fitted['model'], 'forecast': stored}
+        
+        print(f"🎲 Sampling {metric_name} forecast intervals...")
+        
+        pool = fit_pool(self.business_id)
+        with business_slot(self.business_id):
+            if pool is None:
+                model = fitted['model']
+                forecast = model.predict(model.make_future_dataframe(periods=horizon))
+            else:
+                model_json = fitted.get('model_json') or model_to_json(fitted['model'])
+                fitted['model_json'] = model_json
+                forecast = pool.submit(sample_in_worker, model_json, horizon).result()
+        
+        fitted['sampled_forecast'] = forecast
+        model_registry.save(self.business_id, series or metric_name, fingerprint, fitted)
+        return {'model': fitted['model'], 'forecast': forecast}
     
     def create_forecast_summary(self, forecasts):
         """Create business forecast summary"""
@@ -420,8 +435,15 @@ class BusinessForecaster:
         
         return '\n'.join(insights)
     
-    def run_complete_analysis(self, generate_dummy=True, days=90, forecast_days=30):
-        """Run complete forecasting analysis"""
+    def run_complete_analysis(self, generate_dummy=True, days=90, forecast_days=30, engine="prophet", progress=None):
+        """Run complete forecasting analysis.
+        
+        progress(event, data), when given, is called after each stage: "fetch" (data summary),
+        "prepare" (series lengths and the metrics about to be fitted), "metric" once per finished
+        forecast ({'metric', 'result'}) and "summary" (summary and insights).
+        """
+        
+        report = progress or (lambda event, data: None)
         
         print("🚀 Starting Business Forecasting Analysis")
         print("=" * 50)
@@ -431,57 +453,60 @@ class BusinessForecaster:
             dummy_df = self.generate_dummy_data(days)
             self.insert_dummy_data_to_supabase(dummy_df)
         
-        # Step 2: Fetch data from database
-        df = self.fetch_data_from_supabase()
-        if df is None:
+        # Step 2: Fetch data from database (the rollup is kept current by the transaction cache)
+        rollup = self.fetch_daily_rollup()
+        if rollup is None:
             return
+        df = self.transaction_cache.get_frame(refresh=False)
+        totals = rollup.totals()
         
         print(f"\n📊 **DATA SUMMARY**")
-        print(f"Total Records: {len(df)}")
-        print(f"Date Range: {df['date'].min().date()} to {df['date'].max().date()}")
+        print(f"Total Records: {rollup.transaction_count}")
+        print(f"Date Range: {days_to_dates([rollup.first_day])[0]} to {days_to_dates([rollup.last_day])[0]}")
         
-        # Calculate revenue and expenses properly
-        revenue_total = df[(df['category'] == 'other') & (df['amount'] > 0)]['amount'].sum()
-        expense_total = df[(df['amount'] < 0) | ((df['category'] != 'other') & (df['amount'] > 0))]['amount'].abs().sum()
+        revenue_total = totals['revenue']
+        expense_total = totals['expenses']
         net_cash_flow = revenue_total - expense_total
         
         print(f"Total Revenue: ${revenue_total:,.2f}")
         print(f"Total Expenses: ${expense_total:,.2f}")
         print(f"Net Cash Flow: ${net_cash_flow:,.2f}")
+        report("fetch", {
+            'transaction_count': rollup.transaction_count,
+            'first_date': str(days_to_dates([rollup.first_day])[0]),
+            'last_date': str(days_to_dates([rollup.last_day])[0]),
+            'total_revenue': revenue_total,
+            'total_expenses': expense_total,
+            'net_cash_flow': net_cash_flow
+        })
         
         # Step 3: Prepare data for forecasting
-        prepared_data = self.prepare_data_for_prophet(df)
+        prepared_data = self.prepare_data_for_prophet(rollup)
         
         # Step 4: Create forecasts
         forecasts = {}
         
-        # Forecast total expenses
+        # Forecast total expenses, total revenue and cash flow - the three fits run in parallel
+        jobs = {}
         if len(prepared_data['daily_expenses']) > 10:
-            forecasts['expenses'] = self.forecast_with_prophet(
-                prepared_data['daily_expenses'], 
-                forecast_days, 
-                "Daily Expenses"
-            )
-        
-        # Forecast total revenue
+            jobs['expenses'] = (prepared_data['daily_expenses'], "Daily Expenses")
         if len(prepared_data['daily_revenue']) > 10:
-            forecasts['revenue'] = self.forecast_with_prophet(
-                prepared_data['daily_revenue'], 
-                forecast_days, 
-                "Daily Revenue"
-            )
-        
-        # Forecast cash flow
+            jobs['revenue'] = (prepared_data['daily_revenue'], "Daily Revenue")
         if len(prepared_data['daily_cash_flow']) > 10:
-            forecasts['cash_flow'] = self.forecast_with_prophet(
-                prepared_data['daily_cash_flow'], 
-                forecast_days, 
-                "Net Cash Flow"
-            )
+            jobs['cash_flow'] = (prepared_data['daily_cash_flow'], "Net Cash Flow")
+        report("prepare", {
+            'days': len(prepared_data['daily_cash_flow']),
+            'metrics': list(jobs)
+        })
+        forecasts.update(self.forecast_many(
+            jobs, forecast_days, engine=engine,
+            on_result=lambda name, result: report("metric", {'metric': name, 'result': result})
+        ))
         
         # Step 5: Generate summary and insights
         summary = self.create_forecast_summary(forecasts)
         insights = self.generate_business_insights(summary)
+        report("summary", {'summary': summary, 'insights': insights})
         
         print(f"\n🔮 **BUSINESS FORECAST ({forecast_days} DAYS)**")
         print("=" * 50)
@@ -490,10 +515,7 @@ class BusinessForecaster:
         # Step 6: Category breakdown
         print(f"\n📋 **EXPENSE BREAKDOWN BY CATEGORY**")
         # Get all expenses (negative amounts + positive amounts in non-'other' categories)
-        expense_mask = (df['amount'] < 0) | ((df['category'] != 'other') & (df['amount'] > 0))
-        category_expenses = df[expense_mask].copy()
-        category_expenses['abs_amount'] = category_expenses['amount'].abs()
-        category_summary = category_expenses.groupby('category')['abs_amount'].sum().sort_values(ascending=False)
+        category_summary = pd.Series(totals['category_expenses'], dtype='float64').sort_values(ascending=False)
         
         total_expenses = category_summary.sum()
         for category, amount in category_summary.items():
@@ -0,0 +1,212 @@
+#incrementally maintained per-day rollup of daily_expenses
+import numpy as np
+import pandas as pd
+from transaction_schema import CATEGORIES, days_to_datetime
+
+
+class DailyRollup:
+    """Per-day revenue/expense totals and per-category sums and counts.
+
+    Everything is kept in integer cents in arrays indexed by (day - start_day), so adding
+    one transaction is O(1) (amortised when the arrays have to grow) and every series the
+    forecaster needs is a slice of these arrays instead of a groupby over raw rows.
+    """
+
+    _ARRAYS = ('revenue_cents', 'revenue_count', 'expense_cents', 'expense_count',
+               'category_cents', 'category_expense_cents', 'category_count')
+
+    def __init__(self, categories=CATEGORIES):
+        self.categories = list(categories)
+        self._category_index = {name: i for i, name in enumerate(self.categories)}
+        self.start_day = None
+        self.first_day = None
+        self.last_day = None
+        self.transaction_count = 0
+        self._allocate(0)
+
+    def _allocate(self, capacity):
+        n_categories = len(self.categories)
+        self.revenue_cents = np.zeros(capacity, dtype='int64')
+        self.revenue_count = np.zeros(capacity, dtype='int32')
+        self.expense_cents = np.zeros(capacity, dtype='int64')
+        self.expense_count = np.zeros(capacity, dtype='int32')
+        # Absolute amounts of every row in the category (what the per-category forecast series use)
+        self.category_cents = np.zeros((capacity, n_categories), dtype='int64')
+        # Absolute amounts of the expense rows only (what the metrics breakdown uses)
+        self.category_expense_cents = np.zeros((capacity, n_categories), dtype='int64')
+        self.category_count = np.zeros((capacity, n_categories), dtype='int32')
+
+    @property
+    def capacity(self):
+        return len(self.revenue_cents)
+
+    @classmethod
+    def from_frame(cls, df, categories=CATEGORIES):
+        rollup = cls(categories)
+        rollup.add_frame(df)
+        return rollup
+
+    def copy(self):
+        clone = DailyRollup.__new__(DailyRollup)
+        clone.__dict__.update(self.__dict__)
+        clone.categories = list(self.categories)
+        clone._category_index = dict(self._category_index)
+        for name in self._ARRAYS:
+            setattr(clone, name, getattr(self, name).copy())
+        return clone
+
+    def _ensure_category(self, category):
+        index = self._category_index.get(category)
+        if index is None:
+            index = len(self.categories)
+            self.categories.append(category)
+            self._category_index[category] = index
+            for name in ('category_cents', 'category_expense_cents', 'category_count'):
+                values = getattr(self, name)
+                setattr(self, name, np.pad(values, ((0, 0), (0, 1))))
+        return index
+
+    def _ensure_days(self, low_day, high_day):
+        """Grow the arrays so that [low_day, high_day] is covered (doubling on the right)"""
+        if self.start_day is None:
+            # Exact fit for the first (usually whole-history) frame; appends double it later
+            self.start_day = int(low_day)
+            self._allocate(max(int(high_day - low_day + 1), 64))
+            return
+
+        prepend = max(self.start_day - int(low_day), 0)
+        needed = int(high_day) - self.start_day + 1 + prepend
+        if prepend == 0 and needed <= self.capacity:
+            return
+
+        append = max(needed - self.capacity - prepend, 0)
+        if append:
+            append = max(append, self.capacity)
+        for name in self._ARRAYS:
+            values = getattr(self, name)
+            padding = ((prepend, append),) + ((0, 0),) * (values.ndim - 1)
+            setattr(self, name, np.pad(values, padding))
+        self.start_day -= prepend
+
+    def add(self, day, amount_cents, category):
+        """Account for a single transaction"""
+
+        if pd.isna(category):
+            raise ValueError("Transaction has no category")
+        day = int(day)
+        self._ensure_days(day, day)
+        column = self._ensure_category(category)
+        i = day - self.start_day
+        absolute = abs(int(amount_cents))
+
+        if category == 'other' and amount_cents > 0:
+            self.revenue_cents[i] += amount_cents
+            self.revenue_count[i] += 1
+        elif amount_cents != 0:
+            self.expense_cents[i] += absolute
+            self.expense_count[i] += 1
+            self.category_expense_cents[i, column] += absolute
+
+        self.category_cents[i, column] += absolute
+        self.category_count[i, column] += 1
+        self._track_range(day, day, 1)
+
+    def add_frame(self, df, chunk_rows=65536):
+        """Account for every row of a compact transaction frame (vectorised, chunk_rows at a time
+        so the per-row temporaries stay small however large the frame is)"""
+
+        if df is None or len(df) == 0:
+            return
+
+        days = df['day'].to_numpy()
+        cents = df['amount_cents'].to_numpy()
+        self._ensure_days(days.min(), days.max())
+
+        categories = df['category']
+        codes = categories.cat.codes.to_numpy()
+        # Code -1 is a missing category; as an index it would land on the last category column
+        missing = int((codes < 0).sum())
+        if missing:
+            raise ValueError(f"{missing} transactions have no category")
+        lookup = np.array([self._ensure_category(name) for name in categories.cat.categories], dtype='int64')
+        other = self._ensure_category('other')
+
+        for start in range(0, len(df), chunk_rows):
+            rows = slice(start, start + chunk_rows)
+            self._add_rows(days[rows].astype('int64') - self.start_day, cents[rows], lookup[codes[rows]], other)
+        self._track_range(days.min(), days.max(), len(df))
+
+    def _add_rows(self, index, cents, columns, other):
+        absolute = np.abs(cents)
+        revenue = (columns == other) & (cents > 0)
+        expense = ~revenue & (cents != 0)
+
+        np.add.at(self.revenue_cents, index[revenue], cents[revenue])
+        np.add.at(self.revenue_count, index[revenue], 1)
+        np.add.at(self.expense_cents, index[expense], absolute[expense])
+        np.add.at(self.expense_count, index[expense], 1)
+        np.add.at(self.category_expense_cents, (index[expense], columns[expense]), absolute[expense])
+        np.add.at(self.category_cents, (index, columns), absolute)
+        np.add.at(self.category_count, (index, columns), 1)
+
+    def _track_range(self, low_day, high_day, count):
+        self.first_day = int(low_day) if self.first_day is None else min(self.first_day, int(low_day))
+        self.last_day = int(high_day) if self.last_day is None else max(self.last_day, int(high_day))
+        self.transaction_count += count
+
+    def _used(self):
+        """Slice covering first_day..last_day"""
+        if self.first_day is None:
+            return slice(0, 0)
+        return slice(self.first_day - self.start_day, self.last_day - self.start_day + 1)
+
+    def _window(self, start_day=None, end_day=None):
+        if self.first_day is None:
+            return slice(0, 0)
+        start_day = self.first_day if start_day is None else max(int(start_day), self.first_day)
+        end_day = self.last_day if end_day is None else min(int(end_day), self.last_day)
+        return slice(start_day - self.start_day, max(end_day - self.start_day + 1, start_day - self.start_day))
+
+    def dense_series(self):
+        """Every forecast series on one dense calendar first_day..last_day, zero on days without
+        transactions: {column: ds/column frame} for total_revenue, total_expenses, net_cash_flow and
+        {category}_amount. All frames are views of one float block filled in a single pass."""
+        used = self._used()
+        n_days = used.stop - used.start
+        values = np.empty((3 + len(self.categories), n_days), dtype='float64')
+        values[0] = self.revenue_cents[used]
+        values[1] = self.expense_cents[used]
+        np.subtract(values[0], values[1], out=values[2])
+        values[3:] = self.category_cents[used].T
+        values /= 100
+
+        ds = days_to_datetime(np.arange(used.start, used.stop) + self.start_day)
+        columns = ['total_revenue', 'total_expenses', 'net_cash_flow'] + [f'{name}_amount' for name in self.categories]
+        # copy=False: the frames share ds and their row of `values` instead of each owning a copy
+        return {
+            column: pd.DataFrame({'ds': ds, column: values[i]}, copy=False)
+            for i, column in enumerate(columns)
+        }
+
+    def category_matrix(self):
+        """Dense calendar first_day..last_day and a days x categories matrix of absolute amounts
+        (dollars, zero on days without transactions) - the stacked input for batched forecasting"""
+        used = self._used()
+        ds = days_to_datetime(np.arange(used.start, used.stop) + self.start_day)
+        return ds, self.category_cents[used] / 100
+
+    def totals(self, start_day=None, end_day=None):
+        """Revenue/expense totals (dollars), transaction count and expense breakdown for a day range"""
+
+        window = self._window(start_day, end_day)
+        category_expenses = self.category_expense_cents[window].sum(axis=0)
+        return {
+            'revenue': self.revenue_cents[window].sum() / 100,
+            'expenses': self.expense_cents[window].sum() / 100,
+            'transaction_count': int(self.category_count[window].sum()),
+            'category_expenses': {
+                name: category_expenses[i] / 100
+                for i, name in enumerate(self.categories)
+                if category_expenses[i] > 0
+            }
+        }
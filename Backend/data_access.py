@@ -0,0 +1,122 @@
+#shared data-access layer - one pooled Supabase client per process
+import os
+import threading
+import httpx
+from dotenv import load_dotenv
+from postgrest.utils import SyncClient
+from supabase import create_client, Client, ClientOptions
+
+load_dotenv()
+
+
+class PooledSession(SyncClient):
+    """PostgREST HTTP session with a bounded number of in-flight requests and per-call timeouts"""
+
+    def __init__(self, max_concurrency, **kwargs):
+        super().__init__(**kwargs)
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+
+    def request(self, method, url, **kwargs):
+        with self._slots:
+            return super().request(method, url, **kwargs)
+
+
+class CallTimeout:
+    """Stands in for the session of one query builder so every request it sends uses `timeout`"""
+
+    def __init__(self, session, timeout):
+        self.session = session
+        self.timeout = timeout
+
+    def request(self, method, url, **kwargs):
+        return self.session.request(method, url, timeout=self.timeout, **kwargs)
+
+
+class TimeoutClient:
+    """data_access with a fixed per-call timeout, for helpers that take a client and call .table()"""
+
+    def __init__(self, data_access, timeout):
+        self.data_access = data_access
+        self.timeout = timeout
+
+    def table(self, name):
+        return self.data_access.table(name, timeout=self.timeout)
+
+
+class DataAccess:
+    """Lazily creates the Supabase client and swaps its PostgREST session for a pooled one.
+
+    Every module goes through `data_access.table(...)`, so all requests in the process share
+    one keep-alive connection pool and one concurrency limit.
+    """
+
+    def __init__(self, url, key, max_connections=20, max_keepalive_connections=10,
+                 keepalive_expiry=30.0, timeout=10.0, max_concurrency=8, slow_timeout=60.0):
+        self.url = url
+        self.key = key
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry
+        )
+        self.timeout = timeout
+        # For calls that grow with the table: full-history reads, exact counts, bulk inserts
+        self.slow_timeout = slow_timeout
+        self.max_concurrency = max_concurrency
+        self._client = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            os.getenv("SUPABASE_URL"),
+            os.getenv("SUPABASE_ANON_KEY"),
+            max_connections=int(os.getenv("SUPABASE_MAX_CONNECTIONS", "20")),
+            max_keepalive_connections=int(os.getenv("SUPABASE_MAX_KEEPALIVE", "10")),
+            keepalive_expiry=float(os.getenv("SUPABASE_KEEPALIVE_EXPIRY_SECONDS", "30")),
+            timeout=float(os.getenv("SUPABASE_TIMEOUT_SECONDS", "10")),
+            slow_timeout=float(os.getenv("SUPABASE_SLOW_TIMEOUT_SECONDS", "60")),
+            max_concurrency=int(os.getenv("SUPABASE_MAX_CONCURRENCY", "8"))
+        )
+
+    @property
+    def client(self) -> Client:
+        with self._lock:
+            if self._client is None:
+                self._client = create_client(
+                    self.url, self.key, ClientOptions(postgrest_client_timeout=self.timeout)
+                )
+            postgrest = self._client.postgrest
+            # The client rebuilds its PostgREST wrapper on auth changes, so re-check every time
+            if not isinstance(postgrest.session, PooledSession):
+                default_session = postgrest.session
+                postgrest.session = PooledSession(
+                    self.max_concurrency,
+                    base_url=default_session.base_url,
+                    headers=default_session.headers,
+                    timeout=self.timeout,
+                    limits=self.limits,
+                    follow_redirects=True,
+                    http2=True
+                )
+                default_session.close()
+            return self._client
+
+    def table(self, name, timeout=None):
+        """Query builder for `name`; timeout (seconds) replaces the default for the requests it sends"""
+        builder = self.client.table(name)
+        if timeout is not None:
+            builder.session = CallTimeout(builder.session, timeout)
+        return builder
+
+    def with_timeout(self, timeout):
+        return TimeoutClient(self, timeout)
+
+    def close(self):
+        with self._lock:
+            if self._client is not None:
+                self._client.postgrest.session.close()
+                self._client = None
+
+
+data_access = DataAccess.from_env()
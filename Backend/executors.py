@@ -0,0 +1,122 @@
+#bounded executors for blocking work called from async FastAPI handlers
+import asyncio
+import functools
+import multiprocessing
+import os
+import threading
+import weakref
+import zlib
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+# Supabase and Groq calls: network-bound, many can wait at once
+io_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("IO_WORKERS", "16")),
+    thread_name_prefix="finlo-io"
+)
+
+# Prophet fits: CPU heavy, keep a few at a time so they cannot take over the box
+FORECAST_WORKERS = int(os.getenv("FORECAST_WORKERS", "4"))
+forecast_executor = ThreadPoolExecutor(
+    max_workers=FORECAST_WORKERS,
+    thread_name_prefix="finlo-forecast"
+)
+# Forecast requests one business may have on forecast_executor at once, so a business running
+# long comprehensive fits leaves threads free for everyone else
+FORECAST_MAX_PER_BUSINESS = int(os.getenv("FORECAST_MAX_PER_BUSINESS", str(max(1, FORECAST_WORKERS // 2))))
+
+# Prophet fits proper: worker processes so independent series use separate cores.
+# 0 (the default on single-core machines) fits in-process instead.
+FIT_PROCESSES = int(os.getenv("FIT_PROCESSES", str(min(3, os.cpu_count() or 1) if (os.cpu_count() or 1) > 1 else 0)))
+# The workers are split into shards and every business always fits on the same shard, so a
+# business with a burst of fits only queues behind itself and the businesses sharing its shard
+FIT_SHARDS = max(1, min(int(os.getenv("FIT_SHARDS", "2" if FIT_PROCESSES >= 2 else "1")), max(FIT_PROCESSES, 1)))
+# Fits one business may have submitted at once; the rest wait their turn outside the pool queue.
+# 0 (the default) sizes it per shard, see fit_limit
+FIT_MAX_PER_BUSINESS = int(os.getenv("FIT_MAX_PER_BUSINESS", "0"))
+# Independent series in one comprehensive forecast (expenses, revenue, cash flow)
+COMPREHENSIVE_SERIES = 3
+_fit_pools = {}
+_fit_pool_lock = threading.Lock()
+# Per-business semaphores live only while someone holds them, so idle businesses cost nothing
+_business_slots = weakref.WeakValueDictionary()
+_request_slots = weakref.WeakValueDictionary()
+
+
+def fit_shard(business_id=None):
+    """Stable shard index for a business (crc32, so every API worker agrees)"""
+    return zlib.crc32(str(business_id).encode()) % FIT_SHARDS
+
+
+def fit_pool(business_id=None):
+    """Spawn-based process pool of the business's shard, created on first use (None when disabled)"""
+    if FIT_PROCESSES <= 0:
+        return None
+    return _shard_pool(fit_shard(business_id))
+
+
+def shard_processes(shard):
+    """Worker processes of one shard; the remainder of FIT_PROCESSES goes to the first shards"""
+    return FIT_PROCESSES // FIT_SHARDS + (1 if shard < FIT_PROCESSES % FIT_SHARDS else 0)
+
+
+def _shard_pool(shard):
+    with _fit_pool_lock:
+        pool = _fit_pools.get(shard)
+        if pool is None:
+            # spawn, like main.py: forking a process that holds threads and open connections is unsafe
+            pool = _fit_pools[shard] = ProcessPoolExecutor(
+                max_workers=shard_processes(shard),
+                mp_context=multiprocessing.get_context('spawn')
+            )
+        return pool
+
+
+def fit_limit(business_id=None):
+    """Fits one business may run at once: FIT_MAX_PER_BUSINESS when set, otherwise its shard's
+    processes but never fewer than the series of one comprehensive forecast, so those always overlap"""
+    if FIT_MAX_PER_BUSINESS > 0:
+        return FIT_MAX_PER_BUSINESS
+    return max(shard_processes(fit_shard(business_id)), COMPREHENSIVE_SERIES)
+
+
+def business_slot(business_id=None):
+    """Semaphore bounding how many fits one business runs at a time (use as a context manager)"""
+    with _fit_pool_lock:
+        slot = _business_slots.get(business_id)
+        if slot is None:
+            slot = _business_slots[business_id] = threading.BoundedSemaphore(fit_limit(business_id))
+        return slot
+
+
+def warm_fit_pool():
+    """Start the fit workers of every shard and load Prophet in each, without waiting for them"""
+    if FIT_PROCESSES <= 0:
+        return
+    from prophet_fit import warm_up
+    for shard in range(FIT_SHARDS):
+        pool = _shard_pool(shard)
+        for _ in range(shard_processes(shard)):
+            pool.submit(warm_up)
+
+
+async def run_blocking(executor, fn, *args, **kwargs):
+    """Run a blocking callable on `executor` without stalling the event loop"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, functools.partial(fn, *args, **kwargs))
+
+
+async def run_io(fn, *args, **kwargs):
+    return await run_blocking(io_executor, fn, *args, **kwargs)
+
+
+async def run_forecast(fn, *args, **kwargs):
+    return await run_blocking(forecast_executor, fn, *args, **kwargs)
+
+
+async def run_business_forecast(business_id, fn, *args, **kwargs):
+    """run_forecast, waiting (without holding a thread) while the business has FORECAST_MAX_PER_BUSINESS running"""
+    slot = _request_slots.get(business_id)
+    if slot is None:
+        slot = _request_slots[business_id] = asyncio.Semaphore(max(FORECAST_MAX_PER_BUSINESS, 1))
+    async with slot:
+        return await run_forecast(fn, *args, **kwargs)
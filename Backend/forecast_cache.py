@@ -0,0 +1,111 @@
+#in-process cache of finished forecast responses
+import os
+import threading
+import time
+from collections import OrderedDict
+
+
+class ForecastCache:
+    """LRU + TTL cache for forecast results, tied to the transaction data version.
+
+    Entries are only valid for the data version they were computed from: as soon as a caller
+    reports a newer version every entry is dropped, so new transactions invalidate forecasts
+    automatically. Concurrent misses on the same key wait for a single computation.
+
+    Versions are tracked per namespace (one per business), so new data for one business only
+    drops that business's entries while all of them share the LRU capacity.
+    """
+
+    def __init__(self, max_entries=64, ttl_seconds=900.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()  # (namespace, key) -> (stored_at, value)
+        self._in_flight = {}           # (namespace, key) -> threading.Event
+        self._versions = {}            # namespace -> data version
+        self._lock = threading.Lock()
+        self._counters = {'hits': 0, 'misses': 0, 'evictions': 0, 'expirations': 0, 'invalidations': 0}
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            max_entries=int(os.getenv("FORECAST_CACHE_SIZE", "64")),
+            ttl_seconds=float(os.getenv("FORECAST_CACHE_TTL_SECONDS", "900"))
+        )
+
+    def get_or_compute(self, key, version, compute, namespace=None):
+        """Return the cached value for (key, version), computing and storing it on a miss.
+        Pass version=None when the key itself already identifies the data."""
+
+        key = (namespace, key)
+        while True:
+            with self._lock:
+                self._check_version(namespace, version)
+                value = self._lookup(key)
+                if value is not None:
+                    self._counters['hits'] += 1
+                    return value
+                event = self._in_flight.get(key)
+                if event is None:
+                    self._counters['misses'] += 1
+                    event = self._in_flight[key] = threading.Event()
+                    break
+            # Someone else is computing this key - wait and look again
+            event.wait()
+
+        try:
+            value = compute()
+            with self._lock:
+                if self._versions.get(namespace) == version:
+                    self._store(key, value)
+            return value
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+            event.set()
+
+    def invalidate(self):
+        with self._lock:
+            self._counters['invalidations'] += len(self._entries)
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self._counters['hits'] + self._counters['misses']
+            return {
+                **self._counters,
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl_seconds': self.ttl_seconds,
+                'data_versions': {str(namespace): version for namespace, version in self._versions.items()},
+                'hit_rate': round(self._counters['hits'] / lookups, 4) if lookups else 0.0,
+            }
+
+    def _check_version(self, namespace, version):
+        if version != self._versions.get(namespace):
+            stale = [key for key in self._entries if key[0] == namespace]
+            for key in stale:
+                del self._entries[key]
+            self._counters['invalidations'] += len(stale)
+            self._versions[namespace] = version
+
+    def _lookup(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        stored_at, value = entry
+        if time.monotonic() - stored_at > self.ttl_seconds:
+            del self._entries[key]
+            self._counters['expirations'] += 1
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def _store(self, key, value):
+        self._entries[key] = (time.monotonic(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._counters['evictions'] += 1
+
+
+forecast_cache = ForecastCache.from_env()
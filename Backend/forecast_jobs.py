@@ -0,0 +1,181 @@
+#in-process job queue for forecasts too slow to answer inside one HTTP request
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED = (SUCCEEDED, FAILED, CANCELLED)
+
+
+class JobQueueFull(Exception):
+    """Raised by submit when max_queued jobs, or max_queued_per_business of one business, are already waiting"""
+
+
+class ForecastJobQueue:
+    """Runs submitted forecasts on a fixed set of worker threads and keeps their results for polling.
+
+    At most max_concurrent jobs run at once and at most max_queued wait behind them, no more than
+    max_queued_per_business of them from any one business so a single tenant cannot fill the queue. A queued
+    job can be cancelled outright; a fit that has started cannot be interrupted, so cancelling
+    a running job only discards its result. Finished jobs are kept for result_ttl seconds and
+    at most max_jobs of them, oldest first out.
+    """
+
+    def __init__(self, max_concurrent=2, max_queued=100, max_queued_per_business=10, max_jobs=500, result_ttl=3600.0):
+        self.max_concurrent = max_concurrent
+        self.max_queued = max_queued
+        self.max_queued_per_business = max_queued_per_business
+        self.max_jobs = max_jobs
+        self.result_ttl = result_ttl
+
+        self._jobs = OrderedDict()  # job id -> job dict, in submission order
+        self._pending = deque()     # ids of queued jobs, next to run first
+        self._cond = threading.Condition()
+        self._workers = []
+        self._counters = {'submitted': 0, 'succeeded': 0, 'failed': 0, 'cancelled': 0, 'rejected': 0}
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            max_concurrent=int(os.getenv("FORECAST_JOB_WORKERS", "2")),
+            max_queued=int(os.getenv("FORECAST_JOB_QUEUE_SIZE", "100")),
+            max_queued_per_business=int(os.getenv("FORECAST_JOB_QUEUE_PER_BUSINESS", "10")),
+            max_jobs=int(os.getenv("FORECAST_JOB_MAX_KEPT", "500")),
+            result_ttl=float(os.getenv("FORECAST_JOB_TTL_SECONDS", "3600"))
+        )
+
+    def submit(self, compute, params=None, business_id=None):
+        """Queue compute() and return the new job's status; raises JobQueueFull when the queue, or the
+        business's share of it, is full"""
+
+        with self._cond:
+            self._prune()
+            if len(self._pending) >= self.max_queued:
+                self._counters['rejected'] += 1
+                raise JobQueueFull(f"{len(self._pending)} forecast jobs already queued")
+            queued = sum(1 for pending_id in self._pending if self._jobs[pending_id]['business_id'] == business_id)
+            if queued >= self.max_queued_per_business:
+                self._counters['rejected'] += 1
+                raise JobQueueFull(f"{queued} forecast jobs already queued for this business")
+
+            job_id = uuid.uuid4().hex
+            self._jobs[job_id] = {
+                'job_id': job_id,
+                'status': QUEUED,
+                'business_id': business_id,
+                'params': params or {},
+                'submitted_at': time.time(),
+                'started_at': None,
+                'finished_at': None,
+                'result': None,
+                'error': None,
+                'cancel_requested': False,
+                'compute': compute,
+            }
+            self._pending.append(job_id)
+            self._counters['submitted'] += 1
+            self._start_workers()
+            self._cond.notify()
+            return self._view(self._jobs[job_id])
+
+    def get(self, job_id):
+        """Status of a job (with its result once it has succeeded), or None if unknown or expired"""
+
+        with self._cond:
+            job = self._jobs.get(job_id)
+            return self._view(job) if job is not None else None
+
+    def cancel(self, job_id):
+        """Cancel a job; returns its status afterwards, or None if unknown. Finished jobs are left as they are."""
+
+        with self._cond:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            if job['status'] == QUEUED:
+                self._pending.remove(job_id)
+                self._finish(job, CANCELLED)
+            elif job['status'] == RUNNING:
+                # Picked up by the worker when the fit returns
+                job['cancel_requested'] = True
+            return self._view(job)
+
+    def stats(self):
+        with self._cond:
+            running = sum(1 for job in self._jobs.values() if job['status'] == RUNNING)
+            return {
+                **self._counters,
+                'queued': len(self._pending),
+                'running': running,
+                'kept': len(self._jobs),
+                'max_concurrent': self.max_concurrent,
+                'max_queued': self.max_queued,
+                'max_queued_per_business': self.max_queued_per_business,
+            }
+
+    def _start_workers(self):
+        # Threads are started on first use, so importing the API costs nothing
+        while len(self._workers) < self.max_concurrent:
+            worker = threading.Thread(
+                target=self._run, name=f"finlo-forecast-job-{len(self._workers)}", daemon=True
+            )
+            self._workers.append(worker)
+            worker.start()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+                job = self._jobs[self._pending.popleft()]
+                job['status'] = RUNNING
+                job['started_at'] = time.time()
+                compute = job.pop('compute')
+
+            try:
+                result, error = compute(), None
+            except Exception as e:
+                # HTTPException carries the message in detail
+                result, error = None, str(getattr(e, 'detail', e))
+
+            with self._cond:
+                if job['cancel_requested']:
+                    self._finish(job, CANCELLED)
+                elif error is not None:
+                    job['error'] = error
+                    self._finish(job, FAILED)
+                    print(f"⚠️  Forecast job {job['job_id']} failed: {error}")
+                else:
+                    job['result'] = result
+                    self._finish(job, SUCCEEDED)
+
+    def _finish(self, job, status):
+        job['status'] = status
+        job['finished_at'] = time.time()
+        job.pop('compute', None)
+        self._counters[status] += 1
+
+    def _prune(self):
+        now = time.time()
+        finished = [job_id for job_id, job in self._jobs.items() if job['status'] in FINISHED]
+        expired = [job_id for job_id in finished if now - self._jobs[job_id]['finished_at'] > self.result_ttl]
+        overflow = finished[:max(len(finished) - self.max_jobs, 0)]
+        for job_id in set(expired) | set(overflow):
+            del self._jobs[job_id]
+
+    def _view(self, job):
+        view = {key: value for key, value in job.items() if key not in ('compute', 'result')}
+        if job['status'] == QUEUED:
+            view['queue_position'] = self._pending.index(job['job_id'])
+        if job['status'] == SUCCEEDED:
+            view['result'] = job['result']
+        return view
+
+
+forecast_jobs = ForecastJobQueue.from_env()
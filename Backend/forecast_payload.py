@@ -0,0 +1,70 @@
+#columnar formatting of forecast frames into JSON responses
+import json
+import math
+import numpy as np
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def forecast_rows(future_data, value_column='yhat'):
+    """[{'date', 'predicted_value', 'trend'}] for a forecast slice, formatted a column at a time"""
+
+    dates = np.datetime_as_string(future_data['ds'].to_numpy().astype('datetime64[D]')).tolist()
+    values = _rounded(future_data[value_column])
+    # Some frames (e.g. profit built from two fits) have no trend of their own
+    trend = _rounded(future_data['trend']) if 'trend' in future_data else values
+    return [
+        {"date": d, "predicted_value": v, "trend": t}
+        for d, v, t in zip(dates, values, trend)
+    ]
+
+
+def forecast_summary(future_data, value_column='yhat'):
+    """Total, daily average and trend direction of a forecast slice - the keys every forecast summary shares"""
+
+    values = future_data[value_column]
+    return {
+        "total_forecast": round(values.sum(), 2),
+        "daily_average": round(values.mean(), 2),
+        "trend_direction": "increasing" if values.iloc[-1] > values.iloc[0] else "decreasing"
+    }
+
+
+def _rounded(column):
+    # Python's round, not np.round: np.round scales by 100 first and rounds e.g. -12.345 to -12.34
+    values = column.to_numpy(dtype='float64').tolist()
+    # NaN is not valid JSON; report missing predictions as null like the Pydantic path did
+    return [None if math.isnan(v) else round(v, 2) for v in values]
+
+
+def _default(obj):
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if hasattr(obj, 'isoformat'):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(content):
+    """JSON bytes via orjson when installed, the standard library otherwise"""
+
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(content, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class ForecastJSONResponse(JSONResponse):
+    """Returned directly from forecast routes so FastAPI skips jsonable_encoder and response validation"""
+
+    def render(self, content):
+        return dumps(content)
+
+
+def sse_event(event, data):
+    """One server-sent event frame (text/event-stream) carrying data as JSON"""
+
+    return b"event: " + event.encode() + b"\ndata: " + dumps(data) + b"\n\n"
@@ -0,0 +1,142 @@
+#background precomputation of forecast responses (stale-while-revalidate)
+import os
+import threading
+import time
+
+
+class ForecastScheduler:
+    """Keeps the latest result of every registered forecast and refreshes them on a background thread.
+
+    A target is recomputed when the data version moves on or when its result is older than
+    refresh_interval. Readers always get the latest finished result straight away, together
+    with its age and whether a newer one is being computed.
+
+    Each target can bring its own version function (one per business); targets sharing a
+    version function are checked with a single call per poll.
+    """
+
+    def __init__(self, version_fn, poll_seconds=30.0, refresh_interval=3600.0, min_check_interval=1.0):
+        # version_fn() syncs new transactions and returns the current data version; the default
+        # for targets registered without their own
+        self.version_fn = version_fn
+        self.poll_seconds = poll_seconds
+        self.refresh_interval = refresh_interval
+        # Requests wake the thread early, but never more often than this
+        self.min_check_interval = min_check_interval
+
+        self._targets = {}   # key -> (zero-argument callable building the response, version_fn)
+        self._latest = {}    # key -> (value, version, computed_at)
+        self._seen_versions = {}  # key -> data version at the last poll
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    @classmethod
+    def from_env(cls, version_fn):
+        return cls(
+            version_fn,
+            poll_seconds=float(os.getenv("FORECAST_REFRESH_POLL_SECONDS", "30")),
+            refresh_interval=float(os.getenv("FORECAST_REFRESH_INTERVAL_SECONDS", "3600"))
+        )
+
+    def register(self, key, compute, version_fn=None):
+        with self._lock:
+            self._targets[key] = (compute, version_fn or self.version_fn)
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="finlo-forecast-scheduler", daemon=True)
+        self._thread.start()
+        print(f"⏱️  Forecast scheduler started ({len(self._targets)} targets)")
+
+    def stop(self, timeout=5.0):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def wake(self):
+        """Ask the background thread to check for new data now instead of at the next poll"""
+        self._wake.set()
+
+    def latest(self, key):
+        """(value, {'age_seconds', 'computed_at', 'refreshing'}) for the newest result, or None"""
+
+        with self._lock:
+            entry = self._latest.get(key)
+            if entry is None or not self.running:
+                return None
+            value, version, computed_at = entry
+            age = time.time() - computed_at
+            refreshing = (
+                key in self._refreshing
+                or version != self._seen_versions.get(key)
+                or age > self.refresh_interval
+            )
+        return value, {
+            'age_seconds': round(age, 1),
+            'computed_at': computed_at,
+            'refreshing': refreshing
+        }
+
+    def refresh_due(self):
+        """Recompute every target that is missing, from an older data version, or too old"""
+
+        with self._lock:
+            targets = dict(self._targets)
+        versions = {}
+        for _, version_fn in targets.values():
+            if version_fn not in versions:
+                try:
+                    versions[version_fn] = version_fn()
+                except Exception as e:
+                    print(f"⚠️  Could not check for new data: {str(e)}")
+        
+        now = time.time()
+        with self._lock:
+            due = []
+            for key, (_, version_fn) in targets.items():
+                if version_fn not in versions:
+                    continue
+                version = self._seen_versions[key] = versions[version_fn]
+                if (key not in self._latest
+                        or self._latest[key][1] != version
+                        or now - self._latest[key][2] > self.refresh_interval):
+                    due.append(key)
+            self._refreshing.update(due)
+
+        for key in due:
+            compute, version_fn = targets[key]
+            try:
+                value = compute()
+                with self._lock:
+                    self._latest[key] = (value, versions[version_fn], time.time())
+            except Exception as e:
+                # Keep serving the previous result; the next poll tries again
+                print(f"⚠️  Background forecast {key} failed: {str(e)}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+        return len(due)
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                refreshed = self.refresh_due()
+                if refreshed:
+                    print(f"🔄 Precomputed {refreshed} forecasts")
+            except Exception as e:
+                print(f"❌ Forecast scheduler error: {str(e)}")
+            if self._stop.wait(self.min_check_interval):
+                break
+            self._wake.wait(self.poll_seconds)
+            self._wake.clear()
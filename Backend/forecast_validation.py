@@ -7,17 +7,14 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 from prophet import Prophet
 from prophet.diagnostics import cross_validation, performance_metrics
-from supabase import create_client, Client
-import os
 from dotenv import load_dotenv
+from business_forecasting import transaction_cache
+from transaction_schema import expand_compact_frame
 import warnings
 warnings.filterwarnings('ignore')
 
 load_dotenv()
 
-# Initialize Supabase client
-supabase: Client = create_client(os.getenv("SUPABASE_URL"), os.getenv("SUPABASE_ANON_KEY"))
-
 class ForecastValidator:
     def __init__(self):
         self.categories = ['ingredients', 'utilities', 'supplies', 'equipment', 'other']
@@ -25,15 +22,15 @@ class ForecastValidator:
     def fetch_data_from_supabase(self):
         """Fetch expense data from Supabase"""
         try:
-            result = supabase.table("daily_expenses").select("*").order("date", desc=False).execute()
+            # Same snapshot-first, delta-synced source as BusinessForecaster
+            df = transaction_cache.get_frame()
             
-            if not result.data:
+            if df is None:
                 print("❌ No data found in database")
                 return None
             
-            df = pd.DataFrame(result.data)
-            df['date'] = pd.to_datetime(df['date'])
-            df['amount'] = pd.to_numeric(df['amount'])
+            # Validation works on the wide date/amount layout
+            df = expand_compact_frame(df)
             
             print(f"✅ Fetched {len(df)} records from database")
             return df
@@ -1,21 +1,23 @@
+import asyncio
 import multiprocessing
 if __name__ == "__main__":
     multiprocessing.set_start_method('spawn', force=True)
 
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
+from fastapi import FastAPI, HTTPException, Query
+from pydantic import BaseModel, Field
 from typing import Optional, Dict, Any, List
 import json
+import functools
 from groq import Groq
 import os
 from datetime import datetime, date, timedelta
-from supabase import create_client, Client
 from enum import Enum
 from typing import List
 import sys
 import os
 from dotenv import load_dotenv
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 #from speech_service_requests import WorkingSpeechToSQLService, speech_to_sql_simple
 from fastapi import File, UploadFile, Form
 
@@ -34,7 +36,15 @@ app.add_middleware(
 
 # Import your existing BusinessForecaster class
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-from business_forecasting import BusinessForecaster
+from business_forecasting import BusinessForecaster, transaction_cache_for, model_cache
+from model_registry import model_registry
+from storage import expense_store
+from transaction_schema import DEFAULT_BUSINESS_ID, BUSINESS_ID_PATTERN
+from executors import run_io, run_business_forecast, warm_fit_pool
+from forecast_cache import forecast_cache
+from forecast_payload import ForecastJSONResponse, forecast_rows, forecast_summary, sse_event
+from forecast_scheduler import ForecastScheduler
+from forecast_jobs import forecast_jobs, JobQueueFull
 
 # Forecasting Models
 class ForecastPeriod(str, Enum):
@@ -48,6 +58,10 @@ class ForecastMetric(str, Enum):
     PROFIT = "profit"
     CASH_FLOW = "cash_flow"
 
+class ForecastEngine(str, Enum):
+    PROPHET = "prophet"
+    FAST = "fast"  # NumPy trend + Fourier ridge regression, milliseconds per fit
+
 class ForecastResponse(BaseModel):
     metric: str
     period_days: int
@@ -55,18 +69,48 @@ class ForecastResponse(BaseModel):
     summary: Dict[str, Any]
     business_insights: List[str]
     generated_at: str
+    age_seconds: Optional[float] = None
+    refreshing: Optional[bool] = None
+
+class ForecastJobRequest(BaseModel):
+    period: ForecastPeriod
+    metric: Optional[ForecastMetric] = None  # None: the comprehensive forecast
+    engine: ForecastEngine = ForecastEngine.PROPHET
+    business_id: str = Field(DEFAULT_BUSINESS_ID, pattern=BUSINESS_ID_PATTERN)
 
 # Initialize forecaster
 forecaster = BusinessForecaster()
 
+def forecaster_for(business_id: str) -> BusinessForecaster:
+    """Forecaster scoped to one business; its transactions, caches and models are kept apart"""
+    if business_id == DEFAULT_BUSINESS_ID:
+        return forecaster
+    return BusinessForecaster(business_id)
+
+BusinessIdQuery = Query(DEFAULT_BUSINESS_ID, pattern=BUSINESS_ID_PATTERN, description="Business whose data to use")
+
+# Precomputes every forecast endpoint in the background so requests are answered from memory
+forecast_scheduler = ForecastScheduler.from_env(forecaster.data_version)
+
+@app.on_event("startup")
+async def start_fit_workers():
+    # Spawned workers take a second or two to import Prophet - pay that before the first request
+    warm_fit_pool()
+    if os.getenv("FORECAST_SCHEDULER_ENABLED", "true").lower() == "true":
+        forecast_scheduler.start()
+
+@app.on_event("shutdown")
+async def stop_forecast_scheduler():
+    forecast_scheduler.stop()
+
 # Initialize clients
 groq_client = Groq(api_key=os.getenv("GROQ_API_KEY"))
-supabase: Client = create_client(os.getenv("SUPABASE_URL"), os.getenv("SUPABASE_ANON_KEY"))
 #working_speech_service = WorkingSpeechToSQLService()
 
 class SqlRequest(BaseModel):
     input_text: str
     execute: Optional[bool] = True
+    business_id: str = Field(DEFAULT_BUSINESS_ID, pattern=BUSINESS_ID_PATTERN)
 
 class SqlResponse(BaseModel):
     input_text: str
@@ -198,7 +242,7 @@ Return ONLY the SQL statement. No explanations."""
         }
 
 # Enhanced SELECT query execution with smart pattern detection
-def execute_select_query(sql: str, input_text: str = "") -> Dict[str, Any]:
+def execute_select_query(sql: str, input_text: str = "", business_id: str = DEFAULT_BUSINESS_ID) -> Dict[str, Any]:
     """Execute SELECT query with smart pattern detection for spending queries"""
     try:
         input_lower = input_text.lower()
@@ -211,48 +255,48 @@ def execute_select_query(sql: str, input_text: str = "") -> Dict[str, Any]:
             # Determine the time period
             if "yesterday" in input_lower:
                 target_date = (date.today() - timedelta(days=1)).isoformat()
-                result = supabase.table("daily_expenses").select("amount").eq("date", target_date).lt("amount", 0).execute()
+                rows = expense_store.select_amounts(date_eq=target_date, sign=-1, business_id=business_id)
                 period = "yesterday"
                 
             elif "today" in input_lower:
                 target_date = date.today().isoformat()
-                result = supabase.table("daily_expenses").select("amount").eq("date", target_date).lt("amount", 0).execute()
+                rows = expense_store.select_amounts(date_eq=target_date, sign=-1, business_id=business_id)
                 period = "today"
                 
             elif "7 days" in input_lower or "week" in input_lower:
                 start_date = (date.today() - timedelta(days=7)).isoformat()
-                result = supabase.table("daily_expenses").select("amount").gte("date", start_date).lt("amount", 0).execute()
+                rows = expense_store.select_amounts(date_gte=start_date, sign=-1, business_id=business_id)
                 period = "last 7 days"
                 
             elif "30 days" in input_lower:
                 start_date = (date.today() - timedelta(days=30)).isoformat()
-                result = supabase.table("daily_expenses").select("amount").gte("date", start_date).lt("amount", 0).execute()
+                rows = expense_store.select_amounts(date_gte=start_date, sign=-1, business_id=business_id)
                 period = "last 30 days"
                 
             elif "20 days" in input_lower:
                 start_date = (date.today() - timedelta(days=20)).isoformat()
-                result = supabase.table("daily_expenses").select("amount").gte("date", start_date).lt("amount", 0).execute()
+                rows = expense_store.select_amounts(date_gte=start_date, sign=-1, business_id=business_id)
                 period = "last 20 days"
                 
             elif "month" in input_lower and "this" in input_lower:
                 start_date = date.today().replace(day=1).isoformat()
-                result = supabase.table("daily_expenses").select("amount").gte("date", start_date).lt("amount", 0).execute()
+                rows = expense_store.select_amounts(date_gte=start_date, sign=-1, business_id=business_id)
                 period = "this month"
                 
             else:
                 # Default to recent expenses if no specific period
-                result = supabase.table("daily_expenses").select("amount").order("date", desc=True).limit(50).lt("amount", 0).execute()
+                rows = expense_store.select_amounts(sign=-1, limit=50, newest_first=True, business_id=business_id)
                 period = "recent"
             
             # Calculate total spent (expenses are negative, so we take absolute value)
-            total_spent = sum(abs(float(row["amount"])) for row in result.data)
+            total_spent = sum(abs(float(row["amount"])) for row in rows)
             print(f"💰 Total spent {period}: ${total_spent}")
             
             return {
                 "data": [{
                     "total_spent": total_spent,
                     "period": period,
-                    "transaction_count": len(result.data)
+                    "transaction_count": len(rows)
                 }],
                 "executed": True,
                 "user_message": f"You spent ${total_spent:.2f} {period}"
@@ -264,23 +308,23 @@ def execute_select_query(sql: str, input_text: str = "") -> Dict[str, Any]:
             
             if "30 days" in input_lower:
                 start_date = (date.today() - timedelta(days=30)).isoformat()
-                result = supabase.table("daily_expenses").select("amount").gte("date", start_date).gt("amount", 0).execute()
+                rows = expense_store.select_amounts(date_gte=start_date, sign=1, business_id=business_id)
                 period = "last 30 days"
             elif "month" in input_lower:
                 start_date = date.today().replace(day=1).isoformat()
-                result = supabase.table("daily_expenses").select("amount").gte("date", start_date).gt("amount", 0).execute()
+                rows = expense_store.select_amounts(date_gte=start_date, sign=1, business_id=business_id)
                 period = "this month"
             else:
-                result = supabase.table("daily_expenses").select("amount").gt("amount", 0).limit(100).execute()
+                rows = expense_store.select_amounts(sign=1, limit=100, business_id=business_id)
                 period = "recent"
             
-            total_income = sum(float(row["amount"]) for row in result.data)
+            total_income = sum(float(row["amount"]) for row in rows)
             
             return {
                 "data": [{
                     "total_income": total_income,
                     "period": period,
-                    "transaction_count": len(result.data)
+                    "transaction_count": len(rows)
                 }],
                 "executed": True,
                 "user_message": f"Your total income {period}: ${total_income:.2f}"
@@ -289,11 +333,11 @@ def execute_select_query(sql: str, input_text: str = "") -> Dict[str, Any]:
         # Default: show recent transactions
         else:
             print("❌ No specific pattern - showing recent transactions")
-            result = supabase.table("daily_expenses").select("*").order("date", desc=True).limit(10).execute()
+            rows = expense_store.recent_transactions(10, business_id=business_id)
             return {
-                "data": result.data,
+                "data": rows,
                 "executed": True,
-                "user_message": f"Showing {len(result.data)} recent transactions"
+                "user_message": f"Showing {len(rows)} recent transactions"
             }
         
     except Exception as e:
@@ -301,7 +345,7 @@ def execute_select_query(sql: str, input_text: str = "") -> Dict[str, Any]:
         return {"error": f"SELECT execution error: {str(e)}", "executed": False}
 
 # Enhanced INSERT execution
-def execute_insert_query(sql: str) -> Dict[str, Any]:
+def execute_insert_query(sql: str, business_id: str = DEFAULT_BUSINESS_ID) -> Dict[str, Any]:
     """Execute INSERT query using Supabase client"""
     try:
         import re
@@ -350,17 +394,21 @@ def execute_insert_query(sql: str) -> Dict[str, Any]:
                 "amount": float(values[1]), 
                 "description": str(values[2]),
                 "category": str(values[3]),
-                "payment_method": str(values[4])
+                "payment_method": str(values[4]),
+                "business_id": business_id
             }
             
-            result = supabase.table("daily_expenses").insert(expense_data).execute()
+            rows = expense_store.insert([expense_data])
+            
+            # Keep the forecasting cache in step with our own writes
+            transaction_cache_for(business_id).append_rows(rows)
             
             # Generate confirmation message
             transaction_type = "income" if float(values[1]) > 0 else "expense"
             amount_display = f"${abs(float(values[1])):.2f}"
             
             return {
-                "data": result.data,
+                "data": rows,
                 "executed": True,
                 "user_message": f"Successfully added {transaction_type} of {amount_display} for '{values[2]}'"
             }
@@ -371,13 +419,14 @@ def execute_insert_query(sql: str) -> Dict[str, Any]:
         return {"error": f"INSERT execution error: {str(e)}", "executed": False}
 
 # Main SQL execution router
-def execute_sql_query(sql: str, sql_type: str, input_text: str = "") -> Dict[str, Any]:
+def execute_sql_query(sql: str, sql_type: str, input_text: str = "",
+                      business_id: str = DEFAULT_BUSINESS_ID) -> Dict[str, Any]:
     """Execute SQL query based on type"""
     try:
         if sql_type == "INSERT":
-            return execute_insert_query(sql)
+            return execute_insert_query(sql, business_id)
         elif sql_type == "SELECT":
-            return execute_select_query(sql, input_text)
+            return execute_select_query(sql, input_text, business_id)
         elif sql_type in ["UPDATE", "DELETE"]:
             return {"message": "UPDATE/DELETE queries require additional confirmation", "executed": False}
         else:
@@ -403,7 +452,7 @@ async def generate_and_execute_sql(request: SqlRequest):
     
     try:
         # Generate SQL
-        sql_result = generate_sql_from_text(request.input_text)
+        sql_result = await run_io(generate_sql_from_text, request.input_text)
         
         # Handle generation errors
         if not sql_result or "error" in sql_result:
@@ -433,7 +482,7 @@ async def generate_and_execute_sql(request: SqlRequest):
         formatted_data = {}
         
         if request.execute and sql_type != "UNKNOWN" and sql_query.strip():
-            execution_result = execute_sql_query(sql_query, sql_type, request.input_text)
+            execution_result = await run_io(execute_sql_query, sql_query, sql_type, request.input_text, request.business_id)
             executed = execution_result.get("executed", False)
             
             if executed:
@@ -495,60 +544,273 @@ async def generate_and_execute_sql(request: SqlRequest):
         )
 
 # Keep all your existing forecasting endpoints
-@app.get("/forecast/comprehensive/{period}")
-async def get_comprehensive_forecast(period: ForecastPeriod):
+# Forecast/metrics bodies are plain functions so they can run on the bounded executors
+def build_comprehensive_forecast(period: ForecastPeriod, engine: ForecastEngine = ForecastEngine.PROPHET,
+                                 business_id: str = DEFAULT_BUSINESS_ID) -> Dict[str, Any]:
     """Get comprehensive business forecast including all metrics"""
+    try:
+        # Refits only when this business's transactions changed since the last identical request
+        return forecast_cache.get_or_compute(
+            ("comprehensive", period.value, engine.value), forecaster_for(business_id).data_version(),
+            lambda: compute_comprehensive_forecast(period, engine, business_id), namespace=business_id
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Comprehensive forecast error: {str(e)}")
+
+def compute_comprehensive_forecast(period: ForecastPeriod, engine: ForecastEngine,
+                                   business_id: str = DEFAULT_BUSINESS_ID) -> Dict[str, Any]:
     try:
         forecast_days = int(period.value)
-        results = forecaster.run_complete_analysis(
+        results = forecaster_for(business_id).run_complete_analysis(
             generate_dummy=False,
-            forecast_days=forecast_days
+            forecast_days=forecast_days,
+            engine=engine.value
         )
-        
-        if not results:
-            raise HTTPException(status_code=500, detail="Unable to generate forecast")
-        
-        return {
-            "period_days": forecast_days,
-            "forecasts": results['summary'],
-            "insights": results['insights'],
-            "generated_at": datetime.now().isoformat(),
-            "status": "success"
-        }
+        return comprehensive_response(results, forecast_days, engine)
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Comprehensive forecast error: {str(e)}")
 
-@app.get("/forecast/{metric}/{period}", response_model=ForecastResponse)
-async def get_forecast(metric: ForecastMetric, period: ForecastPeriod):
+def comprehensive_response(results, forecast_days: int, engine: ForecastEngine) -> Dict[str, Any]:
+    if not results:
+        raise HTTPException(status_code=500, detail="Unable to generate forecast")
+    
+    return {
+        "period_days": forecast_days,
+        "engine": engine.value,
+        "forecasts": results['summary'],
+        "insights": results['insights'],
+        "generated_at": datetime.now().isoformat(),
+        "status": "success"
+    }
+
+def metric_progress(name: str, result, forecast_days: int, business_forecaster: BusinessForecaster) -> Dict[str, Any]:
+    """Payload of a "metric" stream event: one finished forecast with its summary"""
+    if result is None:
+        return {"metric": name, "status": "insufficient_data"}
+    
+    future_data = result['forecast'].tail(forecast_days)
+    return {
+        "metric": name,
+        "status": "success",
+        "forecast_data": forecast_rows(future_data),
+        "summary": business_forecaster.create_forecast_summary({name: result})[name]
+    }
+
+async def stream_comprehensive_forecast(period: ForecastPeriod, engine: ForecastEngine, business_id: str):
+    """Server-sent events for one comprehensive forecast, each sent as soon as its stage is done"""
+    loop = asyncio.get_running_loop()
+    events = asyncio.Queue()
+    forecast_days = int(period.value)
+    business_forecaster = forecaster_for(business_id)
+    
+    # Called on the forecast threads; hands events over to the event loop
+    def progress(event, data):
+        if event == "metric":
+            data = metric_progress(data['metric'], data['result'], forecast_days, business_forecaster)
+        loop.call_soon_threadsafe(events.put_nowait, (event, data))
+    
+    def analyse():
+        results = business_forecaster.run_complete_analysis(
+            generate_dummy=False, forecast_days=forecast_days, engine=engine.value, progress=progress
+        )
+        return comprehensive_response(results, forecast_days, engine)
+    
+    task = asyncio.ensure_future(run_business_forecast(business_id, analyse))
+    task.add_done_callback(lambda _: events.put_nowait(None))
+    
+    yield sse_event("start", {"period_days": forecast_days, "engine": engine.value, "business_id": business_id})
+    while (item := await events.get()) is not None:
+        yield sse_event(*item)
+    
+    try:
+        yield sse_event("done", task.result())
+    except Exception as e:
+        yield sse_event("error", {"detail": str(getattr(e, 'detail', e))})
+
+async def serve_precomputed(key, business_id, build, *args):
+    """Latest precomputed result with its age; computes on demand until the scheduler has one"""
+    latest = forecast_scheduler.latest(key)
+    if latest is None:
+        result = await run_business_forecast(business_id, build, *args)
+        # May come from forecast_cache, so report how long ago it was actually computed
+        generated_at = result.generated_at if isinstance(result, BaseModel) else result["generated_at"]
+        age = (datetime.now() - datetime.fromisoformat(generated_at)).total_seconds()
+        freshness = {"age_seconds": round(max(age, 0.0), 1), "refreshing": False}
+    else:
+        result, meta = latest
+        # Let the scheduler look for new transactions now rather than at its next poll
+        forecast_scheduler.wake()
+        freshness = {"age_seconds": meta['age_seconds'], "refreshing": meta['refreshing']}
+    
+    if isinstance(result, BaseModel):
+        return result.model_copy(update=freshness)
+    return {**result, **freshness}
+
+@app.get("/forecast/comprehensive/{period}")
+async def get_comprehensive_forecast(period: ForecastPeriod, engine: ForecastEngine = ForecastEngine.PROPHET,
+                                     business_id: str = BusinessIdQuery):
+    """Get comprehensive business forecast including all metrics"""
+    return await serve_precomputed(
+        (business_id, "comprehensive", period.value, engine.value), business_id,
+        build_comprehensive_forecast, period, engine, business_id
+    )
+
+@app.get("/forecast/comprehensive/{period}/stream")
+async def stream_comprehensive(period: ForecastPeriod, engine: ForecastEngine = ForecastEngine.PROPHET,
+                               business_id: str = BusinessIdQuery):
+    """The comprehensive forecast as server-sent events: fetch, prepare, one per metric as it finishes,
+    summary, then done with the same body as /forecast/comprehensive/{period} (or error)"""
+    return StreamingResponse(
+        stream_comprehensive_forecast(period, engine, business_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+def build_category_forecast(period: ForecastPeriod, business_id: str = DEFAULT_BUSINESS_ID) -> Dict[str, Any]:
+    """Forecast every expense category in one batched fit"""
+    try:
+        return forecast_cache.get_or_compute(
+            ("categories", period.value), forecaster_for(business_id).data_version(),
+            lambda: compute_category_forecast(period, business_id), namespace=business_id
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Category forecast error: {str(e)}")
+
+def compute_category_forecast(period: ForecastPeriod, business_id: str = DEFAULT_BUSINESS_ID) -> Dict[str, Any]:
+    business_forecaster = forecaster_for(business_id)
+    rollup = business_forecaster.fetch_daily_rollup(refresh=False)
+    if rollup is None:
+        raise HTTPException(status_code=404, detail="No business data found")
+    
+    forecast_days = int(period.value)
+    forecasts = business_forecaster.forecast_categories(rollup, forecast_days)
+    if not forecasts:
+        raise HTTPException(status_code=500, detail="Forecasting failed - insufficient data")
+    
+    categories = {}
+    for category, forecast in forecasts.items():
+        future_data = forecast.tail(forecast_days)
+        categories[category] = {
+            "forecast_data": forecast_rows(future_data),
+            "summary": {
+                **forecast_summary(future_data),
+                "confidence_lower": round(future_data['yhat_lower'].sum(), 2),
+                "confidence_upper": round(future_data['yhat_upper'].sum(), 2)
+            }
+        }
+    
+    return {
+        "period_days": forecast_days,
+        "engine": ForecastEngine.FAST.value,
+        "categories": categories,
+        "generated_at": datetime.now().isoformat(),
+        "status": "success"
+    }
+
+@app.get("/forecast/categories/{period}")
+async def get_category_forecast(period: ForecastPeriod, business_id: str = BusinessIdQuery):
+    """Forecast spending for every category (batched NumPy engine)"""
+    return ForecastJSONResponse(await run_business_forecast(business_id, build_category_forecast, period, business_id))
+
+@app.get("/forecast/cache/stats")
+async def get_forecast_cache_stats():
+    """Hit/miss counters for the forecast result cache and the fitted-model cache"""
+    return {**forecast_cache.stats(), "models": model_cache.stats(), "model_registry": model_registry.stats()}
+
+# Declared before /forecast/{metric}/{period}, which would otherwise claim /forecast/jobs/{job_id}
+@app.post("/forecast/jobs", status_code=202)
+async def submit_forecast_job(request: ForecastJobRequest):
+    """Queue a forecast and return its job id straight away; poll /forecast/jobs/{job_id} for the result"""
+    if request.metric is None:
+        build = functools.partial(build_comprehensive_forecast, request.period, request.engine, request.business_id)
+    else:
+        build_metric = functools.partial(build_metric_forecast, request.metric, request.period, request.engine, request.business_id)
+        build = lambda: dict(build_metric())
+    
+    # The job thread hands the fit back to the event loop, so jobs share the business's
+    # FORECAST_MAX_PER_BUSINESS limit with direct requests instead of running beside it
+    loop = asyncio.get_running_loop()
+    compute = lambda: asyncio.run_coroutine_threadsafe(run_business_forecast(request.business_id, build), loop).result()
+    
+    try:
+        job = forecast_jobs.submit(compute, params=request.model_dump(mode="json"), business_id=request.business_id)
+    except JobQueueFull as e:
+        raise HTTPException(status_code=503, detail=f"Forecast queue is full, try again later: {str(e)}")
+    return {**job, "status_url": f"/forecast/jobs/{job['job_id']}"}
+
+@app.get("/forecast/jobs/stats")
+async def get_forecast_job_stats():
+    """Queued/running counts and totals for the forecast job queue"""
+    return forecast_jobs.stats()
+
+@app.get("/forecast/jobs/{job_id}")
+async def get_forecast_job(job_id: str):
+    """Status of a forecast job; includes the forecast once it has succeeded"""
+    job = forecast_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired forecast job")
+    return ForecastJSONResponse(job)
+
+@app.post("/forecast/jobs/{job_id}/cancel")
+async def cancel_forecast_job(job_id: str):
+    """Cancel a queued job; a running one finishes its fit but its result is discarded"""
+    job = forecast_jobs.cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired forecast job")
+    return job
+
+def build_metric_forecast(metric: ForecastMetric, period: ForecastPeriod,
+                          engine: ForecastEngine = ForecastEngine.PROPHET,
+                          business_id: str = DEFAULT_BUSINESS_ID) -> ForecastResponse:
     """Generate AI forecast for specific business metric"""
     try:
-        df = forecaster.fetch_data_from_supabase()
-        if df is None:
+        return forecast_cache.get_or_compute(
+            ("metric", metric.value, period.value, engine.value), forecaster_for(business_id).data_version(),
+            lambda: compute_metric_forecast(metric, period, engine, business_id), namespace=business_id
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Forecasting error: {str(e)}")
+
+def compute_metric_forecast(metric: ForecastMetric, period: ForecastPeriod, engine: ForecastEngine,
+                            business_id: str = DEFAULT_BUSINESS_ID) -> ForecastResponse:
+    try:
+        business_forecaster = forecaster_for(business_id)
+        # data_version() has just synced the cache
+        rollup = business_forecaster.fetch_daily_rollup(refresh=False)
+        if rollup is None:
             raise HTTPException(status_code=404, detail="No business data found")
         
-        prepared_data = forecaster.prepare_data_for_prophet(df)
+        prepared_data = business_forecaster.prepare_data_for_prophet(rollup)
         forecast_days = int(period.value)
         
+        # Only yhat and trend are returned, so skip Prophet's uncertainty sampling
         if metric == ForecastMetric.REVENUE:
-            forecast_result = forecaster.forecast_with_prophet(
-                prepared_data['daily_revenue'], forecast_days, "Daily Revenue"
+            forecast_result = business_forecaster.forecast_with_prophet(
+                prepared_data['daily_revenue'], forecast_days, "Daily Revenue", engine=engine.value, intervals=False
             )
         elif metric == ForecastMetric.EXPENSES:
-            forecast_result = forecaster.forecast_with_prophet(
-                prepared_data['daily_expenses'], forecast_days, "Daily Expenses"
+            forecast_result = business_forecaster.forecast_with_prophet(
+                prepared_data['daily_expenses'], forecast_days, "Daily Expenses", engine=engine.value, intervals=False
             )
         elif metric == ForecastMetric.CASH_FLOW:
-            forecast_result = forecaster.forecast_with_prophet(
-                prepared_data['daily_cash_flow'], forecast_days, "Net Cash Flow"
+            forecast_result = business_forecaster.forecast_with_prophet(
+                prepared_data['daily_cash_flow'], forecast_days, "Net Cash Flow", engine=engine.value, intervals=False
             )
         else:  # profit
-            revenue_forecast = forecaster.forecast_with_prophet(
-                prepared_data['daily_revenue'], forecast_days, "Revenue"
-            )
-            expense_forecast = forecaster.forecast_with_prophet(
-                prepared_data['daily_expenses'], forecast_days, "Expenses"
-            )
+            # Revenue and expenses are independent fits - run them side by side
+            profit_parts = business_forecaster.forecast_many({
+                'revenue': (prepared_data['daily_revenue'], "Revenue"),
+                'expenses': (prepared_data['daily_expenses'], "Expenses")
+            }, forecast_days, engine=engine.value, intervals=False)
+            revenue_forecast = profit_parts['revenue']
+            expense_forecast = profit_parts['expenses']
             
             if revenue_forecast and expense_forecast:
                 profit_forecast = revenue_forecast['forecast'].copy()
@@ -563,18 +825,10 @@ async def get_forecast(metric: ForecastMetric, period: ForecastPeriod):
         forecast = forecast_result['forecast']
         future_data = forecast.tail(forecast_days)
         
-        forecast_data = []
-        for _, row in future_data.iterrows():
-            forecast_data.append({
-                "date": row['ds'].strftime('%Y-%m-%d'),
-                "predicted_value": round(row['yhat'], 2),
-                "trend": round(row.get('trend', row['yhat']), 2)
-            })
+        forecast_data = forecast_rows(future_data)
         
         summary = {
-            "total_forecast": round(future_data['yhat'].sum(), 2),
-            "daily_average": round(future_data['yhat'].mean(), 2),
-            "trend_direction": "increasing" if future_data['yhat'].iloc[-1] > future_data['yhat'].iloc[0] else "decreasing",
+            **forecast_summary(future_data),
             "min_day": round(future_data['yhat'].min(), 2),
             "max_day": round(future_data['yhat'].max(), 2)
         }
@@ -588,7 +842,8 @@ async def get_forecast(metric: ForecastMetric, period: ForecastPeriod):
         insights.append(f"💰 Expected {period.value}-day {metric.value}: ${summary['total_forecast']:,.2f}")
         insights.append(f"📊 Daily average: ${summary['daily_average']:,.2f}")
         
-        return ForecastResponse(
+        # Built by us from known types - skip validation, the response is encoded as-is
+        return ForecastResponse.model_construct(
             metric=metric.value,
             period_days=forecast_days,
             forecast_data=forecast_data,
@@ -600,22 +855,42 @@ async def get_forecast(metric: ForecastMetric, period: ForecastPeriod):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Forecasting error: {str(e)}")
 
-@app.get("/metrics/current")
-async def get_current_metrics():
+@app.get("/forecast/{metric}/{period}", response_model=ForecastResponse)
+async def get_forecast(metric: ForecastMetric, period: ForecastPeriod, engine: ForecastEngine = ForecastEngine.PROPHET,
+                       business_id: str = BusinessIdQuery):
+    """Generate AI forecast for specific business metric (?engine=fast for the NumPy engine)"""
+    result = await serve_precomputed(
+        (business_id, "metric", metric.value, period.value, engine.value), business_id,
+        build_metric_forecast, metric, period, engine, business_id
+    )
+    return ForecastJSONResponse(dict(result))
+
+# Only Prophet results are precomputed, and only for the businesses listed in
+# FORECAST_SCHEDULER_BUSINESSES; the fast engine and other businesses are answered on demand
+_prophet = ForecastEngine.PROPHET
+for _business in filter(None, (b.strip() for b in os.getenv("FORECAST_SCHEDULER_BUSINESSES", DEFAULT_BUSINESS_ID).split(","))):
+    _version_fn = forecaster_for(_business).data_version
+    for _period in ForecastPeriod:
+        forecast_scheduler.register(
+            (_business, "comprehensive", _period.value, _prophet.value),
+            functools.partial(build_comprehensive_forecast, _period, _prophet, _business), _version_fn
+        )
+        for _metric in ForecastMetric:
+            forecast_scheduler.register(
+                (_business, "metric", _metric.value, _period.value, _prophet.value),
+                functools.partial(build_metric_forecast, _metric, _period, _prophet, _business), _version_fn
+            )
+
+def build_current_metrics(business_id: str = DEFAULT_BUSINESS_ID) -> Dict[str, Any]:
     """Get current business performance metrics"""
     try:
-        df = forecaster.fetch_data_from_supabase()
-        if df is None:
+        rollup = forecaster_for(business_id).fetch_daily_rollup()
+        if rollup is None:
             raise HTTPException(status_code=404, detail="No business data found")
         
-        recent_data = df[df['date'] >= (df['date'].max() - timedelta(days=30))]
-        
-        revenue_total = recent_data[(recent_data['category'] == 'other') & (recent_data['amount'] > 0)]['amount'].sum()
-        expense_conditions = (
-            (recent_data['amount'] < 0) |
-            ((recent_data['category'] != 'other') & (recent_data['amount'] > 0))
-        )
-        expense_total = recent_data[expense_conditions]['amount'].abs().sum()
+        recent = rollup.totals(start_day=rollup.last_day - 30, end_day=rollup.last_day)
+        revenue_total = recent['revenue']
+        expense_total = recent['expenses']
         
         current_metrics = {
             "revenue_30d": round(revenue_total, 2),
@@ -624,12 +899,13 @@ async def get_current_metrics():
             "profit_margin": round((revenue_total - expense_total) / revenue_total * 100, 2) if revenue_total > 0 else 0,
             "daily_avg_revenue": round(revenue_total / 30, 2),
             "daily_avg_expenses": round(expense_total / 30, 2),
-            "transaction_count": len(recent_data),
+            "transaction_count": recent['transaction_count'],
             "last_updated": datetime.now().isoformat()
         }
         
-        expense_data = recent_data[expense_conditions]
-        category_breakdown = expense_data.groupby('category')['amount'].apply(lambda x: x.abs().sum()).round(2).to_dict()
+        category_breakdown = {
+            category: round(amount, 2) for category, amount in recent['category_expenses'].items()
+        }
         
         return {
             "current_metrics": current_metrics,
@@ -640,6 +916,11 @@ async def get_current_metrics():
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Metrics error: {str(e)}")
 
+@app.get("/metrics/current")
+async def get_current_metrics(business_id: str = BusinessIdQuery):
+    """Get current business performance metrics"""
+    return await run_io(build_current_metrics, business_id)
+
 @app.get("/")
 async def root():
     return {
@@ -657,9 +938,14 @@ async def root():
                 "/generate-sql": "Smart SQL generation with spending totals"
             },
             "forecasting": {
-                "/forecast/{metric}/{period}": "AI forecasting",
+                "/forecast/{metric}/{period}": "AI forecasting (?engine=prophet|fast)",
+                "/forecast/categories/{period}": "Per-category forecasts (batched)",
+                "/forecast/cache/stats": "Forecast cache hit/miss counters",
+                "/forecast/comprehensive/{period}/stream": "Comprehensive forecast as server-sent progress events",
+                "POST /forecast/jobs": "Queue a forecast, poll /forecast/jobs/{job_id}, cancel via /forecast/jobs/{job_id}/cancel",
                 "/metrics/current": "Current business metrics"
-            }
+            },
+            "multi_tenant": "Every forecasting endpoint accepts ?business_id= (default: 'default')"
         }
     }
 
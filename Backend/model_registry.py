@@ -0,0 +1,208 @@
+#on-disk store of fitted Prophet models, shared by every worker process and across restarts
+import hashlib
+import json
+import os
+import pickle
+import re
+import threading
+
+import prophet
+from prophet.serialize import model_to_json, model_from_json
+
+from prophet_fit import MODEL_PARAMS, MONTHLY_SEASONALITY
+
+MODEL_REGISTRY_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".models")
+
+# Bump when the file layout changes so old files are ignored instead of misread
+FORMAT_VERSION = 2
+
+
+def params_hash():
+    """Short hash of the hyperparameters and Prophet version a model was fitted with"""
+    spec = json.dumps({
+        'params': MODEL_PARAMS,
+        'monthly': MONTHLY_SEASONALITY,
+        'prophet': prophet.__version__,
+    }, sort_keys=True)
+    return hashlib.sha1(spec.encode()).hexdigest()[:12]
+
+
+class ModelRegistry:
+    """Fitted models plus their full-horizon forecasts, one file per (tenant, series, data, hyperparameters).
+
+    The series is the fitted column (e.g. total_revenue), not the label an endpoint shows, so
+    every endpoint and worker fitting the same data finds the same file.
+
+    Models are stored with Prophet's JSON serializer next to the point forecast and, once someone
+    has asked for it, the uncertainty-sampled forecast, so a hit skips the Stan fit and the sampling.
+    Files are written atomically, so any number of uvicorn workers can share the directory. The
+    oldest files are pruned once there are more than max_models.
+
+    It also remembers the parameters of the latest fit per (tenant, series), so the next fit of
+    that series - after new days arrive, under a new fingerprint - can warm-start the optimizer.
+    """
+
+    def __init__(self, directory=MODEL_REGISTRY_DIR, max_models=200):
+        self.directory = directory
+        self.max_models = max_models
+        self.params = params_hash()
+        self._lock = threading.Lock()
+        self._warm_starts = {}  # (tenant, series) -> params, for when disabled or the file cannot be read
+        self._counters = {'loads': 0, 'misses': 0, 'saves': 0, 'errors': 0, 'prune_errors': 0}
+        # .pkl files as of the last directory walk plus the new ones we wrote since; None until counted
+        self._file_count = None
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            directory=os.getenv("MODEL_REGISTRY_DIR", MODEL_REGISTRY_DIR),
+            max_models=int(os.getenv("MODEL_REGISTRY_MAX_MODELS", "200"))
+        )
+
+    @property
+    def enabled(self):
+        return bool(self.directory)
+
+    def path_for(self, tenant, series, fingerprint):
+        """File for a model; the name is readable, the hash makes it unique"""
+        key = json.dumps([tenant, series, list(fingerprint), self.params])
+        digest = hashlib.sha1(key.encode()).hexdigest()[:16]
+        slug = re.sub(r'[^a-z0-9]+', '_', str(series).lower()).strip('_')
+        return os.path.join(self.directory, str(tenant), f"{slug}-{digest}.pkl")
+
+    def load(self, tenant, series, fingerprint):
+        """{'model', 'model_json', 'forecast', 'sampled_forecast'} for a previously saved fit, or None"""
+
+        if not self.enabled:
+            return None
+        path = self.path_for(tenant, series, fingerprint)
+        try:
+            with open(path, 'rb') as f:
+                entry = pickle.load(f)
+            if entry.get('format') != FORMAT_VERSION:
+                raise ValueError(f"format {entry.get('format')}")
+            fitted = {
+                'model': model_from_json(entry['model_json']),
+                'model_json': entry['model_json'],
+                'forecast': entry['forecast'],
+                'sampled_forecast': entry.get('sampled_forecast')
+            }
+            self._count('loads')
+            return fitted
+        except FileNotFoundError:
+            self._count('misses')
+            return None
+        except Exception as e:
+            print(f"⚠️  Ignoring unreadable model {path}: {str(e)}")
+            self._count('errors')
+            return None
+
+    def save(self, tenant, series, fingerprint, fitted):
+        """Persist a fit; fitted['model_json'] is used when the model already came back serialized"""
+
+        if not self.enabled:
+            return False
+        path = self.path_for(tenant, series, fingerprint)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            new_file = not os.path.exists(path)
+            entry = {
+                'format': FORMAT_VERSION,
+                'model_json': fitted.get('model_json') or model_to_json(fitted['model']),
+                'forecast': fitted['forecast'],
+                'sampled_forecast': fitted.get('sampled_forecast'),
+            }
+            # Unique temp name per writer, then an atomic rename
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+            self._count('saves')
+        except Exception as e:
+            print(f"⚠️  Could not save model {path}: {str(e)}")
+            self._count('errors')
+            return False
+
+        # The model is on disk whatever happens while pruning
+        try:
+            self._prune_if_full(new_file)
+        except Exception as e:
+            print(f"⚠️  Could not prune the model registry: {str(e)}")
+            self._count('prune_errors')
+        return True
+
+    def warm_start_path(self, tenant, series):
+        slug = re.sub(r'[^a-z0-9]+', '_', str(series).lower()).strip('_')
+        return os.path.join(self.directory, str(tenant), f"{slug}-{self.params}.warm.json")
+
+    def load_warm_start(self, tenant, series):
+        """Parameters of the most recent fit of this series by any worker, or None"""
+
+        # Read through to disk: another worker may have fitted the series after our last fit
+        if self.enabled:
+            try:
+                with open(self.warm_start_path(tenant, series)) as f:
+                    return json.load(f)
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                print(f"⚠️  Ignoring unreadable warm start for {series}: {str(e)}")
+        with self._lock:
+            return self._warm_starts.get((tenant, series))
+
+    def save_warm_start(self, tenant, series, params):
+        with self._lock:
+            self._warm_starts[(tenant, series)] = params
+        if not self.enabled:
+            return
+        path = self.warm_start_path(tenant, series)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(params, f)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print(f"⚠️  Could not save warm start for {series}: {str(e)}")
+
+    def stats(self):
+        with self._lock:
+            return {**self._counters, 'directory': self.directory, 'params': self.params}
+
+    def _count(self, name):
+        with self._lock:
+            self._counters[name] += 1
+
+    def _prune_if_full(self, new_file):
+        """Walk the directory only on the first save and once the count passes max_models"""
+        with self._lock:
+            if self._file_count is not None:
+                self._file_count += 1 if new_file else 0
+                if self._file_count <= self.max_models:
+                    return
+        self._prune()
+
+    def _prune(self):
+        files = []
+        for root, _, names in os.walk(self.directory):
+            for name in names:
+                if not name.endswith('.pkl'):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    files.append((os.path.getmtime(path), path))
+                except FileNotFoundError:
+                    pass  # pruned by another worker meanwhile
+        files.sort()
+        removed = 0
+        for _, path in files[:max(len(files) - self.max_models, 0)]:
+            try:
+                os.remove(path)
+                removed += 1
+            except FileNotFoundError:
+                removed += 1
+        with self._lock:
+            self._file_count = len(files) - removed
+
+
+model_registry = ModelRegistry.from_env()
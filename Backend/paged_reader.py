@@ -0,0 +1,185 @@
+#paged reader for daily_expenses - streams PostgREST range pages into compact column buffers
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+
+from transaction_schema import (
+    CATEGORIES, PAYMENT_METHODS, COMPACT_COLUMNS, StringDictionary, amounts_to_cents, dates_to_days
+)
+
+TRANSACTION_COLUMNS = ['id', 'date', 'amount', 'description', 'category', 'payment_method']
+
+# PostgREST caps every response at the server's max-rows (1000 on Supabase by default)
+DEFAULT_PAGE_SIZE = int(os.getenv("SUPABASE_PAGE_SIZE", "1000"))
+DEFAULT_PAGE_WORKERS = int(os.getenv("SUPABASE_PAGE_WORKERS", "4"))
+
+
+class ColumnBuffers:
+    """Preallocated NumPy buffers in the compact transaction schema, filled page by page"""
+
+    def __init__(self, capacity):
+        self.size = 0
+        self.dictionaries = {
+            'description': StringDictionary(),
+            'category': StringDictionary(CATEGORIES),
+            'payment_method': StringDictionary(PAYMENT_METHODS),
+        }
+        self._allocate(max(int(capacity), 0))
+
+    def _allocate(self, capacity):
+        self.capacity = capacity
+        self.columns = {
+            'id': np.zeros(capacity, dtype='int64'),
+            'day': np.zeros(capacity, dtype='int32'),
+            'amount_cents': np.zeros(capacity, dtype='int64'),
+            'description': np.zeros(capacity, dtype='int32'),
+            'category': np.zeros(capacity, dtype='int32'),
+            'payment_method': np.zeros(capacity, dtype='int32'),
+        }
+
+    def reserve(self, capacity):
+        """Grow the buffers (at least doubling) so that `capacity` rows fit"""
+        if capacity <= self.capacity:
+            return
+        old = self.columns
+        self._allocate(max(capacity, self.capacity * 2))
+        for name, values in old.items():
+            self.columns[name][:len(values)] = values
+
+    def write(self, offset, rows):
+        """Encode one page of row dicts into the buffers starting at `offset`"""
+        n = len(rows)
+        if n == 0:
+            return
+        end = offset + n
+        self.reserve(end)
+
+        columns = self.columns
+        columns['id'][offset:end] = np.fromiter((row['id'] for row in rows), dtype='int64', count=n)
+        columns['day'][offset:end] = dates_to_days(np.array([row['date'] for row in rows], dtype='datetime64[D]'))
+        columns['amount_cents'][offset:end] = amounts_to_cents(
+            np.fromiter((float(row['amount']) for row in rows), dtype='float64', count=n)
+        )
+        for name, dictionary in self.dictionaries.items():
+            columns[name][offset:end] = dictionary.encode([row[name] for row in rows])
+        self.size = max(self.size, end)
+
+    def to_frame(self):
+        """Build the compact DataFrame from the filled part of the buffers"""
+        n = self.size
+        data = {}
+        for name in COMPACT_COLUMNS:
+            values = self.columns[name][:n]
+            if name in self.dictionaries:
+                values = self.dictionaries[name].categorical(values)
+            data[name] = values
+        return pd.DataFrame(data, copy=False)
+
+
+def rows_to_frame(rows):
+    """Convert a list of row dicts (e.g. an INSERT response) into a transaction frame"""
+    buffers = ColumnBuffers(len(rows))
+    buffers.write(0, rows)
+    return buffers.to_frame()
+
+
+def _base_query(client, table, after_id, business_id=None):
+    query = client.table(table).select(",".join(TRANSACTION_COLUMNS))
+    if business_id is not None:
+        query = query.eq("business_id", business_id)
+    if after_id is not None:
+        query = query.gt("id", after_id)
+    return query
+
+
+def count_transactions(client, table="daily_expenses", after_id=None, max_id=None, business_id=None):
+    """Exact row count, optionally restricted to one business and to after_id < id <= max_id"""
+    query = client.table(table).select("id", count="exact")
+    if business_id is not None:
+        query = query.eq("business_id", business_id)
+    if after_id is not None:
+        query = query.gt("id", after_id)
+    if max_id is not None:
+        query = query.lte("id", max_id)
+    return query.limit(1).execute().count or 0
+
+
+def _id_bounds(client, table, after_id, business_id=None):
+    """(lowest, highest) id of the matching rows, or None when there are none"""
+    bounds = []
+    for desc in (False, True):
+        page = client.table(table).select("id")
+        if business_id is not None:
+            page = page.eq("business_id", business_id)
+        if after_id is not None:
+            page = page.gt("id", after_id)
+        page = page.order("id", desc=desc).limit(1)
+        data = page.execute().data
+        if not data:
+            return None
+        bounds.append(int(data[0]['id']))
+    return tuple(bounds)
+
+
+def _fetch_id_range(client, table, low, high, page_size, business_id=None):
+    """Fetch rows with low <= id <= high ordered by id, paging by keyset (id > last id seen)"""
+    rows = []
+    last_id = low - 1
+    while last_id < high:
+        page = (
+            _base_query(client, table, last_id, business_id).lte("id", high)
+            .order("id", desc=False).limit(page_size).execute().data
+        )
+        if not page:
+            break
+        rows.extend(page)
+        last_id = int(page[-1]['id'])
+    return rows
+
+
+def read_transactions(client, table="daily_expenses", after_id=None,
+                      page_size=DEFAULT_PAGE_SIZE, max_workers=DEFAULT_PAGE_WORKERS, business_id=None):
+    """Read every row (or every row with id > after_id, of one business if given) as a compact,
+    id-ordered DataFrame.
+
+    The id span up to the current highest id is split into disjoint ranges of about one page
+    each, the ranges are requested concurrently and each is written into the preallocated
+    buffers as soon as it arrives. Pages are bounded by id rather than by offset, so rows
+    committed or deleted while we read cannot shift a row into two pages or out of all of
+    them. At most `max_workers` ranges of JSON dicts are alive at any time. Rows inserted
+    above the highest id are left for the next delta read.
+    """
+
+    bounds = _id_bounds(client, table, after_id, business_id)
+    if bounds is None:
+        return ColumnBuffers(0).to_frame()
+    low, high = bounds
+    total = count_transactions(client, table, after_id=after_id, max_id=high, business_id=business_id)
+    buffers = ColumnBuffers(total)
+
+    # Ranges sized for about page_size rows each at the table's average id density
+    width = max(int((high - low + 1) * page_size / max(total, 1)), 1)
+    ranges = [(start, min(start + width - 1, high)) for start in range(low, high + 1, width)]
+    write_lock = threading.Lock()
+
+    def fetch_range(id_range):
+        rows = _fetch_id_range(client, table, id_range[0], id_range[1], page_size, business_id)
+        with write_lock:
+            buffers.write(buffers.size, rows)
+
+    if max_workers > 1 and len(ranges) > 1:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            list(executor.map(fetch_range, ranges))
+    else:
+        for id_range in ranges:
+            fetch_range(id_range)
+
+    # Ranges finish in any order; put the rows back in id order
+    ids = buffers.columns['id'][:buffers.size]
+    if len(ids) > 1 and (np.diff(ids) < 0).any():
+        order = np.argsort(ids, kind='stable')
+        for name, values in buffers.columns.items():
+            values[:buffers.size] = values[:buffers.size][order]
+    return buffers.to_frame()
@@ -0,0 +1,124 @@
+#Prophet fit + predict, importable by worker processes without pulling in the API or the database
+import numpy as np
+from prophet import Prophet
+from prophet.serialize import model_to_json, model_from_json
+
+from fast_forecast import INTERVAL_Z
+
+# Hyperparameters shared by every business metric; the model registry keys saved models on these
+MODEL_PARAMS = {
+    'daily_seasonality': True,
+    'weekly_seasonality': True,
+    'yearly_seasonality': False,  # Changed from monthly_seasonality
+    'seasonality_mode': 'multiplicative',
+    'changepoint_prior_scale': 0.1,
+}
+MONTHLY_SEASONALITY = {'name': 'monthly', 'period': 30.5, 'fourier_order': 5}
+
+
+def build_model():
+    """The model configuration shared by every business metric"""
+
+    # Create and fit Prophet model with compatible parameters
+    model = Prophet(**MODEL_PARAMS)
+
+    # Add monthly seasonality manually
+    model.add_seasonality(**MONTHLY_SEASONALITY)
+    return model
+
+
+def fit_and_predict(prophet_df, horizon, intervals=True, init=None):
+    """Fit on a ds/y frame and predict `horizon` days past its end.
+    intervals=False skips uncertainty sampling (see predict_point); init warm-starts the
+    optimizer from warm_start_params of an earlier fit of the same metric."""
+
+    model = build_model()
+    if init is not None:
+        model.fit(prophet_df, init=rescale_init(init, prophet_df))
+    else:
+        model.fit(prophet_df)
+
+    # Create future dataframe and make predictions
+    future = model.make_future_dataframe(periods=horizon)
+    forecast = model.predict(future) if intervals else predict_point(model, future)
+    return model, forecast
+
+
+def predict_point(model, future):
+    """Point forecast without Prophet's uncertainty simulation, about 10x cheaper than predict.
+
+    yhat and the components are identical to predict(). yhat_lower/yhat_upper are an analytic
+    80% band from the in-sample residuals, widening with distance past the history (the same
+    approximation the fast engine uses), so callers that only read yhat pay nothing for them.
+    """
+
+    samples = model.uncertainty_samples
+    model.uncertainty_samples = 0
+    try:
+        forecast = model.predict(future)
+    finally:
+        model.uncertainty_samples = samples
+
+    history = model.history
+    in_sample = forecast.set_index('ds')['yhat'].reindex(history['ds']).to_numpy()
+    residuals = history['y'].to_numpy() - in_sample
+    sigma = np.sqrt(np.nansum(residuals ** 2) / max(len(history) - 1, 1))
+
+    steps_ahead = np.maximum((forecast['ds'] - history['ds'].max()).dt.days.to_numpy(), 0)
+    width = INTERVAL_Z * sigma * np.sqrt(1 + steps_ahead / len(history))
+    forecast['yhat_lower'] = forecast['yhat'] - width
+    forecast['yhat_upper'] = forecast['yhat'] + width
+    return forecast
+
+
+def warm_start_params(model):
+    """MAP parameters of a fitted model, plus the scales they were fitted at, as plain JSON types"""
+
+    return {
+        'k': float(model.params['k'][0][0]),
+        'm': float(model.params['m'][0][0]),
+        'sigma_obs': float(model.params['sigma_obs'][0][0]),
+        'delta': model.params['delta'][0].tolist(),
+        'beta': model.params['beta'][0].tolist(),
+        'y_scale': float(model.y_scale),
+        't_scale_days': model.t_scale / np.timedelta64(1, 'D'),
+    }
+
+
+def rescale_init(params, prophet_df):
+    """Stan inits for prophet_df from an earlier fit's parameters.
+
+    Prophet fits y / max|y| against t scaled to [0, 1], so when appended days move either scale
+    the trend parameters are converted to the new units. Seasonality (multiplicative) is unitless.
+    """
+
+    y_ratio = params['y_scale'] / max(float(prophet_df['y'].abs().max()), 1e-9)
+    span_days = (prophet_df['ds'].max() - prophet_df['ds'].min()) / np.timedelta64(1, 'D')
+    t_ratio = max(span_days, 1.0) / max(params['t_scale_days'], 1.0)
+    return {
+        'k': params['k'] * y_ratio * t_ratio,
+        'm': params['m'] * y_ratio,
+        'sigma_obs': params['sigma_obs'] * y_ratio,
+        # Prophet only uses vector inits whose shape matches the new model, defaults otherwise
+        'delta': np.asarray(params['delta']) * y_ratio * t_ratio,
+        'beta': np.asarray(params['beta']),
+    }
+
+
+def fit_in_worker(prophet_df, horizon, intervals=True, init=None):
+    """Process-pool entry point: fitted models are shipped back as JSON"""
+
+    model, forecast = fit_and_predict(prophet_df, horizon, intervals, init)
+    return model_to_json(model), forecast
+
+
+def sample_in_worker(model_json, horizon):
+    """Process-pool entry point: full uncertainty-sampled predict for an already fitted model"""
+
+    model = model_from_json(model_json)
+    return model.predict(model.make_future_dataframe(periods=horizon))
+
+
+def warm_up():
+    """No-op task: importing this module in a worker loads Prophet before the first real fit"""
+    return True
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Generate synthetic transactions in fixed-size chunks and stream them into the configured
+store (STORAGE_BACKEND) or a Parquet file, with bounded memory for any number of days.
+
+Usage: python seed_data.py DAYS [--chunk-rows 100000] [--seed 42] [--out data.parquet]
+"""
+
+import argparse
+import time
+
+from synthetic_data import iter_transactions, prefetch, write_parquet
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("days", type=int)
+    parser.add_argument("--chunk-rows", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--out", default=None, help="write a Parquet file instead of inserting")
+    args = parser.parse_args()
+
+    if args.out:
+        chunks = prefetch(iter_transactions(args.days, chunk_rows=args.chunk_rows, seed=args.seed))
+        start = time.perf_counter()
+        rows = write_parquet(args.out, chunks)
+        elapsed = time.perf_counter() - start
+        print(f"💾 Wrote {rows} rows to {args.out} in {elapsed:.2f}s ({rows / elapsed:,.0f} rows/sec)")
+    else:
+        from business_forecasting import BusinessForecaster
+        forecaster = BusinessForecaster()
+        chunks = forecaster.stream_dummy_data(args.days, chunk_rows=args.chunk_rows, seed=args.seed)
+        forecaster.insert_dummy_data_to_supabase(chunks)
+
+
+if __name__ == "__main__":
+    main()
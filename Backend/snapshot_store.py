@@ -0,0 +1,79 @@
+#on-disk Arrow IPC snapshot of the transaction history
+import os
+import threading
+import time
+from transaction_schema import DEFAULT_BUSINESS_ID
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+except ImportError:
+    pa = None
+
+SNAPSHOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".snapshots")
+DEFAULT_SNAPSHOT_PATH = os.path.join(SNAPSHOT_DIR, "daily_expenses.arrow")
+
+
+def snapshot_path_for(backend, business_id=DEFAULT_BUSINESS_ID):
+    """Separate snapshot per storage backend and business so histories are never mixed"""
+    if business_id == DEFAULT_BUSINESS_ID:
+        return os.path.join(SNAPSHOT_DIR, f"daily_expenses.{backend}.arrow")
+    return os.path.join(SNAPSHOT_DIR, f"daily_expenses.{backend}.{business_id}.arrow")
+
+
+class SnapshotStore:
+    """Saves compact transaction frames as an uncompressed Arrow IPC file and memory-maps them back"""
+
+    def __init__(self, path=DEFAULT_SNAPSHOT_PATH, min_save_interval=60.0):
+        self.path = path
+        self.min_save_interval = min_save_interval
+        self._last_save = 0.0
+
+        if pa is None:
+            print("⚠️  pyarrow not installed - transaction snapshots are disabled")
+
+    @property
+    def enabled(self):
+        return pa is not None and bool(self.path)
+
+    def load(self):
+        """Return the snapshot frame, or None when there is no usable snapshot"""
+
+        if not self.enabled or not os.path.exists(self.path):
+            return None
+
+        try:
+            start = time.perf_counter()
+            with pa.memory_map(self.path, 'r') as source:
+                table = ipc.open_file(source).read_all()
+            # split_blocks keeps the numeric columns as zero-copy views of the mapped file
+            df = table.to_pandas(split_blocks=True)
+            print(f"💾 Loaded {len(df)} records from snapshot in {(time.perf_counter() - start) * 1000:.0f}ms")
+            return df
+        except Exception as e:
+            print(f"⚠️  Ignoring unreadable snapshot {self.path}: {str(e)}")
+            return None
+
+    def save(self, df, force=False):
+        """Write the frame atomically; skipped if the last write was less than min_save_interval ago"""
+
+        if not self.enabled or df is None:
+            return False
+        if not force and time.monotonic() - self._last_save < self.min_save_interval:
+            return False
+
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            # Unique per writer so two workers saving at once never share a temp file
+            tmp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with pa.OSFile(tmp_path, 'wb') as sink:
+                with ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+            os.replace(tmp_path, self.path)
+            self._last_save = time.monotonic()
+            return True
+        except Exception as e:
+            print(f"⚠️  Could not write snapshot {self.path}: {str(e)}")
+            return False
+
@@ -0,0 +1,325 @@
+#pluggable storage for daily_expenses - Supabase or an embedded SQLite file
+import os
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from postgrest.exceptions import APIError
+from postgrest.types import ReturnMethod
+from paged_reader import ColumnBuffers, TRANSACTION_COLUMNS, DEFAULT_PAGE_SIZE, read_transactions, count_transactions
+from transaction_schema import DEFAULT_BUSINESS_ID
+
+DEFAULT_SQLITE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".data", "finlo.db")
+
+
+class ExpenseStore(ABC):
+    """Everything the API and the forecasters need from the daily_expenses table.
+
+    Rows carry a business_id; reads are scoped to one business (DEFAULT_BUSINESS_ID unless given).
+    Ids are global, so high-water marks and retry checks work the same for every business.
+    """
+
+    table = "daily_expenses"
+    backend = None
+
+    @abstractmethod
+    def read_transactions(self, after_id=None, business_id=DEFAULT_BUSINESS_ID):
+        """Compact, id-ordered frame of the business's rows (or those with id > after_id)"""
+
+    @abstractmethod
+    def count_transactions(self, after_id=None, max_id=None, business_id=DEFAULT_BUSINESS_ID):
+        """Exact number of the business's rows with after_id < id <= max_id"""
+
+    @abstractmethod
+    def insert(self, rows, returning=True):
+        """Insert row dicts in one statement; returns the stored rows with ids ([] when returning=False).
+        Rows without a business_id belong to DEFAULT_BUSINESS_ID."""
+
+    @abstractmethod
+    def max_id(self):
+        """Highest id in the table (0 when empty)"""
+
+    @abstractmethod
+    def rows_exist(self, rows, after_id=0):
+        """True if the first and last of `rows` are already stored with id > after_id
+        under their business.
+
+        Each insert is a single statement, so this tells whether a batch whose insert
+        failed ambiguously (e.g. timed out) was committed anyway.
+        """
+
+    @abstractmethod
+    def select_amounts(self, date_eq=None, date_gte=None, sign=None, limit=None, newest_first=False,
+                       business_id=DEFAULT_BUSINESS_ID):
+        """[{'amount': ...}] for rows matching the filters; sign -1 = amount < 0, 1 = amount > 0"""
+
+    @abstractmethod
+    def recent_transactions(self, limit=10, business_id=DEFAULT_BUSINESS_ID):
+        """Most recent rows (by date) as dicts"""
+
+
+class SupabaseExpenseStore(ExpenseStore):
+    """daily_expenses in Supabase, reached through the shared pooled data-access client.
+
+    A table that predates the business_id column keeps working for the default business
+    (unfiltered, as before); any other business fails with the migration to run.
+    """
+
+    backend = "supabase"
+
+    # Postgres undefined_column, and PostgREST's "column not in the schema cache"
+    MISSING_COLUMN_CODES = {'42703', 'PGRST204'}
+
+    def __init__(self, data_access):
+        self.data_access = data_access
+        self._has_business_column = None  # checked on first use
+
+    def _scope(self, business_id):
+        """The business_id to filter on, or None on an unmigrated table (default business only)"""
+        if self._has_business_column is None:
+            self._has_business_column = self._check_business_column()
+        if self._has_business_column:
+            return business_id
+        if business_id != DEFAULT_BUSINESS_ID:
+            raise RuntimeError(
+                "daily_expenses has no business_id column; run the migration in the README "
+                "before using businesses other than 'default'"
+            )
+        return None
+
+    def _check_business_column(self):
+        try:
+            self.data_access.table(self.table).select("business_id").limit(1).execute()
+            return True
+        except APIError as e:
+            if str(e.code) not in self.MISSING_COLUMN_CODES:
+                raise
+            print("⚠️  daily_expenses has no business_id column - serving the default business only "
+                  "(see the README for the migration)")
+            return False
+
+    def _filter(self, query, business_id):
+        scope = self._scope(business_id)
+        return query if scope is None else query.eq("business_id", scope)
+
+    def read_transactions(self, after_id=None, business_id=DEFAULT_BUSINESS_ID):
+        # A delta is a few pages; the full history can take much longer on a big table
+        client = self.data_access
+        if after_id is None:
+            client = client.with_timeout(self.data_access.slow_timeout)
+        return read_transactions(client, self.table, after_id=after_id, business_id=self._scope(business_id))
+
+    def count_transactions(self, after_id=None, max_id=None, business_id=DEFAULT_BUSINESS_ID):
+        # Exact counts scan every matching row
+        return count_transactions(self.data_access.with_timeout(self.data_access.slow_timeout), self.table,
+                                  after_id=after_id, max_id=max_id, business_id=self._scope(business_id))
+
+    def insert(self, rows, returning=True):
+        method = ReturnMethod.representation if returning else ReturnMethod.minimal
+        if rows and 'business_id' in rows[0] and self._scope(rows[0]['business_id']) is None:
+            # Unmigrated table: default-business rows are stored without the column
+            rows = [{key: value for key, value in row.items() if key != 'business_id'} for row in rows]
+        # Bulk loader batches get the long timeout, single API inserts keep the default
+        timeout = self.data_access.slow_timeout if len(rows) > 1 else None
+        return self.data_access.table(self.table, timeout=timeout).insert(rows, returning=method).execute().data
+
+    def max_id(self):
+        rows = self.data_access.table(self.table).select("id").order("id", desc=True).limit(1).execute().data
+        return rows[0]['id'] if rows else 0
+
+    def rows_exist(self, rows, after_id=0):
+        for row in (rows[0], rows[-1]):
+            query = self._filter(
+                self.data_access.table(self.table).select("id"), row.get('business_id', DEFAULT_BUSINESS_ID)
+            )
+            found = (
+                query.gt("id", after_id)
+                .eq("date", row['date'])
+                .eq("amount", row['amount'])
+                .eq("description", row['description'])
+                .limit(1).execute().data
+            )
+            if not found:
+                return False
+        return True
+
+    def select_amounts(self, date_eq=None, date_gte=None, sign=None, limit=None, newest_first=False,
+                       business_id=DEFAULT_BUSINESS_ID):
+        query = self._filter(self.data_access.table(self.table).select("amount"), business_id)
+        if date_eq is not None:
+            query = query.eq("date", date_eq)
+        if date_gte is not None:
+            query = query.gte("date", date_gte)
+        if newest_first:
+            query = query.order("date", desc=True)
+        if limit is not None:
+            query = query.limit(limit)
+        if sign is not None:
+            query = query.lt("amount", 0) if sign < 0 else query.gt("amount", 0)
+        return query.execute().data
+
+    def recent_transactions(self, limit=10, business_id=DEFAULT_BUSINESS_ID):
+        return (
+            self._filter(self.data_access.table(self.table).select("*"), business_id)
+            .order("date", desc=True).limit(limit).execute().data
+        )
+
+
+class SQLiteExpenseStore(ExpenseStore):
+    """daily_expenses in a local SQLite file - no network, same columns as the Supabase table"""
+
+    backend = "sqlite"
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS daily_expenses (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            date TEXT NOT NULL,
+            amount NUMERIC NOT NULL,
+            description TEXT NOT NULL,
+            category TEXT NOT NULL,
+            payment_method TEXT NOT NULL,
+            created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            business_id TEXT NOT NULL DEFAULT 'default'
+        );
+        CREATE INDEX IF NOT EXISTS idx_daily_expenses_date ON daily_expenses (date);
+    """
+    # Per-business delta reads are "business_id = ? AND id > ?"
+    INDEXES = """
+        CREATE INDEX IF NOT EXISTS idx_daily_expenses_business_id ON daily_expenses (business_id, id);
+    """
+
+    def __init__(self, path=DEFAULT_SQLITE_PATH, page_size=DEFAULT_PAGE_SIZE):
+        self.path = path
+        self.page_size = page_size
+        self._local = threading.local()
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        connection = self._connection()
+        connection.executescript(self.SCHEMA)
+        columns = {row['name'] for row in connection.execute("PRAGMA table_info(daily_expenses)")}
+        if 'business_id' not in columns:
+            # Files created before tenants existed: every row so far belongs to the default business
+            connection.execute(
+                f"ALTER TABLE daily_expenses ADD COLUMN business_id TEXT NOT NULL DEFAULT '{DEFAULT_BUSINESS_ID}'"
+            )
+        connection.executescript(self.INDEXES)
+
+    def _connection(self):
+        # sqlite3 connections are per thread; WAL lets readers run alongside a writer
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30)
+            connection.row_factory = sqlite3.Row
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    @staticmethod
+    def _id_filter(after_id=None, max_id=None, business_id=DEFAULT_BUSINESS_ID):
+        clauses, params = ["business_id = ?"], [business_id]
+        if after_id is not None:
+            clauses.append("id > ?")
+            params.append(after_id)
+        if max_id is not None:
+            clauses.append("id <= ?")
+            params.append(max_id)
+        return " WHERE " + " AND ".join(clauses), params
+
+    def read_transactions(self, after_id=None, business_id=DEFAULT_BUSINESS_ID):
+        where, params = self._id_filter(after_id, business_id=business_id)
+        connection = self._connection()
+        total = connection.execute(f"SELECT COUNT(*) FROM daily_expenses{where}", params).fetchone()[0]
+        buffers = ColumnBuffers(total)
+
+        cursor = connection.execute(
+            f"SELECT {', '.join(TRANSACTION_COLUMNS)} FROM daily_expenses{where} ORDER BY id", params
+        )
+        offset = 0
+        while True:
+            rows = cursor.fetchmany(self.page_size)
+            if not rows:
+                break
+            buffers.write(offset, rows)
+            offset += len(rows)
+        return buffers.to_frame()
+
+    def count_transactions(self, after_id=None, max_id=None, business_id=DEFAULT_BUSINESS_ID):
+        where, params = self._id_filter(after_id, max_id, business_id)
+        return self._connection().execute(f"SELECT COUNT(*) FROM daily_expenses{where}", params).fetchone()[0]
+
+    def insert(self, rows, returning=True):
+        if isinstance(rows, dict):
+            rows = [rows]
+        columns = ['date', 'amount', 'description', 'category', 'payment_method']
+        connection = self._connection()
+        with connection:
+            # BEGIN IMMEDIATE takes the write lock, so the ids above `before` are exactly ours
+            connection.execute("BEGIN IMMEDIATE")
+            before = connection.execute("SELECT COALESCE(MAX(id), 0) FROM daily_expenses").fetchone()[0]
+            connection.executemany(
+                "INSERT INTO daily_expenses (date, amount, description, category, payment_method, business_id) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [tuple(row[column] for column in columns) + (row.get('business_id', DEFAULT_BUSINESS_ID),)
+                 for row in rows]
+            )
+            if not returning:
+                return []
+            inserted = connection.execute("SELECT * FROM daily_expenses WHERE id > ? ORDER BY id", (before,)).fetchall()
+        return [dict(row) for row in inserted]
+
+    def max_id(self):
+        return self._connection().execute("SELECT COALESCE(MAX(id), 0) FROM daily_expenses").fetchone()[0]
+
+    def rows_exist(self, rows, after_id=0):
+        connection = self._connection()
+        for row in (rows[0], rows[-1]):
+            found = connection.execute(
+                "SELECT 1 FROM daily_expenses WHERE id > ? AND business_id = ? AND date = ? AND amount = ? "
+                "AND description = ? LIMIT 1",
+                (after_id, row.get('business_id', DEFAULT_BUSINESS_ID), row['date'], row['amount'], row['description'])
+            ).fetchone()
+            if found is None:
+                return False
+        return True
+
+    def select_amounts(self, date_eq=None, date_gte=None, sign=None, limit=None, newest_first=False,
+                       business_id=DEFAULT_BUSINESS_ID):
+        clauses, params = ["business_id = ?"], [business_id]
+        if date_eq is not None:
+            clauses.append("date = ?")
+            params.append(date_eq)
+        if date_gte is not None:
+            clauses.append("date >= ?")
+            params.append(date_gte)
+        if sign is not None:
+            clauses.append("amount < 0" if sign < 0 else "amount > 0")
+        sql = "SELECT amount FROM daily_expenses WHERE " + " AND ".join(clauses)
+        if newest_first:
+            sql += " ORDER BY date DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [dict(row) for row in self._connection().execute(sql, params)]
+
+    def recent_transactions(self, limit=10, business_id=DEFAULT_BUSINESS_ID):
+        rows = self._connection().execute(
+            "SELECT * FROM daily_expenses WHERE business_id = ? ORDER BY date DESC LIMIT ?", (business_id, limit)
+        )
+        return [dict(row) for row in rows]
+
+
+def create_expense_store():
+    """Build the store selected by STORAGE_BACKEND (supabase, the default, or sqlite)"""
+
+    backend = os.getenv("STORAGE_BACKEND", "supabase").lower()
+    if backend == "sqlite":
+        path = os.getenv("SQLITE_PATH", DEFAULT_SQLITE_PATH)
+        print(f"🗄️  Using local SQLite storage at {path}")
+        return SQLiteExpenseStore(path)
+    if backend == "supabase":
+        from data_access import data_access
+        return SupabaseExpenseStore(data_access)
+    raise ValueError(f"Unknown STORAGE_BACKEND '{backend}' (expected 'supabase' or 'sqlite')")
+
+
+expense_store = create_expense_store()
@@ -0,0 +1,313 @@
+#vectorized synthetic coffee-shop transactions
+import queue
+import threading
+import numpy as np
+import pandas as pd
+from datetime import date, timedelta
+from transaction_schema import CATEGORIES, PAYMENT_METHODS, dates_to_days, amounts_to_cents, concat_frames
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+# Roughly 5 transactions per calendar day
+ROWS_PER_DAY_ESTIMATE = 5
+# Days generated per block, each from its own child of the seed, so the rows do not depend on
+# how they are later cut into chunks; bounds the memory of iter_transactions (~5k rows a block)
+BLOCK_DAYS = 1000
+
+# Revenue drivers (index = month - 1 / weekday, Monday = 0; the shop is closed on Sundays)
+SEASONAL_MULTIPLIER = np.array([1.2, 1.15, 1.0, 0.95, 0.9, 0.8, 0.85, 0.9, 1.0, 1.1, 1.15, 1.25])
+BASE_REVENUE = np.array([750, 780, 800, 820, 850, 600, 0])
+HOLIDAYS = [(1, 1), (7, 4), (11, 24), (12, 25), (12, 31)]  # New Year, July 4th, Thanksgiving, Christmas, NYE
+INGREDIENT_PROBABILITY = np.array([0.8, 0.7, 0.8, 0.9, 0.9, 0.6, 0.0])
+
+REVENUE_ITEMS = ['morning sales', 'afternoon sales', 'evening sales', 'card payments', 'cash sales']
+INGREDIENT_ITEMS = [
+    'flour', 'coffee beans', 'whole milk', 'oat milk', 'sugar', 'pastries',
+    'bread', 'butter', 'cream', 'chocolate', 'tea bags', 'syrup'
+]
+SUPPLY_ITEMS = [
+    'coffee cups', 'lids', 'napkins', 'straws', 'cleaning supplies',
+    'takeout containers', 'paper towels', 'toilet paper', 'hand soap'
+]
+EQUIPMENT_ITEMS = [
+    'espresso machine maintenance', 'coffee grinder repair', 'new blender',
+    'POS system update', 'furniture repair', 'kitchen equipment', 'refrigerator maintenance',
+    'dishwasher repair', 'new cash register', 'sound system repair'
+]
+# (description, mean, std, daily probability) - utilities only on billing days
+UTILITY_BILLS = [
+    ('electricity bill', 320, 60, 0.15),
+    ('water bill', 95, 25, 0.12),
+    ('internet/phone bill', 75, 15, 0.08),
+    ('gas bill', 140, 35, 0.10),
+    ('waste management', 45, 10, 0.05),
+    ('security system', 85, 20, 0.04),
+]
+# (description, amount, daily probability) - monthly/weekly/quarterly/yearly odds spread over the days
+OTHER_EXPENSES = [
+    ('business insurance', 180, 0.8 / 30),
+    ('software subscription', 45, 0.6 / 30),
+    ('marketing/advertising', 120, 0.3 / 7),
+    ('accounting fees', 200, 0.4 / 30),
+    ('legal fees', 300, 0.2 / 90),
+    ('business license renewal', 150, 0.1 / 365),
+    ('staff training', 85, 0.2 / 30),
+    ('office supplies', 60, 0.4 / 30),
+    ('delivery fees', 25, 0.4 / 7),
+    ('bank fees', 35, 0.9 / 30),
+]
+
+DESCRIPTIONS = (
+    REVENUE_ITEMS + INGREDIENT_ITEMS + SUPPLY_ITEMS + EQUIPMENT_ITEMS
+    + [bill[0] for bill in UTILITY_BILLS] + [expense[0] for expense in OTHER_EXPENSES]
+    + ['staff wages', 'monthly rent']
+)
+_DESCRIPTION_CODE = {description: code for code, description in enumerate(DESCRIPTIONS)}
+_CATEGORY_CODE = {category: code for code, category in enumerate(CATEGORIES)}
+_PAYMENT_CODE = {method: code for code, method in enumerate(PAYMENT_METHODS)}
+
+
+class _Events:
+    """Column-wise accumulator: one block of arrays per event type"""
+
+    def __init__(self):
+        self.blocks = []
+
+    def add(self, day_index, amount, description, category, payment_method):
+        n = len(day_index)
+        if n == 0:
+            return
+        self.blocks.append((
+            day_index,
+            amount,
+            _codes(description, _DESCRIPTION_CODE, n),
+            np.full(n, _CATEGORY_CODE[category], dtype='int8'),
+            _codes(payment_method, _PAYMENT_CODE, n),
+        ))
+
+    def concat(self):
+        if not self.blocks:
+            return [np.empty(0, dtype=dtype) for dtype in ('int64', 'float64', 'int16', 'int8', 'int8')]
+        return [np.concatenate(column) for column in zip(*self.blocks)]
+
+
+def _codes(values, lookup, n):
+    if isinstance(values, str):
+        return np.full(n, lookup[values], dtype='int16')
+    return values
+
+
+def _choice(rng, items, lookup, n):
+    codes = np.array([lookup[item] for item in items], dtype='int16')
+    return codes[rng.integers(0, len(items), n)]
+
+
+def generate_days(day_numbers, rng):
+    """Compact frame of transactions for the given int day numbers, drawn column-wise from `rng`"""
+
+    day_numbers = np.asarray(day_numbers, dtype='int64')
+    dates = day_numbers.astype('datetime64[D]')
+    weekday = (day_numbers + 3) % 7  # 1970-01-01 was a Thursday
+    open_days = weekday != 6
+    day_numbers, dates, weekday = day_numbers[open_days], dates[open_days], weekday[open_days]
+    n_days = len(day_numbers)
+
+    months = dates.astype('datetime64[M]')
+    month = months.astype('int64') % 12 + 1
+    day_of_month = (dates - months).astype('int64') + 1
+    seasonal = SEASONAL_MULTIPLIER[month - 1]
+    days_index = np.arange(n_days)
+    events = _Events()
+
+    # Revenue: day total from weekday, season, holidays and weather, split into 1-4 entries
+    is_holiday = np.zeros(n_days, dtype=bool)
+    for holiday_month, holiday_day in HOLIDAYS:
+        is_holiday |= (month == holiday_month) & (day_of_month == holiday_day)
+    weather = np.clip(rng.normal(1.0, 0.1, n_days), 0.7, 1.3)
+    adjusted = BASE_REVENUE[weekday] * seasonal * np.where(is_holiday, 0.3, 1.0) * weather
+    daily_revenue = np.maximum(150, rng.normal(adjusted, adjusted * 0.15))
+    splits = rng.integers(1, 5, n_days)
+    revenue_days = np.repeat(days_index, splits)
+    split_amount = (daily_revenue / splits)[revenue_days]
+    n = len(revenue_days)
+    events.add(
+        revenue_days,
+        np.maximum(10, rng.normal(split_amount, split_amount * 0.1)),
+        _choice(rng, REVENUE_ITEMS, _DESCRIPTION_CODE, n),
+        'other',
+        _choice(rng, ['card', 'cash'], _PAYMENT_CODE, n),
+    )
+
+    # Ingredients: restocking odds by weekday, 1-3 purchases, seasonal prices
+    restock = rng.random(n_days) < INGREDIENT_PROBABILITY[weekday]
+    purchases = np.where(restock, rng.integers(1, 4, n_days), 0)
+    ingredient_days = np.repeat(days_index, purchases)
+    n = len(ingredient_days)
+    events.add(
+        ingredient_days,
+        np.abs(rng.normal(85, 25, n) * seasonal[ingredient_days]),
+        _choice(rng, INGREDIENT_ITEMS, _DESCRIPTION_CODE, n),
+        'ingredients',
+        _choice(rng, ['card', 'cash'], _PAYMENT_CODE, n),
+    )
+
+    # Supplies: every other day on average
+    supply_days = np.flatnonzero(rng.random(n_days) > 0.5)
+    n = len(supply_days)
+    events.add(
+        supply_days,
+        np.abs(rng.normal(35, 12, n)),
+        _choice(rng, SUPPLY_ITEMS, _DESCRIPTION_CODE, n),
+        'supplies',
+        _choice(rng, ['card', 'cash'], _PAYMENT_CODE, n),
+    )
+
+    # Utilities: around the 1st and 15th, plus the odd off-cycle bill
+    billing_day = np.isin(day_of_month, [1, 2, 3, 15, 16, 17]) | (rng.random(n_days) > 0.95)
+    for description, mean, std, probability in UTILITY_BILLS:
+        bill_days = np.flatnonzero(billing_day & (rng.random(n_days) < probability))
+        events.add(bill_days, np.abs(rng.normal(mean, std, len(bill_days))), description, 'utilities', 'bank_transfer')
+
+    # Equipment: more likely early in the week
+    equipment_probability = np.where(weekday <= 1, 0.02, 0.005)
+    equipment_days = np.flatnonzero(rng.random(n_days) < equipment_probability)
+    n = len(equipment_days)
+    events.add(
+        equipment_days,
+        np.abs(rng.normal(280, 120, n)),
+        _choice(rng, EQUIPMENT_ITEMS, _DESCRIPTION_CODE, n),
+        'equipment',
+        'card',
+    )
+
+    # Other recurring business costs (recorded in the 'other' category, like revenue)
+    for description, amount, probability in OTHER_EXPENSES:
+        expense_days = np.flatnonzero(rng.random(n_days) < probability)
+        n = len(expense_days)
+        events.add(
+            expense_days,
+            np.abs(rng.normal(amount, amount * 0.2, n)),
+            description,
+            'other',
+            _choice(rng, ['card', 'bank_transfer'], _PAYMENT_CODE, n),
+        )
+
+    # Staff wages on most Fridays, rent in the first three days of the month
+    wage_days = np.flatnonzero((weekday == 4) & (rng.random(n_days) > 0.3))
+    events.add(wage_days, np.abs(rng.normal(400, 100, len(wage_days))), 'staff wages', 'other', 'bank_transfer')
+    rent_days = np.flatnonzero((day_of_month <= 3) & (rng.random(n_days) > 0.6))
+    events.add(rent_days, np.abs(rng.normal(2800, 200, len(rent_days))), 'monthly rent', 'other', 'bank_transfer')
+
+    day_index, amount, description, category, payment_method = events.concat()
+    # Stable sort keeps each day's entries in event-type order, like the row-by-row generator
+    order = np.argsort(day_index, kind='stable')
+    return pd.DataFrame({
+        'day': day_numbers[day_index[order]].astype('int32'),
+        'amount_cents': amounts_to_cents(np.round(amount[order], 2)),
+        'description': pd.Categorical.from_codes(description[order], categories=DESCRIPTIONS),
+        'category': pd.Categorical.from_codes(category[order], categories=CATEGORIES),
+        'payment_method': pd.Categorical.from_codes(payment_method[order], categories=PAYMENT_METHODS),
+    })
+
+
+def _start_day(days, start_date):
+    if start_date is None:
+        start_date = date.today() - timedelta(days=days)
+    return int(dates_to_days([np.datetime64(start_date, 'D')])[0])
+
+
+def _day_blocks(days, start_date, seed):
+    """generate_days for each BLOCK_DAYS-day block in turn"""
+
+    start_day = _start_day(days, start_date)
+    end_day = start_day + days
+    block_starts = range(start_day, end_day, BLOCK_DAYS)
+    for block_start, block_seed in zip(block_starts, np.random.SeedSequence(seed).spawn(len(block_starts))):
+        yield generate_days(np.arange(block_start, min(block_start + BLOCK_DAYS, end_day)),
+                            np.random.default_rng(block_seed))
+
+
+def generate_transactions(days=365, start_date=None, seed=None):
+    """Compact frame covering `days` days from start_date (default: `days` days before today)"""
+
+    return concat_frames(list(_day_blocks(days, start_date, seed)))
+
+
+def iter_transactions(days=365, chunk_rows=100_000, start_date=None, seed=None):
+    """Yield the rows of generate_transactions as compact frames of exactly chunk_rows rows
+    (the last one may be shorter), generating one block of days at a time so memory stays bounded.
+    For a given seed the rows are the same whatever chunk_rows is."""
+
+    pending = None
+
+    for block in _day_blocks(days, start_date, seed):
+        pending = block if pending is None else concat_frames([pending, block])
+        while len(pending) >= chunk_rows:
+            yield pending.iloc[:chunk_rows].reset_index(drop=True)
+            pending = pending.iloc[chunk_rows:].reset_index(drop=True)
+
+    if pending is not None and len(pending):
+        yield pending
+
+
+def prefetch(chunks, depth=2):
+    """Produce `chunks` on a background thread, at most `depth` ahead of the consumer,
+    so generating the next chunk overlaps inserting or writing the current one"""
+
+    buffer = queue.Queue(maxsize=depth)
+    done = object()
+    stop = threading.Event()
+
+    def produce():
+        try:
+            for chunk in chunks:
+                if stop.is_set():
+                    return
+                buffer.put(chunk)
+            buffer.put(done)
+        except BaseException as e:
+            buffer.put(e)
+
+    thread = threading.Thread(target=produce, name="finlo-synthetic", daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = buffer.get()
+            if item is done:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        stop.set()
+        # Unblock the producer if it is waiting on a full buffer
+        while thread.is_alive():
+            try:
+                buffer.get_nowait()
+            except queue.Empty:
+                thread.join(0.05)
+
+
+def write_parquet(path, chunks):
+    """Stream compact chunks into one Parquet file, one row group per chunk; returns the row count"""
+
+    if pa is None:
+        raise RuntimeError("pyarrow is required to write synthetic data files")
+
+    rows = 0
+    writer = None
+    try:
+        for chunk in chunks:
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(path, table.schema)
+            writer.write_table(table)
+            rows += len(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
@@ -0,0 +1,90 @@
+"""
+Bulk loader test: lost responses and oversized batches must not drop or duplicate rows.
+Run with: python -m pytest -q test_bulk_loader.py
+"""
+
+import httpx
+import numpy as np
+import pandas as pd
+from postgrest.exceptions import APIError
+from bulk_loader import BulkLoader
+from storage import SQLiteExpenseStore
+from transaction_schema import to_compact_frame
+
+
+class FlakyStore(SQLiteExpenseStore):
+    """Commits the first insert but times out, and rejects batches over max_rows with a 413"""
+
+    def __init__(self, path, max_rows):
+        super().__init__(path)
+        self.max_rows = max_rows
+        self.lost_response = False
+
+    def insert(self, rows, returning=True):
+        if len(rows) > self.max_rows:
+            raise APIError({'message': 'Payload Too Large', 'code': 413})
+        result = super().insert(rows, returning)
+        if not self.lost_response:
+            self.lost_response = True
+            raise httpx.ReadTimeout("response lost after commit")
+        return result
+
+
+def make_frame(rows):
+    rng = np.random.default_rng(7)
+    return to_compact_frame(pd.DataFrame({
+        'date': pd.Timestamp('2024-01-01') + pd.to_timedelta(np.arange(rows) // 20, unit='D'),
+        'amount': np.round(rng.uniform(1, 500, rows), 2),
+        'description': [f'row {i}' for i in range(rows)],
+        'category': 'supplies',
+        'payment_method': 'card',
+    }))
+
+
+def test_bulk_load_retries_without_duplicates(tmp_path):
+    store = FlakyStore(str(tmp_path / "finlo.db"), max_rows=300)
+    loader = BulkLoader(store, batch_bytes=10 ** 6, max_workers=3, min_batch_rows=50, retry_backoff=0)
+
+    report = loader.load(make_frame(5000))
+
+    stored = store.read_transactions()
+    assert report['rows'] == 5000
+    assert report['splits'] > 0
+    assert len(stored) == 5000
+    assert stored['description'].astype(str).nunique() == 5000
+
+
+class GatewayTimeoutStore(SQLiteExpenseStore):
+    """Commits the first insert but answers 504, like a gateway giving up on a slow statement"""
+
+    def __init__(self, path):
+        super().__init__(path)
+        self.timed_out = False
+
+    def insert(self, rows, returning=True):
+        result = super().insert(rows, returning)
+        if not self.timed_out:
+            self.timed_out = True
+            raise APIError({'message': 'Gateway Timeout', 'code': 504})
+        return result
+
+
+def test_bulk_load_checks_commit_after_gateway_timeout(tmp_path):
+    store = GatewayTimeoutStore(str(tmp_path / "finlo.db"))
+    loader = BulkLoader(store, batch_bytes=10 ** 6, max_workers=1, retry_backoff=0)
+
+    report = loader.load(make_frame(200), business_id='bakery')
+
+    # The 504'd batch had committed: it is counted, not sent again
+    assert report['rows'] == 200 and report['retries'] == 0
+    assert len(store.read_transactions(business_id='bakery')) == 200
+
+
+def test_rows_exist_is_scoped_by_business(tmp_path):
+    store = SQLiteExpenseStore(str(tmp_path / "finlo.db"))
+    rows = [{'date': '2024-01-01', 'amount': 10.0, 'description': 'Flour', 'category': 'ingredients',
+             'payment_method': 'cash', 'business_id': 'other'}]
+    store.insert(rows)
+
+    assert store.rows_exist(rows)
+    assert not store.rows_exist([{**rows[0], 'business_id': 'bakery'}])
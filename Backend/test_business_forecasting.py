@@ -0,0 +1,81 @@
+"""
+Forecaster test: forecast_many runs its series side by side and hands every result back under
+its own name, and the week, month and quarter forecasts of a series are slices of one fit.
+Run with: python -m pytest -q test_business_forecasting.py
+"""
+
+import threading
+import time
+import numpy as np
+import pandas as pd
+import business_forecasting
+from model_registry import ModelRegistry
+from prophet_fit import fit_and_predict
+
+
+def test_forecast_many_overlaps_fits_and_keeps_names(monkeypatch):
+    monkeypatch.setattr(business_forecasting, "fit_pool", lambda business_id=None: object())
+    forecaster = business_forecasting.BusinessForecaster("cafe")
+    lock = threading.Lock()
+    running, peak = [0], [0]
+
+    def fake_fit(df, periods, metric_name, engine="prophet", intervals=True):
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep({'Daily Expenses': 0.3, 'Daily Revenue': 0.1, 'Net Cash Flow': 0.2}[metric_name])
+        with lock:
+            running[0] -= 1
+        return {'series': df, 'label': metric_name, 'periods': periods}
+
+    monkeypatch.setattr(forecaster, "forecast_with_prophet", fake_fit)
+    jobs = {
+        'expenses': ("expenses frame", "Daily Expenses"),
+        'revenue': ("revenue frame", "Daily Revenue"),
+        'cash_flow': ("cash flow frame", "Net Cash Flow"),
+    }
+    finished = []
+
+    start = time.perf_counter()
+    results = forecaster.forecast_many(jobs, 7, on_result=lambda name, result: finished.append(name))
+    elapsed = time.perf_counter() - start
+
+    # All three ran at once, so the batch took about as long as the slowest fit
+    assert peak[0] == 3 and elapsed < 0.5
+    assert list(results) == list(jobs)
+    assert all(results[name]['series'] == df and results[name]['label'] == label and results[name]['periods'] == 7
+               for name, (df, label) in jobs.items())
+    # on_result reports them as they finish, fastest first
+    assert finished == ['revenue', 'cash_flow', 'expenses']
+
+
+def test_periods_share_one_fit_and_match_direct_fits(tmp_path, monkeypatch):
+    monkeypatch.setattr(business_forecasting, "fit_pool", lambda business_id=None: None)
+    monkeypatch.setattr(business_forecasting, "model_registry", ModelRegistry(directory=str(tmp_path)))
+    business_forecasting.model_cache.invalidate()
+    fits = []
+
+    def counting_fit(*args, **kwargs):
+        fits.append(args[1])
+        return fit_and_predict(*args, **kwargs)
+
+    monkeypatch.setattr(business_forecasting, "fit_and_predict", counting_fit)
+    days = np.arange(60)
+    daily = pd.DataFrame({
+        'ds': pd.date_range('2024-01-01', periods=60, freq='D'),
+        'total_revenue': 100 + days + 10 * np.sin(days * 2 * np.pi / 7)
+    })
+    forecaster = business_forecasting.BusinessForecaster("horizons")
+
+    for periods in (7, 30, 90):
+        forecast = forecaster.forecast_with_prophet(daily, periods, "Daily Revenue", intervals=False)['forecast']
+        assert len(forecast) == 60 + periods
+        # Slicing the 90-day forecast gives what a fit at this horizon would have
+        _, direct = fit_and_predict(daily.rename(columns={'total_revenue': 'y'}), periods, intervals=False)
+        assert np.allclose(forecast['yhat'], direct['yhat'], rtol=1e-6)
+    assert fits == [business_forecasting.MAX_FORECAST_DAYS]
+
+    # Longer than the cached fit: the same model only predicts further
+    forecast = forecaster.forecast_with_prophet(daily, 120, "Daily Revenue", intervals=False)['forecast']
+    assert len(forecast) == 180 and len(fits) == 1
+    assert np.allclose(forecast['yhat'].iloc[:150], direct['yhat'], rtol=1e-6)
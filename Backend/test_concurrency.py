@@ -0,0 +1,107 @@
+"""
+Concurrency test: /health and /generate-sql must stay fast while a comprehensive forecast runs.
+The forecast, Groq and Supabase calls are replaced with blocking stand-ins so no network is needed.
+Run with: python -m pytest -q test_concurrency.py
+"""
+
+import asyncio
+import os
+import time
+
+os.environ.setdefault("SUPABASE_URL", "http://localhost:54321")
+os.environ.setdefault("SUPABASE_ANON_KEY", "test.anon.key")
+os.environ.setdefault("GROQ_API_KEY", "test-groq-key")
+os.environ.setdefault("TRANSACTION_SNAPSHOT_PATH", "")
+
+import httpx
+import main
+
+FORECAST_SECONDS = 2.0
+MAX_LATENCY_SECONDS = 0.5
+
+
+def slow_complete_analysis(generate_dummy=False, days=90, forecast_days=30, engine="prophet"):
+    time.sleep(FORECAST_SECONDS)  # stands in for the Prophet fits
+    return {'summary': {}, 'insights': '', 'forecasts': {}, 'data': None}
+
+
+def slow_generate_sql(text):
+    time.sleep(0.05)  # stands in for the Groq round trip
+    return {"sql": "SELECT * FROM daily_expenses;", "type": "SELECT"}
+
+
+def slow_execute_sql(sql, sql_type, input_text="", business_id="default"):
+    time.sleep(0.05)  # stands in for the Supabase round trip
+    return {"data": [], "executed": True, "user_message": "Showing 0 recent transactions"}
+
+
+async def timed_get(client, url):
+    start = time.perf_counter()
+    response = await client.get(url)
+    return response, time.perf_counter() - start
+
+
+async def timed_post(client, url, payload):
+    start = time.perf_counter()
+    response = await client.post(url, json=payload)
+    return response, time.perf_counter() - start
+
+
+async def run_scenario():
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test", timeout=30) as client:
+        forecast_task = asyncio.create_task(timed_get(client, "/forecast/comprehensive/30"))
+        await asyncio.sleep(0.2)  # let the forecast start
+
+        health, health_latency = await timed_get(client, "/health")
+        sql, sql_latency = await timed_post(client, "/generate-sql", {"input_text": "show recent transactions"})
+        forecast_done_early = forecast_task.done()
+
+        forecast, forecast_latency = await forecast_task
+        return {
+            'health': (health, health_latency),
+            'sql': (sql, sql_latency),
+            'forecast': (forecast, forecast_latency),
+            'forecast_done_early': forecast_done_early,
+        }
+
+
+def test_endpoints_stay_responsive_during_forecast(monkeypatch):
+    monkeypatch.setattr(main.forecaster, "run_complete_analysis", slow_complete_analysis)
+    monkeypatch.setattr(main.forecaster, "data_version", lambda: 0)
+    main.forecast_cache.invalidate()  # make sure the forecast is computed, not served from cache
+    monkeypatch.setattr(main, "generate_sql_from_text", slow_generate_sql)
+    monkeypatch.setattr(main, "execute_sql_query", slow_execute_sql)
+
+    results = asyncio.run(run_scenario())
+
+    health, health_latency = results['health']
+    sql, sql_latency = results['sql']
+    forecast, forecast_latency = results['forecast']
+
+    assert health.status_code == 200
+    assert sql.status_code == 200 and sql.json()["executed"] is True
+    assert forecast.status_code == 200
+
+    # The forecast was still running while the other requests were answered
+    assert not results['forecast_done_early']
+    assert forecast_latency >= FORECAST_SECONDS
+    assert health_latency < MAX_LATENCY_SECONDS
+    assert sql_latency < MAX_LATENCY_SECONDS
+
+
+def test_one_business_cannot_take_every_forecast_thread(monkeypatch):
+    import executors
+    monkeypatch.setattr(executors, "FORECAST_MAX_PER_BUSINESS", 1)
+
+    async def scenario():
+        busy = [asyncio.create_task(executors.run_business_forecast("busy", time.sleep, 0.5)) for _ in range(executors.FORECAST_WORKERS)]
+        await asyncio.sleep(0.05)
+        start = time.perf_counter()
+        await executors.run_business_forecast("quiet", time.sleep, 0.01)
+        quiet_latency = time.perf_counter() - start
+        await asyncio.gather(*busy)
+        return quiet_latency
+
+    # As many slow requests as there are threads, from one business: another business is not queued behind them
+    assert asyncio.run(scenario()) < 0.3
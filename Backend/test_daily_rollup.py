@@ -0,0 +1,66 @@
+"""
+Daily rollup test: dense_series puts every forecast series on one zero-filled calendar, and
+unexpected categories round-trip through the compact schema while missing ones are rejected.
+Run with: python -m pytest -q test_daily_rollup.py
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from daily_rollup import DailyRollup
+from transaction_schema import dates_to_days, to_compact_frame, to_records
+
+
+def test_dense_series_aligns_and_zero_fills():
+    df = to_compact_frame(pd.DataFrame({
+        'date': pd.to_datetime(['2024-03-01', '2024-03-01', '2024-03-04', '2024-03-05']),
+        'amount': [250.0, -40.0, 12.5, 300.0],
+        'description': ['sales', 'flour', 'napkins', 'sales'],
+        'category': ['other', 'ingredients', 'supplies', 'other'],
+        'payment_method': ['card', 'card', 'cash', 'card'],
+    }))
+    series = DailyRollup.from_frame(df).dense_series()
+
+    revenue, expenses, cash_flow = series['total_revenue'], series['total_expenses'], series['net_cash_flow']
+    expected_days = pd.date_range('2024-03-01', '2024-03-05', freq='D')
+    for frame in series.values():
+        assert (frame['ds'].to_numpy() == expected_days.to_numpy()).all()
+
+    assert revenue['total_revenue'].tolist() == [250.0, 0.0, 0.0, 0.0, 300.0]
+    assert expenses['total_expenses'].tolist() == [40.0, 0.0, 0.0, 12.5, 0.0]
+    assert np.allclose(cash_flow['net_cash_flow'], revenue['total_revenue'] - expenses['total_expenses'])
+    assert series['supplies_amount']['supplies_amount'].tolist() == [0.0, 0.0, 0.0, 12.5, 0.0]
+
+
+def test_schema_round_trip_with_unknown_and_missing_categories():
+    wide = pd.DataFrame({
+        'date': ['2024-03-01', '2024-03-02', '2024-03-02'],
+        'amount': [-75.5, 120.0, -10.25],
+        'description': ['ad campaign', 'sales', 'flour'],
+        'category': ['marketing', 'other', 'ingredients'],
+        'payment_method': ['crypto', 'card', 'cash'],
+    })
+    df = to_compact_frame(wide)
+
+    # Unexpected values survive the trip to INSERT records, business_id attached to each
+    records = to_records(df, business_id='cafe')
+    assert [{key: value for key, value in record.items() if key != 'business_id'} for record in records] == \
+        wide.to_dict('records')
+    assert all(record['business_id'] == 'cafe' for record in records)
+    assert to_records(df) == wide.to_dict('records')
+
+    # ...and get a rollup column of their own instead of landing on another category's
+    rollup = DailyRollup.from_frame(df)
+    assert rollup.totals()['category_expenses'] == {'marketing': 75.5, 'ingredients': 10.25}
+    single = DailyRollup()
+    for row in records:
+        single.add(dates_to_days([row['date']])[0], round(row['amount'] * 100), row['category'])
+    assert single.totals() == rollup.totals()
+
+    # A missing category (code -1) is rejected rather than indexing the last category column
+    missing = to_compact_frame(wide.assign(category=['marketing', 'other', None]))
+    assert missing['category'].cat.codes.tolist()[-1] == -1
+    with pytest.raises(ValueError):
+        DailyRollup.from_frame(missing)
+    with pytest.raises(ValueError):
+        DailyRollup().add(dates_to_days(['2024-03-02'])[0], -1025, None)
@@ -0,0 +1,53 @@
+"""
+Data access test: a per-call timeout reaches the HTTP request, other calls keep the default,
+and the Supabase store uses the long timeout only for its slow calls. No network is used.
+Run with: python -m pytest -q test_data_access.py
+"""
+
+import httpx
+from data_access import DataAccess
+from storage import SupabaseExpenseStore
+
+
+def recording_access():
+    data_access = DataAccess("http://localhost:54321", "test.anon.key", timeout=10.0, slow_timeout=60.0)
+    timeouts = []
+
+    def handler(request):
+        timeouts.append((request.method, request.extensions['timeout']['read']))
+        if request.method == "POST":
+            return httpx.Response(201, json=[])
+        return httpx.Response(200, json=[], headers={"Content-Range": "0-0/0"})
+
+    data_access.client.postgrest.session._transport = httpx.MockTransport(handler)
+    return data_access, timeouts
+
+
+def test_per_call_timeout():
+    data_access, timeouts = recording_access()
+
+    data_access.table("daily_expenses").select("*").execute()
+    data_access.table("daily_expenses", timeout=2.5).select("*").execute()
+    data_access.with_timeout(30.0).table("daily_expenses").select("*").execute()
+    data_access.table("daily_expenses").select("*").execute()
+
+    assert [read for _, read in timeouts] == [10.0, 2.5, 30.0, 10.0]
+
+
+def test_store_uses_slow_timeout_for_slow_calls():
+    data_access, timeouts = recording_access()
+    store = SupabaseExpenseStore(data_access)
+    store._has_business_column = True
+    row = {'date': '2025-01-01', 'amount': 1.0, 'description': 'Sales', 'category': 'other', 'payment_method': 'card'}
+
+    store.insert([row])
+    store.insert([row, row], returning=False)
+    store.count_transactions()
+    store.max_id()
+    assert timeouts == [("POST", 10.0), ("POST", 60.0), ("GET", 60.0), ("GET", 10.0)]
+
+    # A full read gets the long timeout, a delta read the default (the table is empty: id bounds only)
+    del timeouts[:]
+    store.read_transactions()
+    store.read_transactions(after_id=5)
+    assert [read for _, read in timeouts] == [60.0, 10.0]
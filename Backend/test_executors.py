@@ -0,0 +1,60 @@
+"""
+Fit slot test: under the multi-core defaults the three fits of one comprehensive forecast run at
+the same time instead of queueing behind each other in the business's slot.
+The worker processes are stood in for by threads, so Prophet never runs.
+Run with: python -m pytest -q test_executors.py
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+import business_forecasting
+import executors
+from model_registry import ModelRegistry
+
+
+def test_comprehensive_fits_of_one_business_overlap(tmp_path, monkeypatch):
+    # The defaults on a multi-core host: three fit processes in two shards, automatic per-business limit
+    monkeypatch.setattr(executors, "FIT_PROCESSES", 3)
+    monkeypatch.setattr(executors, "FIT_SHARDS", 2)
+    monkeypatch.setattr(executors, "FIT_MAX_PER_BUSINESS", 0)
+    assert executors.fit_limit("cafe") >= 3
+
+    lock = threading.Lock()
+    running, peak = [0], [0]
+
+    def fit_in_worker(prophet_df, horizon, intervals, init):
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.2)
+        with lock:
+            running[0] -= 1
+        ds = pd.date_range(prophet_df['ds'].iloc[0], periods=len(prophet_df) + horizon, freq='D')
+        return "{}", pd.DataFrame({'ds': ds, 'yhat': 0.0, 'trend': 0.0})
+
+    shard = ThreadPoolExecutor(max_workers=3)
+    monkeypatch.setattr(business_forecasting, "fit_pool", lambda business_id=None: shard)
+    monkeypatch.setattr(business_forecasting, "fit_in_worker", fit_in_worker)
+    monkeypatch.setattr(business_forecasting, "model_from_json", lambda model_json: None)
+    monkeypatch.setattr(business_forecasting, "warm_start_params", lambda model: {})
+    monkeypatch.setattr(business_forecasting, "model_registry", ModelRegistry(directory=str(tmp_path)))
+
+    ds = pd.date_range('2024-01-01', periods=30, freq='D')
+    jobs = {
+        name: (pd.DataFrame({'ds': ds, column: np.arange(30.0) + offset}), label)
+        for offset, (name, column, label) in enumerate([
+            ('expenses', 'total_expenses', "Daily Expenses"),
+            ('revenue', 'total_revenue', "Daily Revenue"),
+            ('cash_flow', 'net_cash_flow', "Net Cash Flow"),
+        ])
+    }
+    try:
+        results = business_forecasting.BusinessForecaster("cafe").forecast_many(jobs, 7, intervals=False)
+    finally:
+        shard.shutdown()
+
+    assert set(results) == set(jobs) and all(result is not None for result in results.values())
+    assert peak[0] == 3
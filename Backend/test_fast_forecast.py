@@ -0,0 +1,48 @@
+"""
+Fast engine test: the NumPy model returns Prophet's columns and recovers trend + weekly seasonality.
+Run with: python -m pytest -q test_fast_forecast.py
+"""
+
+import numpy as np
+import pandas as pd
+from fast_forecast import FourierRidgeModel, forecast_matrix
+
+
+def test_fast_engine_recovers_trend_and_weekly_pattern():
+    days = 364
+    t = np.arange(days)
+    weekly = 100 * np.sin(2 * np.pi * t / 7)
+    y = 500 + 0.5 * t + weekly + np.random.default_rng(0).normal(0, 10, days)
+    history = pd.DataFrame({'ds': pd.date_range('2024-01-01', periods=days), 'y': y})
+
+    model = FourierRidgeModel().fit(history)
+    forecast = model.predict(model.make_future_dataframe(periods=28))
+
+    assert list(forecast.columns) == ['ds', 'trend', 'yhat_lower', 'yhat_upper', 'yhat']
+    assert len(forecast) == days + 28
+    assert forecast['ds'].iloc[days] == history['ds'].iloc[-1] + pd.Timedelta(days=1)
+
+    future = forecast.iloc[days:]
+    t_future = np.arange(days, days + 28)
+    expected = 500 + 0.5 * t_future + 100 * np.sin(2 * np.pi * t_future / 7)
+    assert np.abs(future['yhat'].to_numpy() - expected).mean() < 15
+    assert (future['yhat_lower'] < future['yhat']).all() and (future['yhat'] < future['yhat_upper']).all()
+
+
+def test_batched_fit_matches_individual_fits():
+    days = 200
+    ds = pd.date_range('2024-01-01', periods=days)
+    rng = np.random.default_rng(1)
+    Y = np.column_stack([
+        50 + 20 * np.sin(2 * np.pi * np.arange(days) / 7) + rng.normal(0, 5, days),
+        np.where(np.arange(days) % 30 < 3, 300.0, 0.0),
+        rng.gamma(2.0, 40.0, days),
+    ])
+
+    batched = forecast_matrix(ds, Y, ['a', 'b', 'c'], horizon=14)
+
+    for i, name in enumerate(['a', 'b', 'c']):
+        model = FourierRidgeModel().fit(pd.DataFrame({'ds': ds, 'y': Y[:, i]}))
+        single = model.predict(model.make_future_dataframe(periods=14))
+        assert np.allclose(batched[name]['yhat'], single['yhat'])
+        assert np.allclose(batched[name]['yhat_upper'], single['yhat_upper'])
@@ -0,0 +1,49 @@
+"""
+Forecast cache test: hits within a data version, invalidation on new data, LRU and TTL eviction.
+Run with: python -m pytest -q test_forecast_cache.py
+"""
+
+import time
+from forecast_cache import ForecastCache
+
+
+def test_forecast_cache_hits_and_invalidation():
+    cache = ForecastCache(max_entries=2, ttl_seconds=60)
+    calls = []
+
+    def compute(value):
+        calls.append(value)
+        return value
+
+    assert cache.get_or_compute(("revenue", "30"), 1, lambda: compute("a")) == "a"
+    assert cache.get_or_compute(("revenue", "30"), 1, lambda: compute("b")) == "a"
+    assert calls == ["a"]
+
+    # New transactions bump the data version and drop every entry
+    assert cache.get_or_compute(("revenue", "30"), 2, lambda: compute("c")) == "c"
+    cache.get_or_compute(("expenses", "30"), 2, lambda: compute("d"))
+    cache.get_or_compute(("profit", "30"), 2, lambda: compute("e"))  # evicts revenue (least recently used)
+    assert cache.get_or_compute(("revenue", "30"), 2, lambda: compute("f")) == "f"
+
+    stats = cache.stats()
+    assert stats['hits'] == 1 and stats['misses'] == 5
+    assert stats['invalidations'] == 1 and stats['evictions'] == 2
+
+
+def test_forecast_cache_ttl():
+    cache = ForecastCache(ttl_seconds=0.01)
+    cache.get_or_compute("key", 1, lambda: "old")
+    time.sleep(0.02)
+    assert cache.get_or_compute("key", 1, lambda: "new") == "new"
+    assert cache.stats()['expirations'] == 1
+
+
+def test_forecast_cache_versions_are_per_namespace():
+    cache = ForecastCache(max_entries=8, ttl_seconds=60)
+    cache.get_or_compute(("revenue", "30"), 1, lambda: "cafe-1", namespace="cafe")
+    cache.get_or_compute(("revenue", "30"), 1, lambda: "bakery-1", namespace="bakery")
+
+    # New data for one business leaves the other's entries alone
+    assert cache.get_or_compute(("revenue", "30"), 2, lambda: "cafe-2", namespace="cafe") == "cafe-2"
+    assert cache.get_or_compute(("revenue", "30"), 1, lambda: "recomputed", namespace="bakery") == "bakery-1"
+    assert cache.stats()['invalidations'] == 1
@@ -0,0 +1,91 @@
+"""
+Forecast job queue test: bounded concurrency, polling for results, cancellation and a full queue.
+Run with: python -m pytest -q test_forecast_jobs.py
+"""
+
+import threading
+import time
+import pytest
+from forecast_jobs import ForecastJobQueue, JobQueueFull
+
+
+def wait_for(jobs, job_id, timeout=5.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = jobs.get(job_id)
+        if job['status'] in ("succeeded", "failed", "cancelled"):
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"job {job_id} still {job['status']}")
+
+
+def test_jobs_run_with_bounded_concurrency():
+    jobs = ForecastJobQueue(max_concurrent=2)
+    lock = threading.Lock()
+    running, peak = [0], [0]
+
+    def compute(value):
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.05)
+        with lock:
+            running[0] -= 1
+        return {"value": value}
+
+    submitted = [jobs.submit(lambda v=v: compute(v), params={"n": v}) for v in range(6)]
+    assert all(job['status'] == "queued" for job in submitted)
+
+    finished = [wait_for(jobs, job['job_id']) for job in submitted]
+    assert [job['result'] for job in finished] == [{"value": v} for v in range(6)]
+    assert finished[0]['params'] == {"n": 0}
+    assert peak[0] == 2
+
+
+def test_jobs_cancel_fail_and_reject():
+    jobs = ForecastJobQueue(max_concurrent=1, max_queued=1)
+    release = threading.Event()
+
+    def failing():
+        release.wait(5)
+        raise ValueError("insufficient data")
+
+    running = jobs.submit(failing)
+    while jobs.get(running['job_id'])['status'] != "running":
+        time.sleep(0.01)
+    queued = jobs.submit(lambda: "never")
+    with pytest.raises(JobQueueFull):
+        jobs.submit(lambda: "rejected")
+
+    # A queued job is dropped straight away; the running one only loses its result
+    assert jobs.cancel(queued['job_id'])['status'] == "cancelled"
+    assert jobs.cancel(running['job_id'])['status'] == "running"
+    release.set()
+    assert wait_for(jobs, running['job_id'])['status'] == "cancelled"
+
+    failed = jobs.submit(failing)
+    job = wait_for(jobs, failed['job_id'])
+    assert job['status'] == "failed" and job['error'] == "insufficient data"
+    assert jobs.get("missing") is None and jobs.cancel("missing") is None
+    assert jobs.stats()['rejected'] == 1
+
+
+def test_one_business_cannot_fill_the_queue():
+    jobs = ForecastJobQueue(max_concurrent=1, max_queued=10, max_queued_per_business=2)
+    release = threading.Event()
+
+    running = jobs.submit(lambda: release.wait(5), business_id="flood")
+    while jobs.get(running['job_id'])['status'] != "running":
+        time.sleep(0.01)
+
+    # The flooding tenant is capped at its share; the queue still has room for everyone else
+    flooded = [jobs.submit(lambda: "flood", business_id="flood") for _ in range(2)]
+    with pytest.raises(JobQueueFull):
+        jobs.submit(lambda: "flood", business_id="flood")
+    other = jobs.submit(lambda: "quiet", business_id="quiet")
+    assert other['status'] == "queued" and other['business_id'] == "quiet"
+
+    release.set()
+    assert wait_for(jobs, other['job_id'])['result'] == "quiet"
+    assert all(wait_for(jobs, job['job_id'])['status'] == "succeeded" for job in flooded)
+    assert jobs.stats()['rejected'] == 1
@@ -0,0 +1,48 @@
+"""
+Payload test: the column-at-a-time forecast rows and summary match what the old per-row
+(iterrows) code returned, field for field.
+Run with: python -m pytest -q test_forecast_payload.py
+"""
+
+import numpy as np
+import pandas as pd
+from forecast_payload import forecast_rows, forecast_summary
+
+
+def iterrows_payload(future_data):
+    """The per-row formatting the endpoints used before forecast_rows"""
+    rows = []
+    for _, row in future_data.iterrows():
+        rows.append({
+            "date": row['ds'].strftime('%Y-%m-%d'),
+            "predicted_value": round(row['yhat'], 2),
+            "trend": round(row.get('trend', row['yhat']), 2)
+        })
+    summary = {
+        "total_forecast": round(future_data['yhat'].sum(), 2),
+        "daily_average": round(future_data['yhat'].mean(), 2),
+        "trend_direction": "increasing" if future_data['yhat'].iloc[-1] > future_data['yhat'].iloc[0] else "decreasing",
+    }
+    return rows, summary
+
+
+def test_rows_and_summary_match_iterrows():
+    rng = np.random.default_rng(7)
+    # Negative and half-cent values, and timestamps that are not midnight
+    yhat = np.concatenate([[-12.345, 0.005, -0.004, 2.675], rng.normal(0, 50, 26)])
+    frame = pd.DataFrame({
+        'ds': pd.date_range('2024-12-30 06:00', periods=30, freq='D'),
+        'trend': yhat * 0.9 - 3.0,
+        'yhat': yhat,
+    })
+
+    for future_data in (frame, frame.drop(columns=['trend']), frame.iloc[::-1]):
+        expected_rows, expected_summary = iterrows_payload(future_data)
+        rows = forecast_rows(future_data)
+        summary = forecast_summary(future_data)
+
+        assert rows == expected_rows
+        assert [list(row) for row in rows] == [list(row) for row in expected_rows]  # same keys, same order
+        assert summary == expected_summary and list(summary) == list(expected_summary)
+    # Negative predictions are passed through, not clipped
+    assert forecast_rows(frame)[0]['predicted_value'] == -12.35
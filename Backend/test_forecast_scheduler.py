@@ -0,0 +1,62 @@
+"""
+Forecast scheduler test: results are recomputed when the data version moves on or when they get
+older than refresh_interval, and readers are told while a newer result is on its way.
+Run with: python -m pytest -q test_forecast_scheduler.py
+"""
+
+import threading
+import time
+from forecast_scheduler import ForecastScheduler
+
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.time() + timeout
+    while not condition():
+        assert time.time() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_scheduler_refreshes_on_new_data_and_age():
+    data = {'version': 1}
+    calls = []
+    release = threading.Event()
+    release.set()
+
+    def compute():
+        release.wait(5)
+        calls.append(data['version'])
+        return f"forecast v{data['version']}"
+
+    scheduler = ForecastScheduler(lambda: data['version'], poll_seconds=60, refresh_interval=3600, min_check_interval=0)
+    scheduler.register("revenue", compute)
+    assert scheduler.latest("revenue") is None  # not running yet
+    scheduler.start()
+    try:
+        wait_until(lambda: scheduler.latest("revenue") is not None)
+        value, meta = scheduler.latest("revenue")
+        assert value == "forecast v1" and not meta['refreshing']
+
+        # Same data: a poll recomputes nothing
+        scheduler.wake()
+        time.sleep(0.1)
+        assert calls == [1]
+
+        # New data: the old result is served, flagged as refreshing, until the new one is ready
+        release.clear()
+        data['version'] = 2
+        scheduler.wake()
+        wait_until(lambda: scheduler.latest("revenue")[1]['refreshing'])
+        assert scheduler.latest("revenue")[0] == "forecast v1"
+        release.set()
+        wait_until(lambda: scheduler.latest("revenue")[0] == "forecast v2")
+        assert not scheduler.latest("revenue")[1]['refreshing']
+
+        # Too old: flagged straight away, recomputed at the next poll even without new data
+        scheduler.refresh_interval = 0.05
+        time.sleep(0.1)
+        assert scheduler.latest("revenue")[1]['refreshing']
+        scheduler.wake()
+        wait_until(lambda: len(calls) >= 3)
+        assert calls[:3] == [1, 2, 2]
+    finally:
+        scheduler.stop()
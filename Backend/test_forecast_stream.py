@@ -0,0 +1,45 @@
+"""
+Streaming test: /forecast/comprehensive/{period}/stream sends every stage of the analysis as a
+server-sent event, then the full response. The analysis is a stand-in, so no data is needed.
+Run with: python -m pytest -q test_forecast_stream.py
+"""
+
+import json
+import os
+
+os.environ.setdefault("SUPABASE_URL", "http://localhost:54321")
+os.environ.setdefault("SUPABASE_ANON_KEY", "test.anon.key")
+os.environ.setdefault("GROQ_API_KEY", "test-groq-key")
+os.environ.setdefault("TRANSACTION_SNAPSHOT_PATH", "")
+
+from fastapi.testclient import TestClient
+import main
+
+
+def staged_analysis(generate_dummy=False, days=90, forecast_days=30, engine="prophet", progress=None):
+    progress("fetch", {'transaction_count': 3})
+    progress("prepare", {'days': 3, 'metrics': ['revenue']})
+    progress("metric", {'metric': 'revenue', 'result': None})
+    progress("summary", {'summary': {}, 'insights': "steady"})
+    return {'summary': {}, 'insights': "steady", 'forecasts': {}, 'data': None}
+
+
+def parse_events(body):
+    events = []
+    for frame in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in frame.splitlines())
+        events.append((lines['event'], json.loads(lines['data'])))
+    return events
+
+
+def test_comprehensive_stream_sends_each_stage(monkeypatch):
+    monkeypatch.setattr(main.forecaster, "run_complete_analysis", staged_analysis)
+
+    response = TestClient(main.app).get("/forecast/comprehensive/7/stream")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = parse_events(response.text)
+    assert [name for name, _ in events] == ["start", "fetch", "prepare", "metric", "summary", "done"]
+    assert events[3][1] == {"metric": "revenue", "status": "insufficient_data"}
+    assert events[-1][1]["insights"] == "steady" and events[-1][1]["period_days"] == 7
@@ -0,0 +1,153 @@
+"""
+Model registry test: a saved fit loads back with the same forecast, keyed by tenant and series;
+pruning tolerates other workers, and the newest warm start on disk wins.
+Run with: python -m pytest -q test_model_registry.py
+"""
+
+import os
+import numpy as np
+import pandas as pd
+from model_registry import ModelRegistry
+from prophet_fit import fit_and_predict, predict_point, warm_start_params
+
+
+def test_model_registry_round_trip(tmp_path):
+    registry = ModelRegistry(directory=str(tmp_path), max_models=10)
+    history = pd.DataFrame({
+        'ds': pd.date_range('2024-01-01', periods=60, freq='D'),
+        'y': 100 + 10 * np.sin(np.arange(60) * 2 * np.pi / 7)
+    })
+    model, forecast = fit_and_predict(history, 14)
+
+    assert registry.load("cafe", "Daily Revenue", (60, 1)) is None
+    assert registry.save("cafe", "Daily Revenue", (60, 1), {'model': model, 'forecast': forecast})
+
+    loaded = registry.load("cafe", "Daily Revenue", (60, 1))
+    pd.testing.assert_frame_equal(loaded['forecast'], forecast)
+    # The deserialized model predicts like the original
+    future = loaded['model'].make_future_dataframe(periods=14)
+    assert np.allclose(loaded['model'].predict(future)['yhat'], forecast['yhat'])
+
+    # Other tenants and other training series never see it
+    assert registry.load("bakery", "Daily Revenue", (60, 1)) is None
+    assert registry.load("cafe", "Daily Revenue", (61, 1)) is None
+    assert registry.stats()['loads'] == 1
+
+
+def test_point_prediction_matches_sampled_yhat():
+    history = pd.DataFrame({
+        'ds': pd.date_range('2024-01-01', periods=60, freq='D'),
+        'y': 100 + 10 * np.sin(np.arange(60) * 2 * np.pi / 7)
+    })
+    model, sampled = fit_and_predict(history, 14)
+    point = predict_point(model, model.make_future_dataframe(periods=14))
+
+    assert np.allclose(point['yhat'], sampled['yhat'])
+    assert (point['yhat_lower'] <= point['yhat']).all() and (point['yhat_upper'] >= point['yhat']).all()
+    # The approximate band widens past the end of the history
+    width = point['yhat_upper'] - point['yhat_lower']
+    assert width.iloc[-1] > width.iloc[0]
+
+
+def test_warm_start_is_shared_through_disk_and_refits(tmp_path):
+    history = pd.DataFrame({
+        'ds': pd.date_range('2024-01-01', periods=61, freq='D'),
+        'y': 100 + np.arange(61) + 10 * np.sin(np.arange(61) * 2 * np.pi / 7)
+    })
+    model, _ = fit_and_predict(history.iloc[:-1], 7, intervals=False)
+    ModelRegistry(directory=str(tmp_path)).save_warm_start("cafe", "Daily Revenue", warm_start_params(model))
+
+    # A different process (fresh registry) picks the parameters up from disk
+    init = ModelRegistry(directory=str(tmp_path)).load_warm_start("cafe", "Daily Revenue")
+    assert init is not None
+    _, cold = fit_and_predict(history, 7, intervals=False)
+    _, warm = fit_and_predict(history, 7, intervals=False, init=init)
+    assert np.allclose(warm['yhat'], cold['yhat'], rtol=0.01)
+
+
+def test_warm_start_is_keyed_by_series_not_label(tmp_path, monkeypatch):
+    import business_forecasting
+    registry = ModelRegistry(directory=str(tmp_path))
+    monkeypatch.setattr(business_forecasting, "model_registry", registry)
+    monkeypatch.setattr(business_forecasting, "fit_pool", lambda business_id=None: None)
+    daily = pd.DataFrame({
+        'ds': pd.date_range('2024-01-01', periods=61, freq='D'),
+        'total_revenue': 100 + np.arange(61) + 10 * np.sin(np.arange(61) * 2 * np.pi / 7)
+    })
+    forecaster = business_forecasting.BusinessForecaster("cafe")
+
+    # The profit endpoint labels the series "Revenue", the others "Daily Revenue"
+    forecaster.forecast_with_prophet(daily.iloc[:-1], 7, "Revenue", intervals=False)
+    assert registry.load_warm_start("cafe", "total_revenue") is not None
+
+    # A new day arrives: the refit under the other label starts warm from the profit fit
+    inits = []
+    load_warm_start = registry.load_warm_start
+
+    def recording_load(*key):
+        inits.append(load_warm_start(*key))
+        return inits[-1]
+
+    monkeypatch.setattr(registry, "load_warm_start", recording_load)
+    forecaster.forecast_with_prophet(daily, 7, "Daily Revenue", intervals=False)
+    assert len(inits) == 1 and inits[0] is not None
+
+
+def test_registry_file_is_shared_across_labels(tmp_path, monkeypatch):
+    import business_forecasting
+    registry = ModelRegistry(directory=str(tmp_path))
+    monkeypatch.setattr(business_forecasting, "model_registry", registry)
+    monkeypatch.setattr(business_forecasting, "fit_pool", lambda business_id=None: None)
+    daily = pd.DataFrame({
+        'ds': pd.date_range('2024-01-01', periods=60, freq='D'),
+        'total_expenses': 50 + 5 * np.sin(np.arange(60) * 2 * np.pi / 7)
+    })
+    forecaster = business_forecasting.BusinessForecaster("cafe")
+    forecaster.forecast_with_prophet(daily, 7, "Expenses", intervals=False)
+
+    # Another worker (empty in-memory cache) asks for the same series under its other label
+    business_forecasting.model_cache.invalidate()
+    forecaster.forecast_with_prophet(daily, 7, "Daily Expenses", intervals=False)
+    assert registry.stats()['saves'] == 1 and registry.stats()['loads'] == 1
+
+
+def test_prune_only_when_full_and_survive_vanishing_files(tmp_path, monkeypatch):
+    import model_registry
+    registry = ModelRegistry(directory=str(tmp_path), max_models=3)
+    forecast = pd.DataFrame({'ds': pd.date_range('2024-01-01', periods=3, freq='D'), 'yhat': 1.0})
+    walks = []
+    walk = model_registry.os.walk
+    monkeypatch.setattr(model_registry.os, "walk", lambda top: walks.append(top) or walk(top))
+
+    for n in range(3):
+        assert registry.save("cafe", "total_revenue", (60, n), {'model_json': "{}", 'forecast': forecast})
+    assert len(walks) == 1  # counted once, then kept up to date without walking
+
+    # Another worker deletes a file while we look at the mtimes: the save still succeeded
+    getmtime = model_registry.os.path.getmtime
+
+    def racing_getmtime(path):
+        if path.endswith('.pkl') and not racing_getmtime.done:
+            racing_getmtime.done = True
+            os.remove(path)
+        return getmtime(path)
+
+    racing_getmtime.done = False
+    monkeypatch.setattr(model_registry.os.path, "getmtime", racing_getmtime)
+    assert registry.save("cafe", "total_revenue", (60, 3), {'model_json': "{}", 'forecast': forecast})
+    assert len(walks) == 2
+    assert len(list(tmp_path.glob("*/*.pkl"))) <= 3
+    assert registry.stats()['errors'] == 0 and registry.stats()['prune_errors'] == 0
+
+
+def test_warm_start_prefers_newer_fit_from_another_worker(tmp_path):
+    ours, theirs = ModelRegistry(directory=str(tmp_path)), ModelRegistry(directory=str(tmp_path))
+
+    ours.save_warm_start("cafe", "total_revenue", {'k': [1.0]})
+    theirs.save_warm_start("cafe", "total_revenue", {'k': [2.0]})
+
+    assert ours.load_warm_start("cafe", "total_revenue") == {'k': [2.0]}
+    # Without a registry directory the in-process parameters are used
+    disabled = ModelRegistry(directory="")
+    disabled.save_warm_start("cafe", "total_revenue", {'k': [3.0]})
+    assert disabled.load_warm_start("cafe", "total_revenue") == {'k': [3.0]}
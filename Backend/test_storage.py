@@ -0,0 +1,44 @@
+"""
+Embedded storage test: the SQLite backend answers the same calls the API and forecasters make.
+Run with: python -m pytest -q test_storage.py
+"""
+
+from storage import SQLiteExpenseStore
+
+ROWS = [
+    {'date': '2025-01-01', 'amount': 120.5, 'description': 'Sales', 'category': 'other', 'payment_method': 'card'},
+    {'date': '2025-01-02', 'amount': -40.25, 'description': 'Rent', 'category': 'utilities', 'payment_method': 'bank_transfer'},
+    {'date': '2025-01-03', 'amount': 15.0, 'description': 'Flour', 'category': 'ingredients', 'payment_method': 'cash'},
+]
+
+
+def test_sqlite_store_round_trip(tmp_path):
+    store = SQLiteExpenseStore(str(tmp_path / "finlo.db"))
+
+    inserted = store.insert(ROWS)
+    assert [row['id'] for row in inserted] == [1, 2, 3]
+    assert store.count_transactions() == 3
+    assert store.count_transactions(after_id=1, max_id=2) == 1
+
+    df = store.read_transactions()
+    assert df['id'].tolist() == [1, 2, 3]
+    assert df['amount_cents'].tolist() == [12050, -4025, 1500]
+    assert df['category'].tolist() == ['other', 'utilities', 'ingredients']
+    assert store.read_transactions(after_id=2)['id'].tolist() == [3]
+
+    assert store.select_amounts(date_eq='2025-01-02') == [{'amount': -40.25}]
+    assert [row['amount'] for row in store.select_amounts(date_gte='2025-01-02', sign=1)] == [15]
+    assert store.recent_transactions(1)[0]['description'] == 'Flour'
+
+
+def test_sqlite_store_scopes_reads_by_business(tmp_path):
+    store = SQLiteExpenseStore(str(tmp_path / "finlo.db"))
+    store.insert(ROWS)  # no business_id: the default business
+    store.insert([{**row, 'business_id': 'bakery'} for row in ROWS[:2]])
+
+    assert store.count_transactions() == 3
+    assert store.count_transactions(business_id='bakery') == 2
+    assert store.read_transactions(business_id='bakery')['id'].tolist() == [4, 5]
+    assert store.read_transactions(after_id=4, business_id='bakery')['id'].tolist() == [5]
+    assert store.select_amounts(date_eq='2025-01-02', business_id='bakery') == [{'amount': -40.25}]
+    assert store.recent_transactions(5, business_id='cafe') == []
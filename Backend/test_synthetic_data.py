@@ -0,0 +1,86 @@
+"""
+Synthetic data test: seeded runs repeat exactly, Sundays are closed, holidays and seasons move
+revenue by their multipliers, every category gets its own kind of entries, and the chunked
+stream yields the same rows as one-shot generation, in order.
+Run with: python -m pytest -q test_synthetic_data.py
+"""
+
+from datetime import date
+import numpy as np
+import pandas as pd
+import synthetic_data
+from synthetic_data import generate_days, generate_transactions, iter_transactions, prefetch
+from transaction_schema import CATEGORIES, concat_frames, dates_to_days
+
+
+def day_revenue(iso_date, seed=3):
+    """Revenue of one day, drawn from the same random stream as any other single day"""
+    day = dates_to_days([iso_date])
+    df = generate_days(day, np.random.default_rng(seed))
+    return df.loc[df['description'].isin(synthetic_data.REVENUE_ITEMS), 'amount_cents'].sum() / 100
+
+
+def test_seeded_generation_is_reproducible():
+    first = generate_transactions(120, start_date=date(2024, 1, 1), seed=42)
+    pd.testing.assert_frame_equal(first, generate_transactions(120, start_date=date(2024, 1, 1), seed=42))
+    assert not first.equals(generate_transactions(120, start_date=date(2024, 1, 1), seed=43))
+
+
+def test_closed_on_sundays_open_every_other_day():
+    df = generate_transactions(365, start_date=date(2024, 1, 1), seed=1)
+    start = dates_to_days(['2024-01-01'])[0]
+    days = np.arange(start, start + 365)
+    open_days = days[pd.to_datetime(days, unit='D').weekday != 6]
+
+    assert set(df['day'].unique()) == set(open_days.tolist())
+    assert df['day'].is_monotonic_increasing
+
+
+def test_holiday_and_seasonal_multipliers():
+    # Wednesdays in the same month, so only the holiday differs; then June against December
+    assert np.isclose(day_revenue('2024-12-25') / day_revenue('2024-12-18'), 0.3, rtol=0.01)
+    december, june = synthetic_data.SEASONAL_MULTIPLIER[11], synthetic_data.SEASONAL_MULTIPLIER[5]
+    assert np.isclose(day_revenue('2024-12-04') / day_revenue('2024-06-05'), december / june, rtol=0.01)
+
+
+def test_category_mix():
+    # Equipment is a few entries a year, so the seed is one that draws some
+    df = generate_transactions(365, start_date=date(2024, 1, 1), seed=3)
+    items = {
+        'ingredients': synthetic_data.INGREDIENT_ITEMS,
+        'supplies': synthetic_data.SUPPLY_ITEMS,
+        'equipment': synthetic_data.EQUIPMENT_ITEMS,
+        'utilities': [bill[0] for bill in synthetic_data.UTILITY_BILLS],
+        'other': synthetic_data.REVENUE_ITEMS + [expense[0] for expense in synthetic_data.OTHER_EXPENSES]
+                 + ['staff wages', 'monthly rent'],
+    }
+
+    assert set(df['category'].unique()) == set(CATEGORIES) == set(items)
+    for category, descriptions in items.items():
+        assert set(df.loc[df['category'] == category, 'description']) <= set(descriptions)
+    assert (df.loc[df['category'] == 'utilities', 'payment_method'] == 'bank_transfer').all()
+    assert (df['amount_cents'] > 0).all()
+    # Revenue is the bulk of the rows, at about ROWS_PER_DAY_ESTIMATE rows per calendar day overall
+    assert (df['description'].isin(synthetic_data.REVENUE_ITEMS)).mean() > 0.4
+    assert 0.8 < len(df) / 365 / synthetic_data.ROWS_PER_DAY_ESTIMATE < 1.3
+
+
+def test_chunks_are_exact_and_match_one_shot_generation():
+    # More than two generation blocks, so chunks straddle block boundaries
+    days = 2 * synthetic_data.BLOCK_DAYS + 500
+    whole = generate_transactions(days, start_date=date(2020, 1, 1), seed=5)
+
+    for chunk_rows in (997, 5000, 100_000):
+        chunks = list(iter_transactions(days, chunk_rows=chunk_rows, start_date=date(2020, 1, 1), seed=5))
+        assert all(len(chunk) == chunk_rows for chunk in chunks[:-1])
+        assert 0 < len(chunks[-1]) <= chunk_rows
+        pd.testing.assert_frame_equal(concat_frames(chunks), whole)
+
+
+def test_prefetch_keeps_chunk_order():
+    expected = list(iter_transactions(400, chunk_rows=100, start_date=date(2024, 1, 1), seed=9))
+    prefetched = list(prefetch(iter_transactions(400, chunk_rows=100, start_date=date(2024, 1, 1), seed=9), depth=2))
+
+    assert len(prefetched) == len(expected) > 2
+    for chunk, expected_chunk in zip(prefetched, expected):
+        pd.testing.assert_frame_equal(chunk, expected_chunk)
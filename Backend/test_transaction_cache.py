@@ -0,0 +1,134 @@
+"""
+Transaction cache test: delta syncs, the overlap window for late-committing ids, our own appends
+and the snapshot cold start, against the SQLite store.
+Run with: python -m pytest -q test_transaction_cache.py
+"""
+
+from daily_rollup import DailyRollup
+from snapshot_store import SnapshotStore
+from storage import SQLiteExpenseStore
+from transaction_cache import TransactionCache
+
+
+def row(day, amount, description='Sales', category='other'):
+    return {'date': f'2025-01-{day:02d}', 'amount': amount, 'description': description,
+            'category': category, 'payment_method': 'card'}
+
+
+class RecordingReader:
+    """read_transactions wrapper that remembers the after_id of every fetch"""
+
+    def __init__(self, store):
+        self.store = store
+        self.after_ids = []
+
+    def __call__(self, after_id=None):
+        self.after_ids.append(after_id)
+        return self.store.read_transactions(after_id)
+
+
+def assert_matches_table(cache, store):
+    frame = cache.get_frame(refresh=False)
+    stored = store.read_transactions()
+    assert sorted(frame['id']) == stored['id'].tolist()
+    assert cache.get_rollup(refresh=False).totals() == DailyRollup.from_frame(stored).totals()
+
+
+def test_delta_sync_and_overlap_dedup(tmp_path):
+    store = SQLiteExpenseStore(str(tmp_path / "finlo.db"))
+    store.insert([row(1, 100.0), row(2, -20.0, 'Rent', 'utilities')])
+    # id 3 is skipped here and committed late, below the high-water mark
+    store._connection().execute("INSERT INTO daily_expenses (id, date, amount, description, category, payment_method) "
+                                "VALUES (4, '2025-01-03', 50.0, 'Sales', 'other', 'card')")
+    store._connection().commit()
+    reader = RecordingReader(store)
+    cache = TransactionCache(reader, overlap_ids=50)
+
+    cache.refresh()
+    version = cache.version
+    store._connection().execute("INSERT INTO daily_expenses (id, date, amount, description, category, payment_method) "
+                                "VALUES (3, '2025-01-02', -5.0, 'Flour', 'ingredients', 'cash')")
+    store._connection().commit()
+    store.insert([row(5, 75.0)])
+    cache.refresh()
+
+    # Only rows above high-water minus the overlap were read, and each row is cached once
+    assert reader.after_ids == [None, 0]
+    assert cache.version == version + 1
+    assert_matches_table(cache, store)
+
+    cache.refresh()  # the overlap re-reads everything again: nothing new, nothing doubled
+    assert cache.version == version + 1
+    assert_matches_table(cache, store)
+
+
+def test_append_rows_then_refresh(tmp_path):
+    store = SQLiteExpenseStore(str(tmp_path / "finlo.db"))
+    store.insert([row(2, 100.0), row(3, -30.0, 'Rent', 'utilities')])
+    cache = TransactionCache(store.read_transactions)
+    cache.refresh()
+
+    # Our own inserts, one of them dated before the cached history
+    cache.append_rows(store.insert([row(4, -12.5, 'Napkins', 'supplies')]))
+    cache.append_rows(store.insert([row(1, 40.0)]))
+    assert cache.get_rollup(refresh=False).transaction_count == 4
+    assert cache.get_frame(refresh=False)['day'].is_monotonic_increasing
+
+    # The next delta sync sees the same rows again and must not count them twice
+    cache.append_rows(store.insert([row(5, 10.0)]))
+    cache.refresh()
+    assert_matches_table(cache, store)
+
+
+def test_append_rows_does_not_skip_other_writers(tmp_path):
+    store = SQLiteExpenseStore(str(tmp_path / "finlo.db"))
+    store.insert([row(1, 100.0)])
+    cache = TransactionCache(store.read_transactions, overlap_ids=5)
+    cache.refresh()
+
+    # Another worker commits a batch, then our own insert lands far above the old high-water mark
+    for day in range(2, 6):
+        store.insert([row(day, 10.0 * i) for i in range(1, 13)])
+        cache.append_rows(store.insert([row(day, -1.0, 'Napkins', 'supplies')]))
+    cache.refresh()
+
+    assert len(cache.get_frame(refresh=False)) == store.count_transactions()
+    assert_matches_table(cache, store)
+
+
+def test_cold_start_from_snapshot(tmp_path):
+    store = SQLiteExpenseStore(str(tmp_path / "finlo.db"))
+    store.insert([row(day, 10.0 * day) for day in range(1, 11)])
+    snapshot_path = str(tmp_path / "daily_expenses.arrow")
+    TransactionCache(store.read_transactions, snapshot=SnapshotStore(snapshot_path, min_save_interval=0)).refresh()
+
+    store.insert([row(11, 5.0)])
+    reader = RecordingReader(store)
+    cache = TransactionCache(reader, overlap_ids=2, snapshot=SnapshotStore(snapshot_path, min_save_interval=0),
+                             count_rows=lambda max_id: store.count_transactions(max_id=max_id))
+    cache.refresh()
+
+    # Ten rows came from the snapshot; only the tail was read from the table
+    assert reader.after_ids == [8]
+    assert_matches_table(cache, store)
+
+
+def test_snapshot_written_outside_the_lock(tmp_path):
+    store = SQLiteExpenseStore(str(tmp_path / "finlo.db"))
+    store.insert([row(1, 100.0)])
+    held = []
+
+    class CheckingSnapshot(SnapshotStore):
+        def save(self, df, force=False):
+            held.append(cache._lock.locked())
+            return super().save(df, force)
+
+    cache = TransactionCache(store.read_transactions,
+                             snapshot=CheckingSnapshot(str(tmp_path / "daily_expenses.arrow"), min_save_interval=0))
+    cache.refresh()
+    store.insert([row(2, 50.0)])
+    cache.refresh()
+
+    # Readers are never blocked by the disk write, and no temp files are left behind
+    assert held == [False, False]
+    assert [p.name for p in tmp_path.iterdir() if p.suffix == ".tmp"] == []
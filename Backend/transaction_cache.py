@@ -0,0 +1,175 @@
+#process-local cache for the daily_expenses table
+import threading
+import time
+import numpy as np
+from paged_reader import rows_to_frame
+from transaction_schema import concat_frames
+from daily_rollup import DailyRollup
+
+
+class TransactionCache:
+    """Keeps daily_expenses in memory and pulls only rows newer than the last seen id"""
+
+    def __init__(self, fetch_frame, refresh_interval=0.0, overlap_ids=50, snapshot=None, count_rows=None):
+        # fetch_frame(after_id) must return the rows with id > after_id (every row when after_id is None)
+        self.fetch_frame = fetch_frame
+        # Optional SnapshotStore read on cold start; count_rows(max_id) lets us check it still matches the table
+        self.snapshot = snapshot
+        self.count_rows = count_rows
+        self.refresh_interval = refresh_interval
+        # Serial ids can commit out of order, so each delta re-reads a small window below the high-water mark
+        self.overlap_ids = overlap_ids
+
+        self._df = None
+        # Rows appended one insert at a time since _df was last rebuilt; folded in by _frame()
+        # only when someone needs the raw rows, so an insert never copies the whole history
+        self._tail = []
+        self._tail_needs_sort = False
+        # Per-day totals maintained alongside the frame so forecasts never re-aggregate raw rows
+        self._rollup = None
+        self._high_water_id = None
+        self._last_refresh = 0.0
+        self._lock = threading.Lock()
+        self.version = 0
+
+    def get_frame(self, refresh=True):
+        """Return the cached transactions, syncing new rows first"""
+
+        if refresh:
+            self.refresh()
+        with self._lock:
+            if self._df is None or (self._df.empty and not self._tail):
+                return None
+            # Shallow copy so callers can add columns without touching the cache
+            return self._frame().copy(deep=False)
+
+    def get_rollup(self, refresh=True):
+        """Return a copy of the per-day rollup, syncing new rows first"""
+
+        if refresh:
+            self.refresh()
+        with self._lock:
+            if self._rollup is None or self._rollup.transaction_count == 0:
+                return None
+            return self._rollup.copy()
+
+    def refresh(self, force=False):
+        """Load the table on first use, afterwards fetch only rows above the high-water mark"""
+
+        snapshot_frame = None
+        with self._lock:
+            if not force and self._df is not None and time.monotonic() - self._last_refresh < self.refresh_interval:
+                return
+
+            if self._df is None:
+                # Cold start: read the local snapshot and only top it up from the database
+                self._load_snapshot()
+            if self._df is None:
+                new_df = self.fetch_frame(None)
+                print(f"📥 Transaction cache loaded {len(new_df)} records")
+            else:
+                after_id = max(self._high_water_id - self.overlap_ids, 0)
+                new_df = self.fetch_frame(after_id)
+
+            version = self.version
+            self._merge_frame(new_df)
+            # Only a read from the table moves the high-water mark: everything up to its last id has been seen
+            if not new_df.empty:
+                self._high_water_id = max(self._high_water_id or 0, int(new_df['id'].max()))
+            elif self._high_water_id is None:
+                self._high_water_id = 0
+            self._last_refresh = time.monotonic()
+            if self.snapshot is not None and self.version != version:
+                snapshot_frame = self._frame()
+
+        # Frames are replaced, never mutated, so the write can happen without holding up readers
+        if snapshot_frame is not None:
+            self.snapshot.save(snapshot_frame)
+
+    def append_rows(self, rows):
+        """Patch the cache with rows we just inserted ourselves.
+
+        Rows above the high-water mark cannot be known yet, so they are added to the rollup one
+        by one and queued on the tail - O(1) per row, however long the history is. The high-water
+        mark stays put: other writers may have committed ids below ours, and the next delta read
+        must still fetch them (our own rows come back with it and are dropped as duplicates).
+        """
+
+        with self._lock:
+            if self._df is None:
+                # Nothing loaded yet - the first refresh will pick these rows up
+                return
+            rows = [row for row in rows if row.get('id') is not None]
+            if not rows:
+                return
+            new_df = rows_to_frame(rows)
+            if int(new_df['id'].min()) <= self._high_water_id:
+                # A refresh may already have fetched some of them - dedup the slow way
+                self._merge_frame(new_df)
+                return
+
+            last_day = self._rollup.last_day
+            for day, cents, category in zip(new_df['day'].tolist(), new_df['amount_cents'].tolist(),
+                                            new_df['category'].tolist()):
+                self._rollup.add(day, cents, category)
+            self._tail.append(new_df)
+            self._tail_needs_sort |= last_day is not None and int(new_df['day'].min()) < last_day
+            self.version += 1
+
+    def _frame(self):
+        """The full frame, first folding in the rows queued by append_rows"""
+
+        if self._tail:
+            df = concat_frames([self._df] + self._tail)
+            if self._tail_needs_sort:
+                df = df.sort_values(['day', 'id'], kind='stable', ignore_index=True)
+            self._df = df
+            self._tail = []
+            self._tail_needs_sort = False
+        return self._df
+
+    def _load_snapshot(self):
+        if self.snapshot is None:
+            return False
+
+        df = self.snapshot.load()
+        if df is None or df.empty:
+            return False
+
+        high_water_id = int(df['id'].max())
+        if self.count_rows is not None and self.count_rows(high_water_id) != len(df):
+            # Rows were deleted or the table was rebuilt since the snapshot - start over
+            print("⚠️  Snapshot no longer matches the table, reloading from the database")
+            return False
+
+        self._df = df
+        self._rollup = DailyRollup.from_frame(df)
+        self._high_water_id = high_water_id
+        self.version += 1
+        return True
+
+    def _merge_frame(self, new_df):
+        if self._df is None:
+            self._df = new_df.sort_values(['day', 'id'], kind='stable', ignore_index=True)
+            self._rollup = DailyRollup.from_frame(self._df)
+            self.version += 1
+            return
+
+        if new_df.empty:
+            return
+        known_ids = self._df['id'].values
+        known_ids = np.concatenate([known_ids[known_ids >= new_df['id'].min()]] +
+                                   [frame['id'].values for frame in self._tail])
+        new_df = new_df[~new_df['id'].isin(known_ids)]
+        if new_df.empty:
+            return
+
+        current = self._frame()
+        needs_sort = current.empty or new_df['day'].min() < current['day'].max()
+        df = concat_frames([current, new_df])
+        if needs_sort:
+            df = df.sort_values(['day', 'id'], kind='stable', ignore_index=True)
+
+        self._df = df
+        self._rollup.add_frame(new_df)
+        self.version += 1
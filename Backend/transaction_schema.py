@@ -0,0 +1,159 @@
+#compact in-memory schema for transaction frames
+import threading
+import numpy as np
+import pandas as pd
+
+CATEGORIES = ['ingredients', 'utilities', 'supplies', 'equipment', 'other']
+PAYMENT_METHODS = ['cash', 'card', 'bank_transfer', 'check']
+
+# Every row belongs to one business; rows written before tenants existed belong to this one.
+# Ids end up in file names (snapshots, saved models), so they are restricted to a safe alphabet.
+DEFAULT_BUSINESS_ID = "default"
+BUSINESS_ID_PATTERN = r'^[A-Za-z0-9_-]{1,64}$'
+
+# Compact frame layout:
+#   id              int64     (only for rows that came from the database)
+#   day             int32     days since 1970-01-01
+#   amount_cents    int64     signed amount in cents
+#   description     category  open vocabulary, every distinct string stored once
+#   category        category  CATEGORIES first, unexpected values appended
+#   payment_method  category  PAYMENT_METHODS first, unexpected values appended
+COMPACT_COLUMNS = ['id', 'day', 'amount_cents', 'description', 'category', 'payment_method']
+CATEGORICAL_COLUMNS = ['description', 'category', 'payment_method']
+
+EPOCH_DAY = np.datetime64('1970-01-01', 'D')
+
+
+class StringDictionary:
+    """Thread-safe string -> int32 code mapping used to build categoricals page by page"""
+
+    def __init__(self, seed=()):
+        self._codes = {}
+        self.values = []
+        self._lock = threading.Lock()
+        for value in seed:
+            self._code_for(value)
+
+    def _code_for(self, value):
+        code = self._codes.get(value)
+        if code is None:
+            code = len(self.values)
+            self._codes[value] = code
+            self.values.append(value)
+        return code
+
+    def encode(self, values):
+        with self._lock:
+            return np.fromiter((self._code_for(value) for value in values), dtype='int32', count=len(values))
+
+    def categorical(self, codes):
+        with self._lock:
+            categories = list(self.values)
+        return pd.Categorical.from_codes(codes, categories=categories)
+
+
+def dates_to_days(dates):
+    """ISO strings, dates or datetime64 values -> int32 day numbers"""
+    values = np.asarray(dates)
+    if values.dtype.kind != 'M':
+        values = pd.to_datetime(values).values
+    return (values.astype('datetime64[D]') - EPOCH_DAY).astype('int32')
+
+
+def days_to_datetime(days):
+    """int32 day numbers -> datetime64[ns] (what Prophet and pandas date logic expect)"""
+    return (np.asarray(days).astype('int64') + EPOCH_DAY).astype('datetime64[ns]')
+
+
+def days_to_dates(days):
+    """int32 day numbers -> datetime.date objects for display"""
+    return pd.to_datetime(days_to_datetime(days)).date
+
+
+def amounts_to_cents(amounts):
+    return np.rint(np.asarray(amounts, dtype='float64') * 100).astype('int64')
+
+
+def _categorical(values, known):
+    values = pd.Series(values, copy=False).astype(object)
+    extra = sorted(set(values.dropna().unique()) - set(known))
+    return pd.Categorical(values, categories=list(known) + extra)
+
+
+def to_compact_frame(df):
+    """Convert a frame with date/amount/string columns into the compact schema"""
+
+    compact = pd.DataFrame(index=pd.RangeIndex(len(df)))
+    if 'id' in df.columns:
+        compact['id'] = df['id'].to_numpy(dtype='int64')
+    compact['day'] = dates_to_days(df['date'].to_numpy())
+    compact['amount_cents'] = amounts_to_cents(df['amount'].to_numpy())
+    compact['description'] = pd.Categorical(df['description'].to_numpy())
+    compact['category'] = _categorical(df['category'].to_numpy(), CATEGORIES)
+    compact['payment_method'] = _categorical(df['payment_method'].to_numpy(), PAYMENT_METHODS)
+    return compact
+
+
+def expand_compact_frame(df):
+    """Add back float `amount` and datetime `date` columns for code that works on the wide layout"""
+
+    wide = df.copy(deep=False)
+    wide['date'] = days_to_datetime(df['day'].to_numpy())
+    wide['amount'] = df['amount_cents'].to_numpy() / 100
+    return wide
+
+
+def to_records(df, business_id=None):
+    """Compact frame -> list of row dicts ready for a Supabase INSERT (tagged with business_id if given)"""
+
+    dates = np.datetime_as_string(df['day'].to_numpy().astype('int64') + EPOCH_DAY, unit='D')
+    amounts = df['amount_cents'].to_numpy() / 100
+    records = [
+        {
+            'date': date_str,
+            'amount': float(amount),
+            'description': description,
+            'category': category,
+            'payment_method': payment_method,
+        }
+        for date_str, amount, description, category, payment_method in zip(
+            dates.tolist(), amounts.tolist(),
+            df['description'].astype(object).tolist(),
+            df['category'].astype(object).tolist(),
+            df['payment_method'].astype(object).tolist(),
+        )
+    ]
+    if business_id is not None:
+        for record in records:
+            record['business_id'] = business_id
+    return records
+
+
+def concat_frames(frames):
+    """Concatenate compact frames, unioning categories so the columns stay categorical"""
+
+    frames = [frame for frame in frames if frame is not None]
+    for column in CATEGORICAL_COLUMNS:
+        categories = []
+        seen = set()
+        for frame in frames:
+            for value in frame[column].cat.categories:
+                if value not in seen:
+                    seen.add(value)
+                    categories.append(value)
+        frames = [
+            frame.assign(**{column: frame[column].cat.set_categories(categories)})
+            for frame in frames
+        ]
+    return pd.concat(frames, ignore_index=True)
+
+
+def revenue_mask(df):
+    """Revenue: positive amounts in the 'other' category"""
+    return (df['category'] == 'other').to_numpy() & (df['amount_cents'].to_numpy() > 0)
+
+
+def expense_mask(df):
+    """Expenses: every negative amount plus positive amounts in the expense categories"""
+    cents = df['amount_cents'].to_numpy()
+    return (cents < 0) | ((df['category'] != 'other').to_numpy() & (cents > 0))